@@ -1,14 +1,52 @@
 """
 Custom Authentication Backend for SDSCC
 Allows users to authenticate with either PIN or password
+
+The user of each authenticated request is loaded with their branch, district,
+area and managed area/district in one query, and kept in the 'auth-user'
+cache namespace (see core.cache) for USER_CACHE_TIMEOUT seconds. A user's
+entry is dropped when they are saved or deleted, and the namespace is
+invalidated when an area, district or branch changes (see core.signals).
 """
 
+import re
+
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from core.cache import CacheNamespace
 
 User = get_user_model()
 
+USER_CACHE_TIMEOUT = 60
+
+USER_CACHE = CacheNamespace('auth-user', timeout=USER_CACHE_TIMEOUT)
+
+# PINs are 4 or 5 digits
+PIN_SHAPE = re.compile(r'^\d{4,5}$')
+
+# Relations every page walks: role checks, dashboards and scoping
+USER_RELATED = ('branch__district__area', 'managed_area', 'managed_district__area')
+
+
+def invalidate_cached_user(user_id=None):
+    """
+    Drop one user's cached entry, or every user's when user_id is None.
+    Dropped again once the current transaction commits, in case a request
+    cached the old row in between.
+    """
+    def drop():
+        if user_id is not None:
+            USER_CACHE.delete(str(user_id))
+        else:
+            USER_CACHE.invalidate()
+
+    drop()
+    transaction.on_commit(drop)
+
+
 class SDSCCBackend(BaseBackend):
     """
     Custom authentication backend that allows users to authenticate 
@@ -32,21 +70,23 @@ class SDSCCBackend(BaseBackend):
         if not user.is_active:
             return None
         
-        # First try password authentication (Django's password hashing)
-        if user.check_password(password):
-            return user
-            
-        # Then try PIN authentication (stored as plain text)
-        if user.pin == password:
-            return user
+        # Try the credential its shape suggests first: a PIN check is cheap,
+        # a password check runs the full password KDF
+        if PIN_SHAPE.match(password):
+            checks = (user.check_pin, user.check_password)
+        else:
+            checks = (user.check_password, user.check_pin)
+        for check in checks:
+            if check(password):
+                return user
             
         return None
     
     def get_user(self, user_id):
         """
-        Retrieve user by primary key.
+        Retrieve user by primary key, with their place in the hierarchy.
         """
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
-            return None
+        def load():
+            return User.objects.select_related(*USER_RELATED).filter(pk=user_id).first()
+
+        return USER_CACHE.get_or_compute(str(user_id), load)
@@ -0,0 +1,34 @@
+"""
+PIN Hasher for SDSCC
+PINs are 4-5 digits, so a slow password KDF adds login CPU without adding
+real protection. They get their own cheap, salted hasher instead; it is
+deliberately not listed in PASSWORD_HASHERS, so a PIN hash is never accepted
+as a password (or the other way round).
+"""
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils.crypto import constant_time_compare
+
+
+class PINHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with a low work factor, for PINs only."""
+    algorithm = 'pin_pbkdf2_sha256'
+    iterations = 10000
+
+
+def is_hashed_pin(value):
+    return bool(value) and value.startswith(f'{PINHasher.algorithm}$')
+
+
+def hash_pin(raw_pin):
+    hasher = PINHasher()
+    return hasher.encode(raw_pin, hasher.salt())
+
+
+def verify_pin(raw_pin, stored):
+    """Check a PIN against its stored value (hashed, or plain on unsaved users)."""
+    if not raw_pin or not stored:
+        return False
+    if is_hashed_pin(stored):
+        return PINHasher().verify(raw_pin, stored)
+    return constant_time_compare(raw_pin, stored)
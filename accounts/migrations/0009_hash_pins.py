@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:32
+
+from django.db import migrations, models
+
+from accounts.hashers import hash_pin, is_hashed_pin
+
+
+def hash_plain_pins(apps, schema_editor):
+    """Hash the PINs stored in plain text."""
+    User = apps.get_model('accounts', 'User')
+    users = []
+    for user in User.objects.only('pk', 'pin').iterator():
+        if user.pin and not is_hashed_pin(user.pin):
+            user.pin = hash_pin(user.pin)
+            users.append(user)
+    User.objects.bulk_update(users, ['pin'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_userchangerequest'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='pin',
+            field=models.CharField(default='12345', max_length=128),
+        ),
+        migrations.RunPython(hash_plain_pins, migrations.RunPython.noop),
+    ]
@@ -7,6 +7,8 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.conf import settings
 
+from .hashers import hash_pin, is_hashed_pin, verify_pin
+
 
 class UserManager(BaseUserManager):
     """Custom user manager for SDSCC User model."""
@@ -108,7 +110,7 @@ class User(AbstractUser):
     )
     
     # Authentication
-    pin = models.CharField(max_length=10, default='12345')  # 5-digit PIN
+    pin = models.CharField(max_length=128, default='12345')  # 5-digit PIN, hashed on save (accounts.hashers)
     pin_changed = models.BooleanField(default=False)
     
     # Status
@@ -233,9 +235,16 @@ class User(AbstractUser):
             return Branch.objects.filter(pk=self.branch.pk)
         return Branch.objects.none()
     
+    def check_pin(self, raw_pin):
+        """Check a PIN against the stored (hashed) PIN."""
+        return verify_pin(raw_pin, self.pin)
+    
     def save(self, *args, **kwargs):
         # Auto-assign Area/District for executives based on Branch hierarchy
         self._auto_assign_hierarchy()
+        # PINs are assigned in plain text and stored hashed
+        if self.pin and not is_hashed_pin(self.pin):
+            self.pin = hash_pin(self.pin)
         super().save(*args, **kwargs)
     
     def _auto_assign_hierarchy(self):
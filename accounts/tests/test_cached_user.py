@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.authentication import SDSCCBackend
+from accounts.models import User
+
+
+@pytest.fixture
+def member(branch):
+    return User.objects.create_user(member_id='00002', password='pass', role='member', branch=branch)
+
+
+@pytest.mark.django_db
+class TestCachedUser:
+    def test_hierarchy_loaded_in_one_query(self, member, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            user = SDSCCBackend().get_user(member.pk)
+            assert user.branch.district.area.name == "Test Area"
+
+        with django_assert_num_queries(0):
+            assert SDSCCBackend().get_user(member.pk).branch.name == "Test Branch"
+
+    def test_user_save_drops_the_entry(self, member):
+        SDSCCBackend().get_user(member.pk)
+
+        member.role = 'pastor'
+        member.save()
+
+        assert SDSCCBackend().get_user(member.pk).role == 'pastor'
+
+    def test_branch_save_drops_every_entry(self, branch, member, django_capture_on_commit_callbacks):
+        SDSCCBackend().get_user(member.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            branch.name = "Renamed Branch"
+            branch.save()
+
+        assert SDSCCBackend().get_user(member.pk).branch.name == "Renamed Branch"
+
+    def test_missing_user(self):
+        assert SDSCCBackend().get_user(999) is None
+
+    def test_requests_do_not_load_the_user(self, client, member):
+        client.force_login(member)
+        client.get(reverse('core:notifications_api'))
+
+        with CaptureQueriesContext(connection) as captured:
+            client.get(reverse('core:notifications_api'))
+
+        assert not [q for q in captured.captured_queries if q['sql'].startswith('SELECT "accounts_user"')]
@@ -0,0 +1,55 @@
+import pytest
+from django.contrib.auth import authenticate
+from django.urls import reverse
+
+from accounts.hashers import is_hashed_pin
+from accounts.models import User
+
+
+@pytest.fixture
+def member():
+    user = User.objects.create_user(member_id='MEM001', password='long-password', role='member')
+    user.pin = '54321'
+    user.pin_changed = True
+    user.save()
+    return user
+
+
+@pytest.fixture
+def slow_password_checks(monkeypatch):
+    """Password checks run while authenticating."""
+    calls = []
+    check_password = User.check_password
+
+    def counting_check_password(user, raw_password):
+        calls.append(raw_password)
+        return check_password(user, raw_password)
+
+    monkeypatch.setattr(User, 'check_password', counting_check_password)
+    return calls
+
+
+@pytest.mark.django_db
+class TestPinLogin:
+    def test_pins_are_stored_hashed(self, member):
+        member.refresh_from_db()
+
+        assert is_hashed_pin(member.pin)
+        assert member.check_pin('54321')
+        assert not member.check_pin('12345')
+
+    def test_pin_login_skips_the_password_check(self, member, slow_password_checks):
+        assert authenticate(username='mem001', password='54321') == member
+        assert slow_password_checks == []
+
+    def test_password_login_still_works(self, member, slow_password_checks):
+        assert authenticate(username='MEM001', password='long-password') == member
+        assert authenticate(username='MEM001', password='wrong') is None
+        assert authenticate(username='MEM001', password='99999') is None
+
+    def test_default_pin_asks_for_a_change(self, client):
+        User.objects.create_user(member_id='MEM002', password='long-password', role='member')
+
+        client.post(reverse('accounts:login'), {'member_id': 'MEM002', 'password': '12345'})
+
+        assert client.session['pin_change_required'] is True
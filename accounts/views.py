@@ -51,7 +51,7 @@ def login_view(request):
                 
                 # Check if PIN/Password change is required
                 # Set session variable for modal to display on dashboard
-                if not user.pin_changed or user.pin == '12345':
+                if not user.pin_changed or user.check_pin('12345'):
                     request.session['show_pin_change_modal'] = True
                     request.session['pin_change_required'] = True
                 
@@ -88,7 +88,7 @@ def logout_view(request):
 @login_required
 def force_pin_change_view(request):
     """Force user to change PIN on first login."""
-    if request.user.pin_changed and request.user.pin != '12345':
+    if request.user.pin_changed and not request.user.check_pin('12345'):
         return redirect('core:dashboard')
     
     if request.method == 'POST':
@@ -268,7 +268,7 @@ def change_pin_view(request):
         user = request.user
         
         # Verify current PIN
-        if user.pin != current_pin:
+        if not user.check_pin(current_pin):
             messages.error(request, 'Current PIN is incorrect.')
             return redirect('accounts:change_pin')
         
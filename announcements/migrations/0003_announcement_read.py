@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-17 03:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def copy_read_notifications(apps, schema_editor):
+    """Announcements marked read through a Notification whose link is the announcement id."""
+    Notification = apps.get_model('core', 'Notification')
+    Announcement = apps.get_model('announcements', 'Announcement')
+    AnnouncementRead = apps.get_model('announcements', 'AnnouncementRead')
+
+    pairs = set()
+    for recipient_id, link in Notification.objects.filter(
+        notification_type='announcement', is_read=True
+    ).values_list('recipient_id', 'link'):
+        try:
+            pairs.add((recipient_id, uuid.UUID(link)))
+        except ValueError:
+            continue
+
+    existing = set(Announcement.objects.filter(pk__in={a for _, a in pairs}).values_list('pk', flat=True))
+    AnnouncementRead.objects.bulk_create([
+        AnnouncementRead(user_id=user_id, announcement_id=announcement_id)
+        for user_id, announcement_id in pairs if announcement_id in existing
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('announcements', '0002_fix_publish_date_timezone'),
+        ('core', '0005_notification_prayerrequest_visitor_visitorfollowup_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnnouncementRead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('read_at', models.DateTimeField(auto_now_add=True)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reads', to='announcements.announcement')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='announcement_reads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'announcement')},
+            },
+        ),
+        migrations.RunPython(copy_read_notifications, migrations.RunPython.noop),
+    ]
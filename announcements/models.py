@@ -95,6 +95,22 @@ class AnnouncementAttachment(models.Model):
         return self.filename
 
 
+class AnnouncementRead(models.Model):
+    """An announcement a user has opened; unread counts exclude these rows."""
+    announcement = models.ForeignKey(Announcement, on_delete=models.CASCADE, related_name='reads')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='announcement_reads'
+    )
+    read_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        # Leading with user serves the per-user unread lookup
+        unique_together = ['user', 'announcement']
+    
+    def __str__(self):
+        return f"{self.user} read {self.announcement}"
+
+
 class Event(TimeStampedModel):
     """Church events and calendar items."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
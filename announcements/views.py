@@ -9,7 +9,7 @@ from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Q
 
-from .models import Announcement, Event
+from .models import Announcement, AnnouncementRead, Event
 
 
 @login_required
@@ -182,6 +182,9 @@ def announcement_detail(request, announcement_id):
     announcement.view_count += 1
     announcement.save(update_fields=['view_count'])
     
+    # Opening the announcement takes it out of the user's unread count
+    AnnouncementRead.objects.get_or_create(announcement=announcement, user=request.user)
+    
     return render(request, 'announcements/announcement_detail.html', {'announcement': announcement})
 
 
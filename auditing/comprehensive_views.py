@@ -559,33 +559,29 @@ def variance_analysis(request):
     today = date.today()
     year = int(request.GET.get('year', today.year))
     
-    # Get all branches
-    branches = Branch.objects.filter(is_active=True)
+    # Closed months of every active branch in one query; actual is the tithe recorded at close
+    monthly_closes = MonthlyClose.objects.filter(
+        branch__is_active=True,
+        year=year,
+        is_closed=True
+    ).select_related('branch').order_by('branch__name', 'month')
     
     analysis_data = []
     
-    for branch in branches:
-        # Get monthly closes for the year
-        monthly_closes = MonthlyClose.objects.filter(
-            branch=branch,
-            year=year,
-            is_closed=True
-        )
+    for mc in monthly_closes:
+        variance = mc.total_tithe - mc.target_amount if mc.target_amount > 0 else Decimal('0')
+        variance_pct = (variance / mc.target_amount * 100) if mc.target_amount > 0 else Decimal('0')
         
-        for mc in monthly_closes:
-            variance = mc.total_tithe - mc.target_amount if mc.target_amount > 0 else Decimal('0')
-            variance_pct = (variance / mc.target_amount * 100) if mc.target_amount > 0 else Decimal('0')
-            
-            analysis_data.append({
-                'branch': branch,
-                'month': mc.month,
-                'month_name': calendar.month_name[mc.month],
-                'target': mc.target_amount,
-                'actual': mc.total_tithe,
-                'variance': variance,
-                'variance_pct': variance_pct,
-                'status': 'Exceeded' if variance > 0 else 'Below' if variance < 0 else 'Met',
-            })
+        analysis_data.append({
+            'branch': mc.branch,
+            'month': mc.month,
+            'month_name': calendar.month_name[mc.month],
+            'target': mc.target_amount,
+            'actual': mc.total_tithe,
+            'variance': variance,
+            'variance_pct': variance_pct,
+            'status': 'Exceeded' if variance > 0 else 'Below' if variance < 0 else 'Met',
+        })
     
     context = {
         'analysis_data': analysis_data,
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auditing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditflag',
+            name='flag_type',
+            field=models.CharField(choices=[('late_entry', 'Late Entry'), ('duplicate', 'Possible Duplicate'), ('missing_receipt', 'Missing Receipt'), ('amount_anomaly', 'Unusual Amount'), ('missing_remittance', 'Missing Remittance'), ('overspending', 'Overspending'), ('cashflow', 'Cashflow Imbalance'), ('ledger_imbalance', 'Ledger Imbalance'), ('missing_ledger', 'Missing Ledger Entries'), ('unauthorized', 'Unauthorized Action'), ('other', 'Other')], max_length=30),
+        ),
+    ]
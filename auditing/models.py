@@ -3,8 +3,9 @@ Auditing Models - Audit logs, trails, and reporting
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from core.models import TimeStampedModel
@@ -38,6 +39,7 @@ class AuditLog(models.Model):
         LOGOUT = 'logout', 'Logged Out'
         EXPORT = 'export', 'Exported'
         IMPORT = 'import', 'Imported'
+        REQUEST = 'request', 'Request'
     
     action = models.CharField(max_length=20, choices=Action.choices)
     
@@ -55,7 +57,8 @@ class AuditLog(models.Model):
         'core.Branch', on_delete=models.SET_NULL, null=True, blank=True, related_name='audit_logs'
     )
     
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set when the event happens; entries are written later, in batches
+    timestamp = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     
     class Meta:
         ordering = ['-timestamp']
@@ -72,7 +75,13 @@ class AuditLog(models.Model):
     
     @classmethod
     def log(cls, user, action, obj, changes=None, reason='', request=None):
-        """Helper method to create audit log entry."""
+        """
+        Helper method to create audit log entry. The entry is queued once
+        the caller's transaction commits, so rolled-back actions are not
+        logged, and written in a batch shortly after (see auditing.pipeline).
+        """
+        from auditing.pipeline import enqueue_audit
+
         log = cls(
             user=user,
             user_name=user.get_full_name() if user else 'System',
@@ -89,10 +98,10 @@ class AuditLog(models.Model):
             log.ip_address = cls.get_client_ip(request)
             log.user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
         
-        if hasattr(obj, 'branch'):
-            log.branch = obj.branch
+        if hasattr(obj, 'branch_id'):
+            log.branch_id = obj.branch_id
         
-        log.save()
+        transaction.on_commit(lambda: enqueue_audit(log))
         return log
     
     @staticmethod
@@ -197,6 +206,8 @@ class AuditFlag(TimeStampedModel):
         MISSING_REMITTANCE = 'missing_remittance', 'Missing Remittance'
         OVERSPENDING = 'overspending', 'Overspending'
         CASHFLOW_IMBALANCE = 'cashflow', 'Cashflow Imbalance'
+        LEDGER_IMBALANCE = 'ledger_imbalance', 'Ledger Imbalance'
+        MISSING_LEDGER_ENTRIES = 'missing_ledger', 'Missing Ledger Entries'
         UNAUTHORIZED = 'unauthorized', 'Unauthorized Action'
         OTHER = 'other', 'Other'
     
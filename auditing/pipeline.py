@@ -0,0 +1,179 @@
+"""
+Audit Pipeline - Batched, asynchronous AuditLog writes.
+
+AuditLog.log() and AuditLogMiddleware build their entries in memory and put
+them on a bounded per-process queue; nothing is written inside the request.
+A background writer thread in each process wakes every AUDIT_FLUSH_SECONDS,
+or as soon as a full batch (AUDIT_BATCH_SIZE) is queued, and writes the
+queued entries with one bulk_create per batch. AuditLog.log() queues its
+entry only when the caller's transaction commits.
+
+Whatever is still queued when the process exits cleanly (atexit) is written
+directly. A process that is killed (SIGKILL, e.g. a gunicorn worker past its
+timeout) loses the entries queued in the last AUDIT_FLUSH_SECONDS without
+any record of them.
+
+When the queue holds AUDIT_QUEUE_SIZE entries (the database is down, say) new
+entries are dropped and counted rather than slowing requests down. The
+counters are available from audit_pipeline_stats():
+
+    {'queued': 1520, 'dropped': 0, 'batches': 8, 'failed': 0,
+     'depth': 12, 'high_water': 200}
+"""
+
+import atexit
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_queue = deque()
+_lock = threading.Lock()
+_stats = {'queued': 0, 'dropped': 0, 'batches': 0, 'failed': 0, 'high_water': 0}
+
+# Background writer: woken early by a full batch, stopped at exit
+_wake = threading.Event()
+_stop = threading.Event()
+_writer = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def audit_pipeline_stats():
+    """Counters of this process's audit queue, with its current depth."""
+    with _lock:
+        return dict(_stats, depth=len(_queue))
+
+
+def enqueue_audit(entry):
+    """Queue an unsaved AuditLog for the next batch write."""
+    queue_size = _setting('AUDIT_QUEUE_SIZE', 10000)
+    with _lock:
+        if len(_queue) >= queue_size:
+            _stats['dropped'] += 1
+            dropped = _stats['dropped']
+        else:
+            dropped = 0
+            _queue.append(entry)
+            _stats['queued'] += 1
+            _stats['high_water'] = max(_stats['high_water'], len(_queue))
+        depth = len(_queue)
+
+    if dropped:
+        # Log the first drop and then every thousandth, not each one
+        if dropped == 1 or dropped % 1000 == 0:
+            logger.warning(f"Audit queue full ({queue_size} entries), {dropped} audit entries dropped")
+        return
+    start_audit_writer()
+    if depth >= _setting('AUDIT_BATCH_SIZE', 200):
+        _wake.set()
+
+
+def audit_request(request, response):
+    """Queue an audit entry for a mutating request."""
+    from auditing.models import AuditLog
+
+    user = request.user
+    path = request.path[:400]
+    enqueue_audit(AuditLog(
+        user_id=user.pk,
+        user_name=user.get_full_name(),
+        user_role=user.role,
+        content_type_id=ContentType.objects.get_for_model(user).pk,
+        object_id=str(user.pk),
+        object_repr=f'{request.method} {path}',
+        action=AuditLog.Action.REQUEST,
+        changes={'method': request.method, 'path': path, 'status': response.status_code},
+        ip_address=AuditLog.get_client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
+        branch_id=user.branch_id,
+    ))
+
+
+def _drain():
+    with _lock:
+        entries = list(_queue)
+        _queue.clear()
+    return entries
+
+
+def write_audit_batch(entries):
+    """Write a batch of AuditLog entries."""
+    from auditing.models import AuditLog
+
+    AuditLog.objects.bulk_create(entries, batch_size=500)
+    return len(entries)
+
+
+def flush_audit_queue():
+    """
+    Write the queued entries, one bulk_create per batch.
+    Returns the number of entries written.
+    """
+    entries = _drain()
+    batch_size = _setting('AUDIT_BATCH_SIZE', 200)
+    written = 0
+    for start in range(0, len(entries), batch_size):
+        try:
+            written += write_audit_batch(entries[start:start + batch_size])
+        except Exception:
+            logger.exception("Could not write an audit batch")
+            with _lock:
+                _stats['failed'] += 1
+                # Keep the unwritten entries for the next flush, within the bound
+                room = _setting('AUDIT_QUEUE_SIZE', 10000) - len(_queue)
+                unwritten = entries[start:]
+                _queue.extendleft(reversed(unwritten[:room]))
+                _stats['dropped'] += max(0, len(unwritten) - room)
+            break
+        with _lock:
+            _stats['batches'] += 1
+    return written
+
+
+def _run_writer():
+    try:
+        while not _stop.is_set():
+            _wake.wait(_setting('AUDIT_FLUSH_SECONDS', 5))
+            _wake.clear()
+            if _queue and not _stop.is_set():
+                close_old_connections()
+                flush_audit_queue()
+    finally:
+        connection.close()
+
+
+def start_audit_writer():
+    """Start this process's background writer, unless it is running."""
+    global _writer
+    if _writer is not None and _writer.is_alive():
+        return
+    with _lock:
+        if _writer is None or not _writer.is_alive():
+            _stop.clear()
+            _writer = threading.Thread(target=_run_writer, name='audit-writer', daemon=True)
+            _writer.start()
+
+
+def stop_audit_writer(timeout=10):
+    """Stop the background writer, letting a write in progress finish."""
+    _stop.set()
+    _wake.set()
+    if _writer is not None:
+        _writer.join(timeout)
+
+
+def write_remaining_audit_entries():
+    """Stop the writer and write whatever is still queued, in this thread. Runs at exit."""
+    stop_audit_writer()
+    return flush_audit_queue()
+
+
+atexit.register(write_remaining_audit_entries)
@@ -272,9 +272,9 @@ def auditor_financial_reports(request):
         return redirect('core:dashboard')
     
     from contributions.models import Contribution
-    from expenditure.models import Expenditure
     from reports.models import MonthlyReport
     from core.models import Area, District, Branch
+    from core.rollups import period_financials
     
     # Get filter parameters
     report_level = request.GET.get('level', 'branch')  # branch, district, area, individual
@@ -303,267 +303,67 @@ def auditor_financial_reports(request):
     period_label = ''
     
     # Generate reports based on level and time period
-    if report_level == 'branch':
-        # Generate branch-level financial reports
-        branches = Branch.objects.filter(is_active=True)
-        
-        if time_period == 'monthly':
-            if month and year:
-                period_label = f"{['', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'][month]} {year}"
-                
-                for branch in branches:
-                    monthly_report = MonthlyReport.objects.filter(
-                        branch=branch, year=year, month=month
-                    ).first()
-                    
-                    if monthly_report:
-                        reports_data.append({
-                            'entity': branch,
-                            'entity_name': branch.name,
-                            'period': period_label,
-                            'total_contributions': monthly_report.total_contributions,
-                            'total_expenditure': monthly_report.total_expenditure,
-                            'net_balance': monthly_report.total_contributions - monthly_report.total_expenditure,
-                            'tithe_amount': monthly_report.tithe_amount,
-                            'offering_amount': monthly_report.offering_amount,
-                            'mission_remittance_due': monthly_report.mission_remittance_due,
-                        })
-        
-        elif time_period == 'quarterly':
-            if quarter and year:
-                quarter = int(quarter)
-                months_in_quarter = [(1, 2, 3), (4, 5, 6), (7, 8, 9), (10, 11, 12)][quarter - 1]
-                period_label = f"Q{quarter} {year}"
-                
-                for branch in branches:
-                    total_contrib = Contribution.objects.filter(
-                        branch=branch,
-                        date__year=year,
-                        date__month__in=months_in_quarter
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    total_expend = Expenditure.objects.filter(
-                        branch=branch,
-                        date__year=year,
-                        date__month__in=months_in_quarter
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    if total_contrib > 0 or total_expend > 0:
-                        reports_data.append({
-                            'entity': branch,
-                            'entity_name': branch.name,
-                            'period': period_label,
-                            'total_contributions': total_contrib,
-                            'total_expenditure': total_expend,
-                            'net_balance': total_contrib - total_expend,
-                        })
-        
-        elif time_period == 'yearly':
-            period_label = f"Year {year}"
-            
-            for branch in branches:
-                total_contrib = Contribution.objects.filter(
-                    branch=branch,
-                    date__year=year
-                    # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                
-                total_expend = Expenditure.objects.filter(
-                    branch=branch,
-                    date__year=year
-                    # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                
-                if total_contrib > 0 or total_expend > 0:
-                    reports_data.append({
-                        'entity': branch,
-                        'entity_name': branch.name,
-                        'period': period_label,
-                        'total_contributions': total_contrib,
-                        'total_expenditure': total_expend,
-                        'net_balance': total_contrib - total_expend,
-                    })
+    # Branch, district and area totals come from one grouped query per model,
+    # rolled up the hierarchy in memory (see core.rollups)
+    month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
     
-    elif report_level == 'district':
-        # Generate district-level financial reports
-        districts = District.objects.filter(is_active=True)
-        
+    if report_level in ('branch', 'district', 'area'):
+        period_months = None
         if time_period == 'monthly':
             if month and year:
-                period_label = f"{['', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'][month]} {year}"
-                
-                for district in districts:
-                    total_contrib = Contribution.objects.filter(
-                        branch__district=district,
-                        date__year=year,
-                        date__month=month
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    total_expend = Expenditure.objects.filter(
-                        branch__district=district,
-                        date__year=year,
-                        date__month=month
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    if total_contrib > 0 or total_expend > 0:
-                        reports_data.append({
-                            'entity': district,
-                            'entity_name': f"{district.name} ({district.area.name})",
-                            'period': period_label,
-                            'total_contributions': total_contrib,
-                            'total_expenditure': total_expend,
-                            'net_balance': total_contrib - total_expend,
-                        })
-        
+                period_label = f"{month_names[month]} {year}"
+                period_months = [month]
         elif time_period == 'quarterly':
             if quarter and year:
                 quarter = int(quarter)
-                months_in_quarter = [(1, 2, 3), (4, 5, 6), (7, 8, 9), (10, 11, 12)][quarter - 1]
+                period_months = [(1, 2, 3), (4, 5, 6), (7, 8, 9), (10, 11, 12)][quarter - 1]
                 period_label = f"Q{quarter} {year}"
-                
-                for district in districts:
-                    total_contrib = Contribution.objects.filter(
-                        branch__district=district,
-                        date__year=year,
-                        date__month__in=months_in_quarter
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    total_expend = Expenditure.objects.filter(
-                        branch__district=district,
-                        date__year=year,
-                        date__month__in=months_in_quarter
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    if total_contrib > 0 or total_expend > 0:
-                        reports_data.append({
-                            'entity': district,
-                            'entity_name': f"{district.name} ({district.area.name})",
-                            'period': period_label,
-                            'total_contributions': total_contrib,
-                            'total_expenditure': total_expend,
-                            'net_balance': total_contrib - total_expend,
-                        })
-        
         elif time_period == 'yearly':
             period_label = f"Year {year}"
-            
-            for district in districts:
-                total_contrib = Contribution.objects.filter(
-                    branch__district=district,
-                    date__year=year
-                    # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                
-                total_expend = Expenditure.objects.filter(
-                    branch__district=district,
-                    date__year=year
-                    # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                
-                if total_contrib > 0 or total_expend > 0:
-                    reports_data.append({
-                        'entity': district,
-                        'entity_name': f"{district.name} ({district.area.name})",
-                        'period': period_label,
-                        'total_contributions': total_contrib,
-                        'total_expenditure': total_expend,
-                        'net_balance': total_contrib - total_expend,
-                    })
-    
-    elif report_level == 'area':
-        # Generate area-level financial reports
-        areas = Area.objects.filter(is_active=True)
         
-        if time_period == 'monthly':
-            if month and year:
-                period_label = f"{['', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'][month]} {year}"
-                
-                for area in areas:
-                    total_contrib = Contribution.objects.filter(
-                        branch__district__area=area,
-                        date__year=year,
-                        date__month=month
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    total_expend = Expenditure.objects.filter(
-                        branch__district__area=area,
-                        date__year=year,
-                        date__month=month
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    if total_contrib > 0 or total_expend > 0:
-                        reports_data.append({
-                            'entity': area,
-                            'entity_name': area.name,
-                            'period': period_label,
-                            'total_contributions': total_contrib,
-                            'total_expenditure': total_expend,
-                            'net_balance': total_contrib - total_expend,
-                        })
-        
-        elif time_period == 'quarterly':
-            if quarter and year:
-                quarter = int(quarter)
-                months_in_quarter = [(1, 2, 3), (4, 5, 6), (7, 8, 9), (10, 11, 12)][quarter - 1]
-                period_label = f"Q{quarter} {year}"
-                
-                for area in areas:
-                    total_contrib = Contribution.objects.filter(
-                        branch__district__area=area,
-                        date__year=year,
-                        date__month__in=months_in_quarter
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    total_expend = Expenditure.objects.filter(
-                        branch__district__area=area,
-                        date__year=year,
-                        date__month__in=months_in_quarter
-                        # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                    
-                    if total_contrib > 0 or total_expend > 0:
-                        reports_data.append({
-                            'entity': area,
-                            'entity_name': area.name,
-                            'period': period_label,
-                            'total_contributions': total_contrib,
-                            'total_expenditure': total_expend,
-                            'net_balance': total_contrib - total_expend,
-                        })
+        if report_level == 'branch' and time_period == 'monthly' and period_months:
+            # Monthly branch figures come from the submitted monthly reports
+            monthly_reports = {}
+            for monthly_report in MonthlyReport.objects.filter(
+                branch__is_active=True, year=year, month=month
+            ).select_related('branch'):
+                monthly_reports.setdefault(monthly_report.branch_id, monthly_report)
+            
+            for monthly_report in monthly_reports.values():
+                reports_data.append({
+                    'entity': monthly_report.branch,
+                    'entity_name': monthly_report.branch.name,
+                    'period': period_label,
+                    'total_contributions': monthly_report.total_contributions,
+                    'total_expenditure': monthly_report.total_expenditure,
+                    'net_balance': monthly_report.total_contributions - monthly_report.total_expenditure,
+                    'tithe_amount': monthly_report.tithe_amount,
+                    'offering_amount': monthly_report.offering_amount,
+                    'mission_remittance_due': monthly_report.mission_remittance_due,
+                })
         
-        elif time_period == 'yearly':
-            period_label = f"Year {year}"
+        elif period_label:
+            totals = period_financials(year, period_months).level(report_level)
             
-            for area in areas:
-                total_contrib = Contribution.objects.filter(
-                    branch__district__area=area,
-                    date__year=year
-                    # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                
-                total_expend = Expenditure.objects.filter(
-                    branch__district__area=area,
-                    date__year=year
-                    # fiscal_year=fiscal_year  # REMOVED: Use date filtering instead
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                
-                if total_contrib > 0 or total_expend > 0:
+            if report_level == 'branch':
+                entities = Branch.objects.filter(is_active=True)
+            elif report_level == 'district':
+                entities = District.objects.filter(is_active=True).select_related('area')
+            else:
+                entities = Area.objects.filter(is_active=True)
+            
+            for entity in entities:
+                entity_totals = totals.get(entity.pk)
+                if not entity_totals:
+                    continue
+                if entity_totals['total_contributions'] > 0 or entity_totals['total_expenditure'] > 0:
                     reports_data.append({
-                        'entity': area,
-                        'entity_name': area.name,
+                        'entity': entity,
+                        'entity_name': f"{entity.name} ({entity.area.name})" if report_level == 'district' else entity.name,
                         'period': period_label,
-                        'total_contributions': total_contrib,
-                        'total_expenditure': total_expend,
-                        'net_balance': total_contrib - total_expend,
+                        'total_contributions': entity_totals['total_contributions'],
+                        'total_expenditure': entity_totals['total_expenditure'],
+                        'net_balance': entity_totals['net_balance'],
                     })
     
     elif report_level == 'individual':
@@ -590,7 +390,7 @@ def auditor_financial_reports(request):
         if member:
             if time_period == 'monthly':
                 if month and year:
-                    period_label = f"{['', 'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'][month]} {year}"
+                    period_label = f"{month_names[month]} {year}"
                     
                     total_contrib = Contribution.objects.filter(
                         member=member,
@@ -767,9 +567,8 @@ def export_financial_report_pdf(request):
 
     from django.http import HttpResponse
     from django.template.loader import render_to_string
-    from contributions.models import Contribution
-    from expenditure.models import Expenditure
-    from core.models import Area, District, Branch, FiscalYear, SiteSettings
+    from core.models import Area, District, Branch, SiteSettings
+    from core.rollups import period_financials
 
     try:
         import weasyprint
@@ -784,7 +583,6 @@ def export_financial_report_pdf(request):
     month = int(request.GET.get('month', timezone.now().month))
     quarter = request.GET.get('quarter')
 
-    fiscal_year = FiscalYear.get_current()
     reports_data = []
     period_label = ''
 
@@ -794,96 +592,33 @@ def export_financial_report_pdf(request):
 
     if time_period == 'monthly':
         period_label = f"{month_names[month]} {year}"
+        period_months = [month]
     elif time_period == 'quarterly' and quarter:
         period_label = f"Q{quarter} {year}"
+        period_months = [(1,2,3), (4,5,6), (7,8,9), (10,11,12)][int(quarter)-1]
     else:
         period_label = f"Year {year}"
+        period_months = None
 
-    # Generate reports based on level
-    if report_level == 'branch':
-        branches = Branch.objects.filter(is_active=True)
-        for branch in branches:
-            if time_period == 'monthly':
-                total_contrib = Contribution.objects.filter(
-                    branch=branch, date__year=year, date__month=month, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch=branch, date__year=year, date__month=month, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            elif time_period == 'quarterly' and quarter:
-                months_in_quarter = [(1,2,3), (4,5,6), (7,8,9), (10,11,12)][int(quarter)-1]
-                total_contrib = Contribution.objects.filter(
-                    branch=branch, date__year=year, date__month__in=months_in_quarter, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch=branch, date__year=year, date__month__in=months_in_quarter, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            else:
-                total_contrib = Contribution.objects.filter(
-                    branch=branch, date__year=year, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch=branch, date__year=year, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-
-            if total_contrib > 0 or total_expend > 0:
-                reports_data.append({
-                    'entity_name': branch.name,
-                    'total_contributions': total_contrib,
-                    'total_expenditure': total_expend,
-                    'net_balance': total_contrib - total_expend,
-                })
-
-    elif report_level == 'district':
-        districts = District.objects.filter(is_active=True)
-        for district in districts:
-            if time_period == 'monthly':
-                total_contrib = Contribution.objects.filter(
-                    branch__district=district, date__year=year, date__month=month, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch__district=district, date__year=year, date__month=month, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            else:
-                total_contrib = Contribution.objects.filter(
-                    branch__district=district, date__year=year, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch__district=district, date__year=year, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-
-            if total_contrib > 0 or total_expend > 0:
-                reports_data.append({
-                    'entity_name': f"{district.name} ({district.area.name})",
-                    'total_contributions': total_contrib,
-                    'total_expenditure': total_expend,
-                    'net_balance': total_contrib - total_expend,
-                })
-
-    elif report_level == 'area':
-        areas = Area.objects.filter(is_active=True)
-        for area in areas:
-            if time_period == 'monthly':
-                total_contrib = Contribution.objects.filter(
-                    branch__district__area=area, date__year=year, date__month=month, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch__district__area=area, date__year=year, date__month=month, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            else:
-                total_contrib = Contribution.objects.filter(
-                    branch__district__area=area, date__year=year, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-                total_expend = Expenditure.objects.filter(
-                    branch__district__area=area, date__year=year, fiscal_year=fiscal_year
-                ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-
-            if total_contrib > 0 or total_expend > 0:
+    # Generate reports based on level, from one grouped query per model
+    if report_level in ('branch', 'district', 'area'):
+        totals = period_financials(year, period_months).level(report_level)
+        
+        if report_level == 'branch':
+            entities = Branch.objects.filter(is_active=True)
+        elif report_level == 'district':
+            entities = District.objects.filter(is_active=True).select_related('area')
+        else:
+            entities = Area.objects.filter(is_active=True)
+        
+        for entity in entities:
+            entity_totals = totals.get(entity.pk)
+            if entity_totals and (entity_totals['total_contributions'] > 0 or entity_totals['total_expenditure'] > 0):
                 reports_data.append({
-                    'entity_name': area.name,
-                    'total_contributions': total_contrib,
-                    'total_expenditure': total_expend,
-                    'net_balance': total_contrib - total_expend,
+                    'entity_name': f"{entity.name} ({entity.area.name})" if report_level == 'district' else entity.name,
+                    'total_contributions': entity_totals['total_contributions'],
+                    'total_expenditure': entity_totals['total_expenditure'],
+                    'net_balance': entity_totals['net_balance'],
                 })
 
     # Calculate totals
@@ -0,0 +1,71 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def audit_queue(monkeypatch):
+    """
+    Keep the audit entries a test queues to that test: no background writer
+    runs, and whatever is left is discarded rather than written at exit.
+    """
+    from auditing import pipeline
+
+    monkeypatch.setattr(pipeline, 'start_audit_writer', lambda: None)
+    yield
+    pipeline._queue.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    from core.cache import reset_stats
+
+    cache.clear()
+    reset_stats()
+    yield
+    cache.clear()
+    reset_stats()
+
+
+@pytest.fixture
+def area():
+    from core.models import Area
+
+    return Area.objects.create(name="Test Area", code="TA")
+
+
+@pytest.fixture
+def district(area):
+    from core.models import District
+
+    return District.objects.create(name="Test District", code="TD", area=area)
+
+
+@pytest.fixture
+def branch(district):
+    from core.models import Branch
+
+    return Branch.objects.create(name="Test Branch", code="TB", district=district)
+
+
+@pytest.fixture
+def tithe_type():
+    from contributions.models import ContributionType
+
+    return ContributionType.objects.create(
+        name="Tithe", code="TITHE", category="tithe",
+        mission_percentage=40, branch_percentage=60
+    )
+
+
+@pytest.fixture
+def member():
+    from accounts.models import User
+
+    return User.objects.create_user(member_id='00002', password='pass', role='member')
+
+
+@pytest.fixture
+def mission_admin():
+    from accounts.models import User
+
+    return User.objects.create_user(member_id='00001', password='pass', role='mission_admin')
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contributions', '0007_alter_contributiontype_scope_openingbalance_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contribution',
+            index=models.Index(fields=['updated_at'], name='contributio_updated_8fa11e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='remittance',
+            index=models.Index(fields=['updated_at'], name='contributio_updated_721c76_idx'),
+        ),
+    ]
@@ -197,6 +197,9 @@ class Contribution(TimeStampedModel):
         ordering = ['-date', '-created_at']
         verbose_name = 'Contribution'
         verbose_name_plural = 'Contributions'
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
     
     def __str__(self):
         member_info = f" - {self.member.get_full_name()}" if self.member else ""
@@ -399,6 +402,9 @@ class Remittance(TimeStampedModel):
         unique_together = ['branch', 'month', 'year']
         verbose_name = 'Remittance'
         verbose_name_plural = 'Remittances'
+        indexes = [
+            models.Index(fields=['updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.branch.name} - {self.month}/{self.year} - {self.get_status_display()}"
@@ -15,7 +15,8 @@ import calendar
 
 from core.models import Branch, Area, District, FiscalYear
 from .models import Contribution, ContributionType, TitheCommission
-from expenditure.models import Expenditure, ExpenditureCategory
+from core.ledger_service import LedgerService, InsufficientFundsError
+from expenditure.models import ExpenditureCategory
 from accounts.models import User
 
 
@@ -268,12 +269,13 @@ def commission_management(request):
                     }
                 )
                 
-                Expenditure.objects.create(
+                # Mission cash is checked and posted under a lock
+                LedgerService.reserve_and_post_expenditure(
+                    'mission',
+                    commission.commission_amount,
                     branch=commission.branch,
                     # fiscal_year=commission.fiscal_year,  # REMOVED: Use date filtering instead
                     category=category,
-                    level='mission',
-                    amount=commission.commission_amount,
                     date=date.today(),
                     title=f'Pastor Commission - {commission.recipient.get_full_name()}',
                     description=f'Pastor Commission for {calendar.month_name[commission.month]} {commission.year}',
@@ -294,6 +296,8 @@ def commission_management(request):
                 messages.success(request, f'Commission paid to {commission.recipient.get_full_name()} - GH₵{commission.commission_amount}')
             except TitheCommission.DoesNotExist:
                 messages.error(request, 'Commission not found')
+            except InsufficientFundsError as e:
+                messages.error(request, f'Cannot pay commission: {e}')
             except Exception as e:
                 messages.error(request, f'Error processing payment: {str(e)}')
         
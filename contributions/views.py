@@ -6,8 +6,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponse, JsonResponse
+from django.db import transaction
 from django.db.models import Sum, Count, Q
 
+from core.ledger_service import LedgerService
+from core.ledger_signals import suspend_ledger_signals
 from .models import Contribution, ContributionType, Remittance, TitheCommission, MissionReturnsPeriod
 
 
@@ -475,18 +478,21 @@ def weekly_entry(request):
             is_individual=False,
         )
 
-        for ct in general_types:
-            amount = request.POST.get(f'amount_{ct.id}')
-            notes = request.POST.get(f'notes_{ct.id}', '')
-            if amount and float(amount) > 0:
-                Contribution.objects.create(
-                    contribution_type=ct,
-                    amount=amount,
-                    date=entry_date,
-                    branch=branch,
-                    description=notes,
-                    created_by=request.user
-                )
+        created = []
+        with transaction.atomic(), suspend_ledger_signals():
+            for ct in general_types:
+                amount = request.POST.get(f'amount_{ct.id}')
+                notes = request.POST.get(f'notes_{ct.id}', '')
+                if amount and float(amount) > 0:
+                    created.append(Contribution.objects.create(
+                        contribution_type=ct,
+                        amount=amount,
+                        date=entry_date,
+                        branch=branch,
+                        description=notes,
+                        created_by=request.user
+                    ))
+            LedgerService.post_batch(created)
 
         messages.success(request, 'Weekly contributions recorded successfully.')
         return redirect('contributions:list')
@@ -542,19 +548,22 @@ def individual_entry(request):
 
         # Get all members and their amounts
         members = User.objects.filter(branch=branch, is_active=True)
-        for member in members:
-            amount = request.POST.get(f'amount_{member.id}')
-            notes = request.POST.get(f'notes_{member.id}', '')
-            if amount and float(amount) > 0:
-                Contribution.objects.create(
-                    contribution_type=contribution_type,
-                    amount=amount,
-                    date=entry_date,
-                    member=member,
-                    branch=branch,
-                    description=notes,
-                    created_by=request.user
-                )
+        created = []
+        with transaction.atomic(), suspend_ledger_signals():
+            for member in members:
+                amount = request.POST.get(f'amount_{member.id}')
+                notes = request.POST.get(f'notes_{member.id}', '')
+                if amount and float(amount) > 0:
+                    created.append(Contribution.objects.create(
+                        contribution_type=contribution_type,
+                        amount=amount,
+                        date=entry_date,
+                        member=member,
+                        branch=branch,
+                        description=notes,
+                        created_by=request.user
+                    ))
+            LedgerService.post_batch(created)
 
         messages.success(request, 'Individual contributions recorded successfully.')
         return redirect('contributions:list')
@@ -961,6 +970,7 @@ def contribution_import(request):
             
             fiscal_year = FiscalYear.get_current()
             branch = request.user.branch
+            imported = []
             
             for row_num, row in enumerate(reader, start=2):
                 try:
@@ -1007,23 +1017,26 @@ def contribution_import(request):
                         error_count += 1
                         continue
                     
-                    # Create contribution
-                    Contribution.objects.create(
-                        member=member,
-                        contribution_type=contribution_type,
-                        amount=amount,
-                        date=date,
-                        description=description,
-                        branch=member.branch or branch,
-                        # fiscal_year=fiscal_year,  # REMOVED: Use date filtering instead
-                        created_by=request.user,
-                    )
+                    # Create contribution (ledger entries are posted as one batch below)
+                    with suspend_ledger_signals():
+                        imported.append(Contribution.objects.create(
+                            member=member,
+                            contribution_type=contribution_type,
+                            amount=amount,
+                            date=date,
+                            description=description,
+                            branch=member.branch or branch,
+                            # fiscal_year=fiscal_year,  # REMOVED: Use date filtering instead
+                            created_by=request.user,
+                        ))
                     success_count += 1
                     
                 except Exception as e:
                     errors.append(f"Row {row_num}: {str(e)}")
                     error_count += 1
             
+            LedgerService.post_batch(imported)
+            
             if success_count > 0:
                 messages.success(request, f'Successfully imported {success_count} contributions.')
             if error_count > 0:
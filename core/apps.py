@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -7,4 +8,10 @@ class CoreConfig(AppConfig):
     def ready(self):
         import core.signals
         import core.ledger_signals
-
+        import core.summary_signals
+        import core.dashboard_signals
+        import core.notification_signals
+        from core.schedules import ensure_schedules
+        from core.financial_summaries import backfill_summaries
+        post_migrate.connect(ensure_schedules, sender=self)
+        post_migrate.connect(backfill_summaries, sender=self)
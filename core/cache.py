@@ -0,0 +1,231 @@
+"""
+Cache - Namespaced, tag-versioned cache entries shared by every worker.
+
+Each cache user declares a namespace once and reads through it:
+
+    DASHBOARD = CacheNamespace('dashboard', timeout=60 * 60)
+
+    totals = DASHBOARD.get_or_compute(
+        f'monthly_totals:{month_start}', compute, tags=[f'branch:{branch.pk}', month_tag(month_start)]
+    )
+
+Keys carry the version of the namespace and of every tag they are filed
+under, so invalidate_tags('branch:12') or DASHBOARD.invalidate() makes the
+affected entries unreachable at once; the old values simply expire. A new
+version is a fresh random value written with one set, not an increment, so
+bumps are atomic on every backend and a version evicted from the cache never
+comes back as one whose entries may still be stored.
+
+get_or_compute() lets one caller compute a missing value while concurrent
+callers for the same key wait for it (see CacheNamespace.get_or_compute).
+
+Hits and misses are counted per namespace, in memory, and added to shared
+counters in the cache every STATS_FLUSH_SECONDS; cache_stats() (and
+`manage.py cache_stats`) reports the totals of every process.
+
+The backend is configured by CACHES in settings: Redis in production when
+REDIS_URL is set, otherwise the database cache, so all gunicorn workers and
+machines see the same entries.
+"""
+
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+
+DEFAULT_TIMEOUT = 60 * 60
+
+# Longest a computation may hold the lock of its key
+LOCK_TIMEOUT = 30
+
+# How often waiting callers look for the value computed by the lock holder
+LOCK_POLL_SECONDS = 0.05
+
+STATS_FLUSH_SECONDS = 30
+STATS_NAMESPACES_KEY = 'cache:stats:namespaces'
+
+_MISSING = object()
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+_stats_flushed_at = time.monotonic()
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def _tag_key(tag):
+    return f'cache:tag:{tag}'
+
+
+def month_tag(day):
+    """Tag of the calendar month of a date, e.g. 'month:2026-09'."""
+    return f'month:{day.year}-{day.month:02d}'
+
+
+def get_tag_versions(tags):
+    """Current version of each tag, in one cache round trip."""
+    keys = {tag: _tag_key(tag) for tag in tags}
+    stored = cache.get_many(keys.values())
+    versions = {}
+    for tag, key in keys.items():
+        version = stored.get(key)
+        if version is None:
+            cache.add(key, _new_version(), None)
+            version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def invalidate_tags(*tags):
+    """Move each tag to a new version, making every entry filed under it stale."""
+    cache.set_many({_tag_key(tag): _new_version() for tag in set(tags)}, None)
+
+
+def _count(namespace, outcome):
+    with _stats_lock:
+        _stats[namespace][outcome] += 1
+        due = time.monotonic() - _stats_flushed_at >= STATS_FLUSH_SECONDS
+    if due:
+        flush_stats()
+
+
+def flush_stats():
+    """Add this process's counts to the shared counters."""
+    global _stats_flushed_at
+    with _stats_lock:
+        counts = {namespace: dict(outcomes) for namespace, outcomes in _stats.items() if outcomes}
+        _stats.clear()
+        _stats_flushed_at = time.monotonic()
+    if not counts:
+        return
+
+    known = cache.get(STATS_NAMESPACES_KEY) or set()
+    if not known.issuperset(counts):
+        cache.set(STATS_NAMESPACES_KEY, known | set(counts), None)
+    for namespace, outcomes in counts.items():
+        for outcome, count in outcomes.items():
+            key = f'cache:stats:{namespace}:{outcome}'
+            if not cache.add(key, count, None):
+                try:
+                    cache.incr(key, count)
+                except ValueError:
+                    cache.set(key, count, None)
+
+
+def cache_stats():
+    """
+    Hits and misses of every namespace, across all processes:
+    {namespace: {'hits': int, 'misses': int, 'waits': int, 'hit_rate': float}}
+    """
+    flush_stats()
+    namespaces = sorted(cache.get(STATS_NAMESPACES_KEY) or ())
+    stored = cache.get_many([
+        f'cache:stats:{namespace}:{outcome}'
+        for namespace in namespaces for outcome in ('hits', 'misses', 'waits')
+    ])
+    stats = {}
+    for namespace in namespaces:
+        row = {
+            outcome: stored.get(f'cache:stats:{namespace}:{outcome}', 0)
+            for outcome in ('hits', 'misses', 'waits')
+        }
+        lookups = row['hits'] + row['misses']
+        row['hit_rate'] = row['hits'] / lookups if lookups else 0.0
+        stats[namespace] = row
+    return stats
+
+
+def reset_stats():
+    """Drop every counter, local and shared."""
+    with _stats_lock:
+        _stats.clear()
+    namespaces = cache.get(STATS_NAMESPACES_KEY) or ()
+    cache.delete_many([
+        f'cache:stats:{namespace}:{outcome}'
+        for namespace in namespaces for outcome in ('hits', 'misses', 'waits')
+    ] + [STATS_NAMESPACES_KEY])
+
+
+class CacheNamespace:
+    """A named group of cache entries with its own default timeout and counters."""
+
+    def __init__(self, name, timeout=DEFAULT_TIMEOUT):
+        self.name = name
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f'CacheNamespace({self.name!r})'
+
+    def make_key(self, name, tags=()):
+        """Key of an entry under the current versions of the namespace and its tags."""
+        tags = [f'namespace:{self.name}', *tags]
+        versions = get_tag_versions(tags)
+        stamp = '.'.join(str(versions[tag]) for tag in tags)
+        return f'{self.name}:{name}:{stamp}'
+
+    def get(self, name, default=None, tags=()):
+        value = cache.get(self.make_key(name, tags), _MISSING)
+        _count(self.name, 'misses' if value is _MISSING else 'hits')
+        return default if value is _MISSING else value
+
+    def set(self, name, value, tags=(), timeout=None):
+        cache.set(self.make_key(name, tags), value, self.timeout if timeout is None else timeout)
+
+    def delete(self, name, tags=()):
+        """Drop one entry at the current versions."""
+        cache.delete(self.make_key(name, tags))
+
+    def version(self):
+        """
+        Current version of the namespace, for callers that keep their own
+        copy of its data (see core.settings_cache).
+        """
+        tag = f'namespace:{self.name}'
+        return get_tag_versions([tag])[tag]
+
+    def get_or_compute(self, name, compute, tags=(), timeout=None):
+        """
+        Return the cached value, computing and storing it on a miss.
+
+        Only one caller computes a missing key: it takes a lock with
+        cache.add, and the others wait up to LOCK_TIMEOUT for its value before
+        computing it themselves. compute() must return something picklable;
+        evaluate querysets to lists. None is cached like any other value.
+        """
+        key = self.make_key(name, tags)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            _count(self.name, 'hits')
+            return value
+        _count(self.name, 'misses')
+
+        lock_key = f'{key}:lock'
+        locked = cache.add(lock_key, True, LOCK_TIMEOUT)
+        if not locked:
+            _count(self.name, 'waits')
+            deadline = time.monotonic() + LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_SECONDS)
+                value = cache.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                if cache.add(lock_key, True, LOCK_TIMEOUT):
+                    # The holder gave up without storing a value
+                    locked = True
+                    break
+
+        try:
+            value = compute()
+            cache.set(key, value, self.timeout if timeout is None else timeout)
+        finally:
+            if locked:
+                cache.delete(lock_key)
+        return value
+
+    def invalidate(self):
+        """Make every entry of the namespace stale."""
+        invalidate_tags(f'namespace:{self.name}')
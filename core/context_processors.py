@@ -7,10 +7,10 @@ from django.conf import settings
 
 def site_settings(request):
     """Add site settings to template context."""
-    from core.models import SiteSettings
+    from core.settings_cache import get_site_settings
     
     try:
-        settings_obj = SiteSettings.get_settings()
+        settings_obj = get_site_settings()
     except Exception:
         settings_obj = None
     
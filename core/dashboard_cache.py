@@ -0,0 +1,103 @@
+"""
+Dashboard Cache - Versioned per-scope fragments for the role dashboards.
+
+Every scope ('mission', 'area:<id>', 'district:<id>', 'branch:<id>') is a
+core.cache tag, and dashboard figures are cached in the 'dashboard' namespace
+filed under their scope (and any extra tags, such as their month):
+
+    totals = cached_fragment(f'area:{area.pk}', f'monthly_totals:{month_start}', compute)
+
+Saving or deleting a contribution, expenditure, remittance, attendance
+session, user or hierarchy record bumps the version of its branch and every
+scope above it once the transaction commits (see core.dashboard_signals),
+so the next dashboard load reads fresh figures under new keys and the old
+entries simply expire. The time of the last bump is kept next to the version
+for the Last-Modified header of the dashboard widgets.
+"""
+
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+
+from core.cache import CacheNamespace, get_tag_versions, invalidate_tags
+from core.rollups import get_hierarchy
+
+DASHBOARD_CACHE_TIMEOUT = 60 * 60
+
+DASHBOARD = CacheNamespace('dashboard', timeout=DASHBOARD_CACHE_TIMEOUT)
+
+MISSION_SCOPE = 'mission'
+
+
+def _modified_key(scope):
+    return f'dashboard:modified:{scope}'
+
+
+def get_versions(scopes):
+    """Current data version of each scope, in one cache round trip."""
+    return get_tag_versions(scopes)
+
+
+def bump_versions(scopes):
+    """Move each scope to a new data version."""
+    scopes = set(scopes)
+    invalidate_tags(*scopes)
+    now = int(time.time())
+    cache.set_many({_modified_key(scope): now for scope in scopes}, None)
+
+
+def get_last_modified(scope):
+    """When the scope's data last changed, as an aware UTC datetime."""
+    key = _modified_key(scope)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, int(time.time()), None)
+        modified = cache.get(key)
+    return datetime.fromtimestamp(modified, tz=dt_timezone.utc)
+
+
+def cached_fragment(scope, name, compute, timeout=DASHBOARD_CACHE_TIMEOUT, tags=()):
+    """
+    Return the cached value of a dashboard fragment, computing it on a miss.
+
+    compute() must return something picklable: evaluate querysets to lists.
+    """
+    return DASHBOARD.get_or_compute(f'{scope}:{name}', compute, tags=[scope, *tags], timeout=timeout)
+
+
+def district_scopes(district_id):
+    """The district's scope and every scope above it."""
+    hierarchy = get_hierarchy()
+    if district_id not in hierarchy.districts:
+        hierarchy = get_hierarchy(refresh=True)
+    scopes = [MISSION_SCOPE, f'district:{district_id}']
+    district = hierarchy.districts.get(district_id)
+    if district:
+        scopes.append(f'area:{district["area_id"]}')
+    return scopes
+
+
+def branch_scopes(branch_id):
+    """The branch's scope and every scope above it; Mission only without a branch."""
+    if branch_id is None:
+        return [MISSION_SCOPE]
+    hierarchy = get_hierarchy()
+    if branch_id not in hierarchy.branches:
+        hierarchy = get_hierarchy(refresh=True)
+    branch = hierarchy.branches.get(branch_id)
+    if branch is None:
+        return [MISSION_SCOPE, f'branch:{branch_id}']
+    return district_scopes(branch['district_id']) + [f'branch:{branch_id}']
+
+
+def scopes_for(instance):
+    """Dashboard scopes a source or hierarchy record belongs to."""
+    model = instance._meta.label
+    if model == 'core.Area':
+        return [MISSION_SCOPE, f'area:{instance.pk}']
+    if model == 'core.District':
+        return [MISSION_SCOPE, f'district:{instance.pk}', f'area:{instance.area_id}']
+    if model == 'core.Branch':
+        return district_scopes(instance.district_id) + [f'branch:{instance.pk}']
+    return branch_scopes(instance.branch_id)
@@ -0,0 +1,97 @@
+"""
+Dashboard Figures - Per-branch figures behind the role dashboards.
+
+Shared by the dashboard widgets (core.dashboard_widget_views) and the
+precomputed snapshots (core.dashboard_snapshots); each helper runs one grouped
+query per model for every branch in scope.
+"""
+
+from django.db.models import Sum, Count, Q
+
+
+# Per-branch figures the area and district dashboards roll up
+DASHBOARD_ROLLUP_FIELDS = [
+    'monthly_total', 'yearly_total', 'monthly_expenditure',
+    'member_count', 'attendance_total', 'attendance_count',
+]
+
+
+def dashboard_branch_figures(month_start, **branch_filter):
+    """
+    Per-branch dashboard figures for the branches matching branch_filter
+    (e.g. district__area=area), rolled up the hierarchy.
+
+    One grouped query per model; the Rollup is cached by the dashboards.
+    """
+    from contributions.models import Contribution
+    from expenditure.models import Expenditure
+    from accounts.models import User
+    from attendance.models import AttendanceSession
+    from core.rollups import rollup, merge_rows, group_by_branch
+    
+    scope = {f'branch__{lookup}': value for lookup, value in branch_filter.items()}
+    year_start = month_start.replace(month=1)
+    
+    return rollup(merge_rows(
+        group_by_branch(
+            Contribution.objects.filter(date__gte=year_start, **scope),
+            monthly_total=Sum('amount', filter=Q(date__gte=month_start)),
+            yearly_total=Sum('amount'),
+        ),
+        group_by_branch(
+            Expenditure.objects.filter(date__gte=month_start, status__in=['approved', 'paid'], **scope),
+            monthly_expenditure=Sum('amount'),
+        ),
+        group_by_branch(
+            User.objects.filter(is_active=True, role='member', **scope),
+            member_count=Count('id'),
+        ),
+        group_by_branch(
+            AttendanceSession.objects.filter(date__gte=month_start, **scope),
+            attendance_total=Sum('total_attendance'),
+            attendance_count=Count('id'),
+        ),
+    ), fields=DASHBOARD_ROLLUP_FIELDS, zero=0)
+
+
+def week_branch_attendance_rows(branches, week_start, today):
+    """
+    This week's attendance sessions per branch, busiest branches first.
+    One query for every branch's sessions, grouped in memory.
+    """
+    from attendance.models import AttendanceSession
+    
+    branches = {branch.pk: branch for branch in branches}
+    sessions_by_branch = {}
+    for session in AttendanceSession.objects.filter(
+        branch__in=list(branches),
+        date__gte=week_start,
+        date__lte=today
+    ).order_by('-date'):
+        sessions_by_branch.setdefault(session.branch_id, []).append(session)
+    
+    week_branch_attendance = []
+    for branch_id, week_sessions in sessions_by_branch.items():
+        total_week_attendance = sum(session.total_attendance for session in week_sessions)
+        week_branch_attendance.append({
+            'branch': branches[branch_id],
+            'sessions': week_sessions,
+            'total_attendance': total_week_attendance,
+            'avg_attendance': round(total_week_attendance / len(week_sessions), 1)
+        })
+    
+    week_branch_attendance.sort(key=lambda x: x['avg_attendance'], reverse=True)
+    return week_branch_attendance
+
+
+def branch_performance_row(branch, figures):
+    """Branch performance entry for the area/district dashboards from rolled-up figures."""
+    attendance_count = figures['attendance_count']
+    return {
+        'branch': branch,
+        'monthly_total': figures['monthly_total'],
+        'member_count': figures['member_count'],
+        'attendance_total': figures['attendance_total'],
+        'attendance_avg': round(figures['attendance_total'] / attendance_count, 1) if attendance_count else 0,
+        'attendance_count': attendance_count,
+    }
@@ -0,0 +1,92 @@
+"""
+Dashboard Signals - Bump dashboard data versions when their figures change.
+
+pre_save/pre_delete record the scopes of the stored row, so a record moved
+between branches refreshes both; post_save/post_delete bump the versions
+once the transaction commits. See core.dashboard_cache.
+
+Saving a month close makes the entries tagged with its month stale, and
+closing a month also queues a rebuild of the dashboard snapshots
+(see core.dashboard_snapshots).
+"""
+
+from datetime import date
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+
+from core.cache import month_tag, invalidate_tags
+from core.dashboard_cache import scopes_for, bump_versions
+
+# Models whose changes show up on the dashboards, by their branch
+DASHBOARD_SOURCES = [
+    'contributions.Contribution',
+    'contributions.Remittance',
+    'expenditure.Expenditure',
+    'attendance.AttendanceSession',
+    'accounts.User',
+]
+HIERARCHY_SOURCES = ['core.Area', 'core.District', 'core.Branch']
+
+
+def login_only(update_fields):
+    """Logins save only last_login, which no dashboard shows."""
+    return update_fields is not None and set(update_fields) <= {'last_login'}
+
+
+def remember_stored_scopes(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Record the scopes of the row as stored, before it changes."""
+    instance._dashboard_scopes = []
+    if raw or login_only(update_fields):
+        return
+    if not instance._state.adding and instance.pk:
+        stored = sender.objects.filter(pk=instance.pk).first()
+        if stored is not None:
+            instance._dashboard_scopes = scopes_for(stored)
+
+
+def bump_saved_scopes(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Bump the scopes the row was and now is in, once the change is committed."""
+    if raw or login_only(update_fields):
+        return
+    scopes = instance._dashboard_scopes + scopes_for(instance)
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def remember_deleted_scopes(sender, instance, **kwargs):
+    instance._dashboard_scopes = scopes_for(instance)
+
+
+def bump_deleted_scopes(sender, instance, **kwargs):
+    """Bump the scopes a deleted row was in, once the delete is committed."""
+    scopes = instance._dashboard_scopes
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+for source in DASHBOARD_SOURCES + HIERARCHY_SOURCES:
+    pre_save.connect(remember_stored_scopes, sender=source, dispatch_uid=f'dashboard_pre_save:{source}')
+    post_save.connect(bump_saved_scopes, sender=source, dispatch_uid=f'dashboard_post_save:{source}')
+    pre_delete.connect(remember_deleted_scopes, sender=source, dispatch_uid=f'dashboard_pre_delete:{source}')
+    post_delete.connect(bump_deleted_scopes, sender=source, dispatch_uid=f'dashboard_post_delete:{source}')
+
+
+def refresh_snapshots_on_close(sender, instance, raw=False, **kwargs):
+    """Closing a month queues a rebuild of the dashboard snapshots."""
+    from core.dashboard_snapshots import queue_snapshot_refresh
+    
+    if not raw and instance.is_closed:
+        queue_snapshot_refresh()
+
+
+post_save.connect(refresh_snapshots_on_close, sender='core.MonthlyClose', dispatch_uid='dashboard_snapshots_month_close')
+
+
+def invalidate_closed_month(sender, instance, raw=False, **kwargs):
+    """Entries tagged with the month go stale when its close changes."""
+    if raw:
+        return
+    tag = month_tag(date(instance.year, instance.month, 1))
+    transaction.on_commit(lambda: invalidate_tags(tag))
+
+
+post_save.connect(invalidate_closed_month, sender='core.MonthlyClose', dispatch_uid='dashboard_month_close_tag')
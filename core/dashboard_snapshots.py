@@ -0,0 +1,213 @@
+"""
+Dashboard Snapshots - Precomputed figures for the role dashboards.
+
+A django-q schedule (see core.schedules) rebuilds one DashboardSnapshot per
+scope - Mission, every area, district and branch - every
+DASHBOARD_SNAPSHOT_MINUTES, and a month close queues an extra rebuild. The
+Mission, area, district and branch dashboards read their figures only from
+the snapshot and show when it was computed (or that it is still pending):
+
+    snapshot = get_snapshot(f'area:{area.pk}')
+    snapshot.data['monthly_contributions'], snapshot.computed_at
+
+A rebuild costs the same handful of grouped queries however many branches
+there are: figures are grouped by branch and rolled up (see core.rollups).
+"""
+
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum, Count, Q, OuterRef, Subquery
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from core.dashboard_cache import MISSION_SCOPE
+from core.dashboard_figures import dashboard_branch_figures
+from core.rollups import rollup, group_by_branch, get_hierarchy
+
+logger = logging.getLogger(__name__)
+
+# Set while a rebuild is queued, so closing every branch's month queues one
+REFRESH_QUEUED_KEY = 'dashboard:snapshots:refresh-queued'
+REFRESH_QUEUED_TIMEOUT = 5 * 60
+
+
+def compute_snapshots(today=None):
+    """Figures of every dashboard scope: {scope: data}."""
+    from accounts.models import User
+    from attendance.models import AttendanceSession
+    from contributions.models import Contribution, Remittance
+    from expenditure.models import Expenditure
+    from core.models import Branch
+
+    today = today or timezone.localdate()
+    month_start = today.replace(day=1)
+    hierarchy = get_hierarchy(refresh=True)
+
+    figures = dashboard_branch_figures(month_start)
+    pending = rollup(
+        group_by_branch(Remittance.objects.filter(status__in=['pending', 'sent']), pending_remittances=Count('id')),
+        fields=['pending_remittances'], hierarchy=hierarchy, zero=0,
+    )
+    active_members = group_by_branch(User.objects.filter(is_active=True), active_members=Count('id'))
+    # The branch dashboard's monthly figures keep its fiscal-year filter
+    branch_contributions = group_by_branch(
+        Contribution.objects.filter(date__gte=month_start, fiscal_year=None), total=Sum('amount')
+    )
+    branch_expenditure = group_by_branch(
+        Expenditure.objects.filter(date__gte=month_start, fiscal_year=None), total=Sum('amount')
+    )
+    last_sessions = AttendanceSession.objects.filter(branch=OuterRef('pk')).order_by('-date')
+    last_attendance = {
+        row['pk']: row for row in Branch.objects.annotate(
+            last_date=Subquery(last_sessions.values('date')[:1]),
+            last_total=Subquery(last_sessions.values('total_attendance')[:1]),
+        ).values('pk', 'last_date', 'last_total')
+    }
+    pending_remittance = {}
+    for remittance in Remittance.objects.filter(status='pending').order_by('year', 'month').values(
+        'branch_id', 'month', 'year', 'amount_due'
+    ):
+        pending_remittance.setdefault(remittance.pop('branch_id'), remittance)
+
+    users = User.objects.filter(is_active=True).aggregate(
+        total=Count('id'), pastors=Count('id', filter=Q(role='pastor'))
+    )
+    snapshots = {
+        MISSION_SCOPE: {
+            'total_branches': sum(1 for b in hierarchy.branches.values() if b['is_active']),
+            'total_districts': sum(1 for d in hierarchy.districts.values() if d['is_active']),
+            'total_areas': sum(1 for a in hierarchy.areas.values() if a['is_active']),
+            'total_members': users['total'],
+            'total_pastors': users['pastors'],
+            # Mission-level records (no branch) count here as well
+            'monthly_contributions': Contribution.objects.filter(
+                date__gte=month_start
+            ).aggregate(total=Sum('amount'))['total'] or 0,
+            'monthly_expenditure': Expenditure.objects.filter(
+                date__gte=month_start
+            ).aggregate(total=Sum('amount'))['total'] or 0,
+            'pending_remittances': pending.mission['pending_remittances'],
+        }
+    }
+
+    for area_id in hierarchy.areas:
+        totals = figures.get('area', area_id)
+        snapshots[f'area:{area_id}'] = {
+            'total_members': totals['member_count'],
+            'monthly_contributions': totals['monthly_total'],
+            'yearly_contributions': totals['yearly_total'],
+            'monthly_expenditure': totals['monthly_expenditure'],
+            'pending_remittances': pending.get('area', area_id)['pending_remittances'],
+            'district_members': {
+                str(district_id): figures.get('district', district_id)['member_count']
+                for district_id, district in hierarchy.districts.items()
+                if district['area_id'] == area_id
+            },
+        }
+
+    for district_id in hierarchy.districts:
+        totals = figures.get('district', district_id)
+        snapshots[f'district:{district_id}'] = {
+            'total_members': totals['member_count'],
+            'monthly_contributions': totals['monthly_total'],
+            'monthly_expenditure': totals['monthly_expenditure'],
+            'pending_remittances': pending.get('district', district_id)['pending_remittances'],
+            'branch_members': {
+                str(branch_id): active_members.get(branch_id, {}).get('active_members', 0)
+                for branch_id, branch in hierarchy.branches.items()
+                if branch['district_id'] == district_id
+            },
+        }
+
+    for branch_id in hierarchy.branches:
+        member_count = active_members.get(branch_id, {}).get('active_members', 0)
+        session = last_attendance.get(branch_id, {})
+        last = None
+        if session.get('last_date'):
+            last = {'date': session['last_date'], 'total_attendance': session['last_total']}
+        snapshots[f'branch:{branch_id}'] = {
+            'total_members': member_count,
+            'last_attendance': last,
+            'absentees_count': max(0, member_count - last['total_attendance']) if last else 0,
+            'monthly_contributions': branch_contributions.get(branch_id, {}).get('total') or 0,
+            'monthly_expenditure': branch_expenditure.get(branch_id, {}).get('total') or 0,
+            'pending_remittance': pending_remittance.get(branch_id),
+        }
+
+    return snapshots
+
+
+def refresh_dashboard_snapshots():
+    """
+    Rebuild every dashboard snapshot. Runs from the django-q schedule, after
+    month close and from the admins' refresh button.
+
+    Returns the number of snapshots written.
+    """
+    from core.models import DashboardSnapshot
+
+    cache.delete(REFRESH_QUEUED_KEY)
+    computed_at = timezone.now()
+    snapshots = [
+        DashboardSnapshot(scope=scope, data=data, computed_at=computed_at)
+        for scope, data in compute_snapshots().items()
+    ]
+
+    with transaction.atomic():
+        DashboardSnapshot.objects.bulk_create(
+            snapshots, batch_size=500,
+            update_conflicts=True, unique_fields=['scope'], update_fields=['data', 'computed_at'],
+        )
+        # Scopes of deleted areas, districts and branches were not rewritten
+        DashboardSnapshot.objects.filter(computed_at__lt=computed_at).delete()
+
+    logger.info(f"Refreshed {len(snapshots)} dashboard snapshots")
+    return len(snapshots)
+
+
+def pending_figures(scope):
+    """Zero figures shown for a scope whose snapshot has not been built yet."""
+    kind = scope.split(':')[0]
+    figures = {
+        'total_members': 0,
+        'monthly_contributions': 0,
+        'monthly_expenditure': 0,
+        'pending_remittances': 0,
+    }
+    if kind == MISSION_SCOPE:
+        figures.update(total_branches=0, total_districts=0, total_areas=0, total_pastors=0)
+    elif kind == 'area':
+        figures.update(yearly_contributions=0, district_members={})
+    elif kind == 'district':
+        figures['branch_members'] = {}
+    else:
+        del figures['pending_remittances']
+        figures.update(last_attendance=None, absentees_count=0, pending_remittance=None)
+    return figures
+
+
+def get_snapshot(scope):
+    """
+    The scope's DashboardSnapshot. Before the first scheduled run (or for a
+    scope created since) a rebuild is queued and an unsaved snapshot with
+    zero figures and no computed_at is returned; the dashboards show it as
+    pending.
+    """
+    from core.models import DashboardSnapshot
+
+    snapshot = DashboardSnapshot.objects.filter(scope=scope).first()
+    if snapshot is None:
+        queue_snapshot_refresh()
+        snapshot = DashboardSnapshot(scope=scope, data=pending_figures(scope), computed_at=None)
+    return snapshot
+
+
+def queue_snapshot_refresh():
+    """Queue a background rebuild once the current transaction commits."""
+    def enqueue():
+        if cache.add(REFRESH_QUEUED_KEY, True, REFRESH_QUEUED_TIMEOUT):
+            async_task('core.dashboard_snapshots.refresh_dashboard_snapshots')
+
+    transaction.on_commit(enqueue)
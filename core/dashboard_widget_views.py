@@ -0,0 +1,153 @@
+"""
+Dashboard Widget Views - Heavy dashboard panels loaded after the page paints.
+
+Each panel (recent contributions, branch performance, weekly attendance,
+pending remittances, birthdays) has its own JSON endpoint:
+
+    GET /api/dashboard/widgets/recent_contributions/
+    -> {"widget": "recent_contributions", "html": "<table ...>"}
+
+The payload is cached per data version of the user's scope (see
+core.dashboard_cache), and the ETag / Last-Modified headers come from that
+same version, so a browser revalidating an unchanged widget gets a 304.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from core.dashboard_cache import MISSION_SCOPE, cached_fragment, get_versions, get_last_modified
+from core.dashboard_figures import dashboard_branch_figures, week_branch_attendance_rows, branch_performance_row
+from core.models import Branch
+
+
+def widget_scope(user):
+    """
+    Dashboard scope of a user and the Branch lookups that select its branches,
+    following the same role order as the dashboard dispatch.
+    Returns (None, None) for roles without a scoped dashboard.
+    """
+    if user.is_mission_admin:
+        return MISSION_SCOPE, {}
+    if user.is_area_executive and user.managed_area_id:
+        return f'area:{user.managed_area_id}', {'district__area_id': user.managed_area_id}
+    if user.is_district_executive and user.managed_district_id:
+        return f'district:{user.managed_district_id}', {'district_id': user.managed_district_id}
+    if user.is_branch_executive and user.branch_id:
+        return f'branch:{user.branch_id}', {'pk': user.branch_id}
+    if user.is_auditor:
+        return MISSION_SCOPE, {}
+    return None, None
+
+
+def _through_branch(branch_filter):
+    """Branch lookups rewritten for models with a branch foreign key."""
+    return {f'branch__{lookup}': value for lookup, value in branch_filter.items()}
+
+
+def recent_contributions(branch_filter, today):
+    from contributions.models import Contribution
+
+    return {
+        'contributions': list(Contribution.objects.filter(
+            **_through_branch(branch_filter)
+        ).select_related(
+            'branch', 'contribution_type', 'member'
+        ).order_by('-created_at')[:10]),
+        'show_branch': 'pk' not in branch_filter,
+    }
+
+
+def branch_performance(branch_filter, today):
+    figures = dashboard_branch_figures(today.replace(day=1), **branch_filter)
+    rows = [
+        branch_performance_row(branch, figures.get('branch', branch.pk))
+        for branch in Branch.objects.filter(is_active=True, **branch_filter)
+    ]
+    rows.sort(key=lambda x: x['monthly_total'], reverse=True)
+    return {'branch_performance': rows[:10]}  # Top 10 branches
+
+
+def week_attendance(branch_filter, today):
+    week_start = today - timedelta(days=today.weekday())
+    rows = week_branch_attendance_rows(
+        Branch.objects.filter(is_active=True, **branch_filter), week_start, today
+    )
+    return {'week_branch_attendance': rows[:10], 'current_week_start': week_start}
+
+
+def pending_remittances(branch_filter, today):
+    from contributions.models import Remittance
+
+    return {
+        'remittances': list(Remittance.objects.filter(
+            status__in=['pending', 'sent'], **_through_branch(branch_filter)
+        ).select_related('branch').order_by('year', 'month')[:10]),
+    }
+
+
+def birthdays(branch_filter, today):
+    from accounts.models import User
+    from core.utils import get_upcoming_birthdays
+
+    return {
+        'birthdays': get_upcoming_birthdays(
+            days=7, users=User.objects.filter(**_through_branch(branch_filter))
+        ),
+    }
+
+
+# Widget name -> compute(branch_filter, today) returning the template context
+DASHBOARD_WIDGETS = {
+    'recent_contributions': recent_contributions,
+    'branch_performance': branch_performance,
+    'week_attendance': week_attendance,
+    'pending_remittances': pending_remittances,
+    'birthdays': birthdays,
+}
+
+
+def _widget_etag(request, widget):
+    scope, branch_filter = widget_scope(request.user)
+    if scope is None or widget not in DASHBOARD_WIDGETS:
+        return None
+    version = get_versions([scope])[scope]
+    # Widgets depend on today's date as well as on the data
+    return f'{widget}:{scope}:{version}:{timezone.localdate()}'
+
+
+def _widget_last_modified(request, widget):
+    scope, branch_filter = widget_scope(request.user)
+    if scope is None or widget not in DASHBOARD_WIDGETS:
+        return None
+    start_of_day = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+    return max(get_last_modified(scope), start_of_day)
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_widget_etag, last_modified_func=_widget_last_modified)
+def dashboard_widget(request, widget):
+    """JSON payload of one dashboard panel for the user's scope."""
+    if widget not in DASHBOARD_WIDGETS:
+        raise Http404('Unknown dashboard widget')
+
+    scope, branch_filter = widget_scope(request.user)
+    if scope is None:
+        return JsonResponse({'error': 'Access denied'}, status=403)
+
+    today = timezone.localdate()
+
+    def payload():
+        context = DASHBOARD_WIDGETS[widget](branch_filter, today)
+        return {
+            'widget': widget,
+            'html': render_to_string(f'core/dashboards/widgets/{widget}.html', context),
+        }
+
+    return JsonResponse(cached_fragment(scope, f'widget:{widget}:{today}', payload))
@@ -14,13 +14,18 @@ Contributions (Collection) → Expected Mission Amount (Obligation) → Remittan
 
 from decimal import Decimal
 from datetime import date, datetime
-from django.db.models import Sum, Q, F, Count
+from django.db.models import (
+    Sum, Q, F, Count, OuterRef, Subquery, Value, ExpressionWrapper, DecimalField, IntegerField
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from contributions.models import Contribution, Remittance
 from expenditure.models import Expenditure
 from core.models import Branch
 
+MONEY_FIELD = DecimalField(max_digits=14, decimal_places=2)
+
 
 def get_branch_balance(branch, start_date=None, end_date=None):
     """
@@ -47,13 +52,10 @@ def get_branch_balance(branch, start_date=None, end_date=None):
         
     # Filter verified remittances by date range
     remittances = Remittance.objects.filter(
-        branch=branch, 
+        remittance_period_filter(start_date, end_date),
+        branch=branch,
         status=Remittance.Status.VERIFIED
     )
-    if start_date:
-        remittances = remittances.filter(year__gte=start_date.year, month__gte=start_date.month)
-    if end_date:
-        remittances = remittances.filter(year__lte=end_date.year, month__lte=end_date.month)
     
     # Calculate totals
     total_contributions = contributions.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
@@ -72,12 +74,15 @@ def get_branch_balance(branch, start_date=None, end_date=None):
     }
 
 
-def get_expected_mission_due(branch, start_date=None, end_date=None):
+def get_expected_mission_due(branch, start_date=None, end_date=None, months=None):
     """
     Calculate expected mission amount (obligation, not cash).
     
     Expected Mission Amount = SUM(Contribution Amount * Mission Percentage)
     
+    Each contribution stores its mission share in mission_amount when saved,
+    so this is a single aggregate. Pass months to count only those calendar months.
+    
     IMPORTANT: This is an OBLIGATION, not actual cash. Does not affect mission balance.
     """
     contributions = Contribution.objects.filter(branch=branch)
@@ -85,14 +90,32 @@ def get_expected_mission_due(branch, start_date=None, end_date=None):
         contributions = contributions.filter(date__gte=start_date)
     if end_date:
         contributions = contributions.filter(date__lte=end_date)
+    if months is not None:
+        contributions = contributions.filter(date__month__in=months)
     
-    expected_total = Decimal('0.00')
+    expected_total = contributions.aggregate(total=Sum('mission_amount'))['total']
     
-    for contribution in contributions:
-        mission_amount = contribution.amount * (contribution.contribution_type.mission_percentage / Decimal('100'))
-        expected_total += mission_amount
+    return expected_total or Decimal('0.00')
+
+
+def expected_mission_due_by_branch(start_date=None, end_date=None):
+    """
+    Expected mission amount for every branch in one grouped query.
     
-    return expected_total
+    Returns dict of branch_id -> expected amount; branches without
+    contributions in the range are absent (treat as 0.00).
+    """
+    contributions = Contribution.objects.filter(branch__isnull=False)
+    if start_date:
+        contributions = contributions.filter(date__gte=start_date)
+    if end_date:
+        contributions = contributions.filter(date__lte=end_date)
+    
+    return dict(
+        contributions.order_by().values('branch').annotate(
+            total=Sum('mission_amount')
+        ).values_list('branch', 'total')
+    )
 
 
 def get_mission_income(start_date=None, end_date=None):
@@ -104,11 +127,10 @@ def get_mission_income(start_date=None, end_date=None):
     IMPORTANT: This is the ONLY authoritative source for mission income.
     Contributions are NOT mission income until verified remittance occurs.
     """
-    remittances = Remittance.objects.filter(status=Remittance.Status.VERIFIED)
-    if start_date:
-        remittances = remittances.filter(year__gte=start_date.year, month__gte=start_date.month)
-    if end_date:
-        remittances = remittances.filter(year__lte=end_date.year, month__lte=end_date.month)
+    remittances = Remittance.objects.filter(
+        remittance_period_filter(start_date, end_date),
+        status=Remittance.Status.VERIFIED
+    )
     
     total_income = remittances.aggregate(total=Sum('amount_sent'))['total'] or Decimal('0.00')
     
@@ -133,13 +155,9 @@ def get_mission_obligations(start_date=None, end_date=None):
     if end_date:
         contributions = contributions.filter(date__lte=end_date)
     
-    total_obligations = Decimal('0.00')
-    
-    for contribution in contributions:
-        mission_amount = contribution.amount * (contribution.contribution_type.mission_percentage / Decimal('100'))
-        total_obligations += mission_amount
+    total_obligations = contributions.aggregate(total=Sum('mission_amount'))['total']
     
-    return total_obligations
+    return total_obligations or Decimal('0.00')
 
 
 def get_local_only_contributions(branch=None, start_date=None, end_date=None):
@@ -230,10 +248,69 @@ def get_financial_summary(branch=None, start_date=None, end_date=None):
 
 
 # Utility functions for reporting
+def branch_subquery_sum(queryset, expression, branch_field='branch'):
+    """
+    Correlated subquery summing expression over queryset rows of the outer branch.
+    Use inside Branch.objects.annotate(); evaluates to 0.00 when there are no rows.
+    """
+    totals = queryset.filter(**{branch_field: OuterRef('pk')}).order_by().values(
+        branch_field
+    ).annotate(total=Sum(expression)).values('total')
+    return Coalesce(
+        Subquery(totals, output_field=MONEY_FIELD), Value(Decimal('0.00')),
+        output_field=MONEY_FIELD
+    )
+
+
+def branch_subquery_count(queryset, branch_field='branch'):
+    """Correlated subquery counting queryset rows of the outer branch."""
+    counts = queryset.filter(**{branch_field: OuterRef('pk')}).order_by().values(
+        branch_field
+    ).annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def remittance_period_filter(start_date=None, end_date=None):
+    """Q selecting remittances whose (year, month) falls within the date range."""
+    period = Q()
+    if start_date:
+        period &= Q(year__gt=start_date.year) | Q(year=start_date.year, month__gte=start_date.month)
+    if end_date:
+        period &= Q(year__lt=end_date.year) | Q(year=end_date.year, month__lte=end_date.month)
+    return period
+
+
 def annotate_branch_financials(queryset, start_date=None, end_date=None):
     """
     Annotate a branch queryset with correct financial calculations.
+    
+    Adds total_contributions, total_expenditures, total_remitted (verified
+    remittances), expected_mission_due and branch_balance, with the same
+    rules as get_branch_balance and get_expected_mission_due. Each figure is
+    a correlated subquery, so all branches are read in one query.
     """
-    # TODO: Implement query annotations for performance
-    # This would use Subquery and Case/When for database-level calculations
-    return queryset
+    contributions = Contribution.objects.all()
+    expenditures = Expenditure.objects.all()
+    if start_date:
+        contributions = contributions.filter(date__gte=start_date)
+        expenditures = expenditures.filter(date__gte=start_date)
+    if end_date:
+        contributions = contributions.filter(date__lte=end_date)
+        expenditures = expenditures.filter(date__lte=end_date)
+    
+    remittances = Remittance.objects.filter(
+        remittance_period_filter(start_date, end_date),
+        status=Remittance.Status.VERIFIED
+    )
+    
+    return queryset.annotate(
+        total_contributions=branch_subquery_sum(contributions, 'amount'),
+        total_expenditures=branch_subquery_sum(expenditures, 'amount'),
+        total_remitted=branch_subquery_sum(remittances, 'amount_sent'),
+        expected_mission_due=branch_subquery_sum(contributions, 'mission_amount'),
+    ).annotate(
+        branch_balance=ExpressionWrapper(
+            F('total_contributions') - F('total_expenditures') - F('total_remitted'),
+            output_field=MONEY_FIELD
+        )
+    )
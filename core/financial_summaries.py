@@ -0,0 +1,479 @@
+"""
+Financial Summaries - Monthly fact tables maintained incrementally.
+
+BranchFinancialSummary holds one row per (branch, year, month) and
+MissionFinancialSummary one row per (year, month). Signal handlers in
+core.summary_signals turn every saved or deleted Contribution, Expenditure,
+Remittance, TitheCommission and PayrollRun into facts and apply the
+difference from its previous state, so reports read pre-aggregated rows
+instead of re-summing raw transactions.
+
+Facts follow the rules the reports already use:
+- Contributions (any status) by contribution type category and date
+- Expenditures approved or paid, branch-level to the branch, mission-level to Mission
+- Remittances verified, by remittance month, to both the branch and Mission
+- Tithe commissions paid, by commission month
+- Payroll runs by run month (net pay)
+
+opening_balance/closing_balance are running balances: a change to one month
+shifts the balances of every later month for the same branch (or Mission).
+"""
+
+import calendar
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction, IntegrityError, connection
+from django.db.models import Sum, F, Q, Case, When, Value, CharField, OuterRef, Subquery
+from django.utils.dateparse import parse_date
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal('0.00')
+
+# Maintained columns, split by which side of the balance they fall on
+BRANCH_INCOME_FIELDS = ['total_tithe', 'total_offerings', 'total_other_contributions', 'mission_returns']
+BRANCH_EXPENDITURE_FIELDS = ['total_branch_expenses', 'remittance_to_mission', 'pastor_commission']
+MISSION_INCOME_FIELDS = ['total_remittances', 'total_other_income']
+MISSION_EXPENDITURE_FIELDS = ['total_payroll', 'total_mission_expenses', 'total_mission_returns']
+
+CATEGORY_FIELDS = {
+    'tithe': 'total_tithe',
+    'offering': 'total_offerings',
+}
+
+
+# ============ FACTS ============
+
+def _as_date(value):
+    """A date field as saved; views often create records straight from form strings."""
+    return parse_date(value) if isinstance(value, str) else value
+
+
+def facts_for(instance):
+    """
+    Return the summary facts a financial document contributes.
+
+    Each fact is ((branch_id, year, month), field, amount); branch_id is None
+    for the Mission summary. Documents that do not count (e.g. a rejected
+    expenditure) contribute no facts.
+    """
+    label = instance._meta.label
+    amount_facts = []
+
+    if label == 'contributions.Contribution':
+        when = _as_date(instance.date)
+        if when and instance.branch_id:
+            category = instance.contribution_type.category if instance.contribution_type_id else None
+            field = CATEGORY_FIELDS.get(category, 'total_other_contributions')
+            key = (instance.branch_id, when.year, when.month)
+            amount_facts.append((key, field, instance.amount))
+
+    elif label == 'expenditure.Expenditure':
+        when = _as_date(instance.date)
+        if when and instance.status in ['approved', 'paid']:
+            period = (when.year, when.month)
+            if instance.level == 'branch' and instance.branch_id:
+                amount_facts.append(((instance.branch_id,) + period, 'total_branch_expenses', instance.amount))
+            elif instance.level == 'mission':
+                amount_facts.append(((None,) + period, 'total_mission_expenses', instance.amount))
+
+    elif label == 'contributions.Remittance':
+        if instance.status == 'verified':
+            period = (instance.year, instance.month)
+            amount_facts.append(((instance.branch_id,) + period, 'remittance_to_mission', instance.amount_sent))
+            amount_facts.append(((None,) + period, 'total_remittances', instance.amount_sent))
+
+    elif label == 'contributions.TitheCommission':
+        if instance.status == 'paid':
+            key = (instance.branch_id, instance.year, instance.month)
+            amount_facts.append((key, 'pastor_commission', instance.commission_amount))
+
+    elif label == 'payroll.PayrollRun':
+        amount_facts.append(((None, instance.year, instance.month), 'total_payroll', instance.total_net_pay))
+
+    return [(key, field, Decimal(amount or 0)) for key, field, amount in amount_facts if amount]
+
+
+def diff_facts(before, after):
+    """Net the facts of a document's previous and new state into {key: {field: delta}}."""
+    deltas = defaultdict(lambda: defaultdict(Decimal))
+    for key, field, amount in before:
+        deltas[key][field] -= amount
+    for key, field, amount in after:
+        deltas[key][field] += amount
+    return {
+        key: {field: delta for field, delta in fields.items() if delta}
+        for key, fields in deltas.items()
+        if any(fields.values())
+    }
+
+
+# ============ APPLYING DELTAS ============
+
+def apply_deltas(deltas):
+    """Apply {(branch_id, year, month): {field: delta}} to the summary tables."""
+    for (branch_id, year, month), changes in deltas.items():
+        if branch_id:
+            _apply(_branch_scope(branch_id), year, month, changes,
+                   BRANCH_INCOME_FIELDS, BRANCH_EXPENDITURE_FIELDS)
+        else:
+            _apply(_mission_scope(), year, month, changes,
+                   MISSION_INCOME_FIELDS, MISSION_EXPENDITURE_FIELDS)
+
+
+def _branch_scope(branch_id):
+    from core.models import BranchFinancialSummary
+    return BranchFinancialSummary, {'branch_id': branch_id}
+
+
+def _mission_scope():
+    from core.models import MissionFinancialSummary
+    return MissionFinancialSummary, {}
+
+
+def _later_than(year, month):
+    return Q(year__gt=year) | Q(year=year, month__gt=month)
+
+
+def _apply(scope, year, month, changes, income_fields, expenditure_fields):
+    """Add changes to one month's row and carry the net into later months' balances."""
+    model, owner = scope
+    income = sum((changes.get(f, ZERO) for f in income_fields), ZERO)
+    expenditure = sum((changes.get(f, ZERO) for f in expenditure_fields), ZERO)
+    net = income - expenditure
+
+    with transaction.atomic():
+        row = _get_or_create_row(model, owner, year, month)
+        # Each expression reads only its own column, so one UPDATE is enough
+        updates = {field: F(field) + delta for field, delta in changes.items()}
+        updates['total_income'] = F('total_income') + income
+        updates['total_expenditure'] = F('total_expenditure') + expenditure
+        updates['closing_balance'] = F('closing_balance') + net
+        model.objects.filter(pk=row.pk).update(**updates)
+
+        if net:
+            model.objects.filter(_later_than(year, month), **owner).update(
+                opening_balance=F('opening_balance') + net,
+                closing_balance=F('closing_balance') + net,
+            )
+
+
+def _get_or_create_row(model, owner, year, month):
+    """Fetch a month's row, creating it with the previous month's closing balance."""
+    row = model.objects.filter(year=year, month=month, **owner).first()
+    if row:
+        return row
+
+    previous = model.objects.filter(
+        Q(year__lt=year) | Q(year=year, month__lt=month), **owner
+    ).order_by('-year', '-month').values_list('closing_balance', flat=True).first()
+    opening = previous or ZERO
+
+    try:
+        with transaction.atomic():
+            return model.objects.create(
+                year=year, month=month, opening_balance=opening, closing_balance=opening, **owner
+            )
+    except IntegrityError:
+        # Created concurrently by another writer
+        return model.objects.get(year=year, month=month, **owner)
+
+
+# ============ BACKFILL ============
+
+def month_range(start, end):
+    """List (year, month) pairs from start to end inclusive; both are (year, month)."""
+    months = []
+    year, month = start
+    while (year, month) <= tuple(end):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def compute_month(year, month):
+    """
+    Recompute one month's facts from the raw documents with grouped queries.
+    Returns {(branch_id, year, month): {field: amount}} including the Mission key.
+    """
+    from contributions.models import Contribution, Remittance, TitheCommission
+    from expenditure.models import Expenditure
+    from payroll.models import PayrollRun
+
+    totals = defaultdict(lambda: defaultdict(Decimal))
+    dates = (date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1]))
+
+    bucket = Case(
+        *[When(contribution_type__category=category, then=Value(field))
+          for category, field in CATEGORY_FIELDS.items()],
+        default=Value('total_other_contributions'),
+        output_field=CharField(),
+    )
+    for row in Contribution.objects.filter(
+        date__range=dates
+    ).annotate(bucket=bucket).order_by().values('branch_id', 'bucket').annotate(total=Sum('amount')):
+        totals[(row['branch_id'], year, month)][row['bucket']] += row['total'] or ZERO
+
+    for row in Expenditure.objects.filter(
+        date__range=dates,
+        status__in=['approved', 'paid'],
+    ).filter(
+        Q(level='branch', branch__isnull=False) | Q(level='mission')
+    ).order_by().values('level', 'branch_id').annotate(total=Sum('amount')):
+        if row['level'] == 'mission':
+            totals[(None, year, month)]['total_mission_expenses'] += row['total'] or ZERO
+        else:
+            totals[(row['branch_id'], year, month)]['total_branch_expenses'] += row['total'] or ZERO
+
+    for row in Remittance.objects.filter(
+        year=year, month=month, status='verified'
+    ).order_by().values('branch_id').annotate(total=Sum('amount_sent')):
+        totals[(row['branch_id'], year, month)]['remittance_to_mission'] += row['total'] or ZERO
+        totals[(None, year, month)]['total_remittances'] += row['total'] or ZERO
+
+    for row in TitheCommission.objects.filter(
+        year=year, month=month, status='paid'
+    ).order_by().values('branch_id').annotate(total=Sum('commission_amount')):
+        totals[(row['branch_id'], year, month)]['pastor_commission'] += row['total'] or ZERO
+
+    payroll = PayrollRun.objects.filter(year=year, month=month).aggregate(
+        total=Sum('total_net_pay')
+    )['total']
+    if payroll:
+        totals[(None, year, month)]['total_payroll'] += payroll
+
+    return {key: dict(fields) for key, fields in totals.items()}
+
+
+def _compute_month_in_thread(period):
+    try:
+        return compute_month(*period)
+    finally:
+        # Each worker thread opened its own connection
+        connection.close()
+
+
+def rebuild_summaries(start, end, workers=4):
+    """
+    Rebuild both summary tables for the months from start to end, (year, month) pairs.
+
+    Months are recomputed in parallel threads, written in one transaction, and
+    then the running balances of the rebuilt branches (and Mission) are
+    recomputed from start on. Closing
+    status and notes on existing rows are kept.
+
+    Returns the number of month rows written.
+    """
+    from core.models import BranchFinancialSummary, MissionFinancialSummary
+
+    months = month_range(start, end)
+    if not months:
+        return 0
+
+    if workers > 1 and len(months) > 1 and not connection.in_atomic_block:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_compute_month_in_thread, months))
+    else:
+        computed = [compute_month(*period) for period in months]
+
+    flow_fields = {
+        BranchFinancialSummary: BRANCH_INCOME_FIELDS + BRANCH_EXPENDITURE_FIELDS,
+        MissionFinancialSummary: MISSION_INCOME_FIELDS + MISSION_EXPENDITURE_FIELDS,
+    }
+    period = Q(year__gt=start[0]) | Q(year=start[0], month__gte=start[1])
+    period &= Q(year__lt=end[0]) | Q(year=end[0], month__lte=end[1])
+
+    written = 0
+    branch_ids = set()
+    with transaction.atomic():
+        for model, fields in flow_fields.items():
+            is_branch = model is BranchFinancialSummary
+            existing = {
+                (row.branch_id if is_branch else None, row.year, row.month): row
+                for row in model.objects.filter(period)
+            }
+            recomputed = {
+                key: totals
+                for month_totals in computed
+                for key, totals in month_totals.items()
+                if (key[0] is not None) == is_branch
+            }
+
+            # Rows in the range with no documents any more are zeroed
+            new_rows, updated = [], []
+            for key in set(existing) | set(recomputed):
+                row = existing.get(key)
+                if row is None:
+                    owner = {'branch_id': key[0]} if is_branch else {}
+                    row = model(year=key[1], month=key[2], **owner)
+                    new_rows.append(row)
+                else:
+                    updated.append(row)
+                for field in fields:
+                    setattr(row, field, recomputed.get(key, {}).get(field, ZERO))
+
+            model.objects.bulk_create(new_rows, batch_size=500)
+            model.objects.bulk_update(updated, fields, batch_size=500)
+            written += len(new_rows) + len(updated)
+            if is_branch:
+                branch_ids.update(key[0] for key in set(existing) | set(recomputed))
+
+        rebalance(start, branch_ids)
+
+    return written
+
+
+def rebuild_all_summaries(workers=4):
+    """Rebuild every month from the earliest financial document to the current month."""
+    from django.db.models import Min
+    from contributions.models import Contribution, Remittance, TitheCommission
+    from expenditure.models import Expenditure
+    from payroll.models import PayrollRun
+
+    today = date.today()
+    candidates = [(today.year, today.month)]
+    for model in [Contribution, Expenditure]:
+        first = model.objects.aggregate(first=Min('date'))['first']
+        if first:
+            candidates.append((first.year, first.month))
+    for model in [Remittance, TitheCommission, PayrollRun]:
+        first = model.objects.order_by('year', 'month').values_list('year', 'month').first()
+        if first:
+            candidates.append(tuple(first))
+
+    latest = max(candidates)
+    return rebuild_summaries(min(candidates), latest, workers=workers)
+
+
+def backfill_summaries(**kwargs):
+    """
+    Build the summaries after migrate when none exist yet but there are
+    financial documents, e.g. on the first deploy of the summary tables.
+    Later rebuilds are run with the rebuild_financial_summaries command.
+    """
+    from core.models import BranchFinancialSummary, MissionFinancialSummary
+    from contributions.models import Contribution, Remittance
+    from expenditure.models import Expenditure
+    from payroll.models import PayrollRun
+
+    if BranchFinancialSummary.objects.exists() or MissionFinancialSummary.objects.exists():
+        return 0
+    if not any(model.objects.exists() for model in [Contribution, Expenditure, Remittance, PayrollRun]):
+        return 0
+    written = rebuild_all_summaries(workers=1)
+    logger.info(f"Backfilled {written} financial summary rows")
+    return written
+
+
+def rebalance(start=None, branch_ids=None):
+    """
+    Recompute totals and running opening/closing balances of the summary rows.
+
+    With start, a (year, month) pair, only rows from that month on are
+    recomputed, carrying on from each owner's last closing balance before it;
+    branch_ids limits the branch rows to those branches. Mission rows are
+    always included.
+    """
+    from core.models import BranchFinancialSummary, MissionFinancialSummary
+
+    for model, owner_field, income_fields, expenditure_fields in [
+        (BranchFinancialSummary, 'branch_id', BRANCH_INCOME_FIELDS, BRANCH_EXPENDITURE_FIELDS),
+        (MissionFinancialSummary, None, MISSION_INCOME_FIELDS, MISSION_EXPENDITURE_FIELDS),
+    ]:
+        rows = model.objects.all()
+        if owner_field and branch_ids is not None:
+            rows = rows.filter(branch_id__in=branch_ids)
+
+        openings = {}
+        if start:
+            before = Q(year__lt=start[0]) | Q(year=start[0], month__lt=start[1])
+            if owner_field:
+                # Each branch's last row before start
+                last = model.objects.filter(
+                    before, branch_id=OuterRef('branch_id')
+                ).order_by('-year', '-month').values('pk')[:1]
+                openings = dict(
+                    rows.filter(before, pk=Subquery(last)).values_list('branch_id', 'closing_balance')
+                )
+            else:
+                openings[None] = rows.filter(before).order_by('-year', '-month').values_list(
+                    'closing_balance', flat=True
+                ).first()
+            rows = rows.exclude(before)
+
+        order = ([owner_field] if owner_field else []) + ['year', 'month']
+        changed = []
+        owner, running = object(), ZERO
+        for row in rows.order_by(*order).iterator():
+            row_owner = getattr(row, owner_field) if owner_field else None
+            if row_owner != owner:
+                owner, running = row_owner, openings.get(row_owner) or ZERO
+            income = sum((getattr(row, f) for f in income_fields), ZERO)
+            expenditure = sum((getattr(row, f) for f in expenditure_fields), ZERO)
+            values = (running, income, expenditure, running + income - expenditure)
+            if values != (row.opening_balance, row.total_income, row.total_expenditure, row.closing_balance):
+                row.opening_balance, row.total_income, row.total_expenditure, row.closing_balance = values
+                changed.append(row)
+            running = row.closing_balance
+        model.objects.bulk_update(
+            changed, ['opening_balance', 'total_income', 'total_expenditure', 'closing_balance'],
+            batch_size=500
+        )
+
+
+# ============ READING ============
+
+def summary_period(year, months=None):
+    """Q selecting summary rows of a year, optionally limited to some months."""
+    period = Q(year=year)
+    if months:
+        period &= Q(month__in=months)
+    return period
+
+
+def branch_summary_totals(year, months=None, group_by='branch', branches=None):
+    """
+    Sum branch summary rows for a period, grouped by branch, district or area.
+
+    Returns dict of group id -> {field: total} for every maintained column
+    plus total_contributions, total_income and total_expenditure.
+    """
+    from core.models import BranchFinancialSummary
+
+    group_field = {
+        'branch': 'branch_id',
+        'district': 'branch__district_id',
+        'area': 'branch__district__area_id',
+    }[group_by]
+    fields = BRANCH_INCOME_FIELDS + BRANCH_EXPENDITURE_FIELDS + ['total_income', 'total_expenditure']
+
+    rows = BranchFinancialSummary.objects.filter(summary_period(year, months))
+    if branches is not None:
+        rows = rows.filter(branch__in=branches)
+
+    totals = {}
+    for row in rows.order_by().values(group_field).annotate(
+        **{field: Sum(field) for field in fields}
+    ):
+        group = row.pop(group_field)
+        row = {field: value or ZERO for field, value in row.items()}
+        row['total_contributions'] = (
+            row['total_tithe'] + row['total_offerings'] + row['total_other_contributions']
+        )
+        totals[group] = row
+    return totals
+
+
+def mission_summary_totals(year, months=None):
+    """Sum Mission summary rows for a period into {field: total}."""
+    from core.models import MissionFinancialSummary
+
+    fields = MISSION_INCOME_FIELDS + MISSION_EXPENDITURE_FIELDS + ['total_income', 'total_expenditure']
+    totals = MissionFinancialSummary.objects.filter(summary_period(year, months)).aggregate(
+        **{field: Sum(field) for field in fields}
+    )
+    return {field: value or ZERO for field, value in totals.items()}
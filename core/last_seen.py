@@ -0,0 +1,132 @@
+"""
+Last Seen - Buffered User.last_login updates.
+
+ActiveUserMiddleware records each authenticated request in the shared cache
+instead of saving the user. Each process keeps the users it saw during the
+current LAST_SEEN_FLUSH_SECONDS bucket in one dict, stored under a slot key
+it claims for that bucket (last-seen:<bucket>:0, :1, ...), and rewrites it
+when it sees a new user. A django-q schedule (see core.schedules) reads the
+slots of the finished buckets and writes them with one statement for all
+users seen:
+
+    UPDATE accounts_user SET last_login = CASE WHEN id = 1 THEN ... END
+    WHERE id IN (1, ...)
+
+so browsing costs no database write in the request, and one write per
+interval however many users and workers are active. The flush reads a few
+slot keys per bucket, however many users there are.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, When, Value, DateTimeField
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Users per UPDATE statement
+FLUSH_BATCH_SIZE = 500
+
+# Buckets kept in the cache; older ones are lost if the worker was down that long
+BUCKETS_KEPT = 10
+
+FLUSHED_BUCKET_KEY = 'last-seen:flushed'
+
+# Slot keys read per cache round trip when flushing
+SLOT_BATCH_SIZE = 8
+
+# Users this process has seen in the current bucket, and its slot for them
+_seen = {}
+_seen_bucket = None
+_slot = None
+_lock = threading.Lock()
+
+
+def _interval():
+    return getattr(settings, 'LAST_SEEN_FLUSH_SECONDS', 60)
+
+
+def _timeout():
+    return _interval() * (BUCKETS_KEPT + 1)
+
+
+def _current_bucket():
+    return int(time.time() // _interval())
+
+
+def _slot_key(bucket, slot):
+    return f'last-seen:{bucket}:{slot}'
+
+
+def _claim_slot(bucket):
+    """Take the first free slot of the bucket; cache.add is atomic on every backend."""
+    slot = 0
+    while not cache.add(_slot_key(bucket, slot), {}, _timeout()):
+        slot += 1
+    return slot
+
+
+def record_last_seen(user_id, when=None):
+    """Remember that the user made a request now (or at when)."""
+    global _seen_bucket, _slot
+    bucket = _current_bucket()
+    with _lock:
+        if bucket != _seen_bucket:
+            _seen.clear()
+            _seen_bucket = bucket
+            _slot = None
+        if user_id in _seen:
+            return
+        _seen[user_id] = when or timezone.now()
+        if _slot is None:
+            _slot = _claim_slot(bucket)
+        cache.set(_slot_key(bucket, _slot), dict(_seen), _timeout())
+
+
+def _read_bucket(bucket, seen):
+    """Merge every slot of a bucket into seen, keeping each user's latest time."""
+    start = 0
+    while True:
+        keys = [_slot_key(bucket, slot) for slot in range(start, start + SLOT_BATCH_SIZE)]
+        found = cache.get_many(keys)
+        for key in keys:
+            for user_id, when in found.get(key, {}).items():
+                seen[user_id] = max(seen.get(user_id, when), when)
+        if len(found) < len(keys):
+            return
+        start += SLOT_BATCH_SIZE
+
+
+def flush_last_seen():
+    """
+    Write the finished buckets to User.last_login. Runs from the django-q
+    schedule. Returns the number of users written.
+    """
+    from accounts.models import User
+
+    current = _current_bucket()
+    flushed = cache.get(FLUSHED_BUCKET_KEY)
+    first = current - 1 if flushed is None else max(flushed + 1, current - BUCKETS_KEPT)
+    buckets = range(first, current)
+    if not buckets:
+        return 0
+
+    seen = {}
+    for bucket in buckets:
+        _read_bucket(bucket, seen)
+
+    seen_ids = list(seen)
+    for start in range(0, len(seen_ids), FLUSH_BATCH_SIZE):
+        batch = seen_ids[start:start + FLUSH_BATCH_SIZE]
+        User.objects.filter(pk__in=batch).update(last_login=Case(
+            *[When(pk=user_id, then=Value(seen[user_id])) for user_id in batch],
+            output_field=DateTimeField(),
+        ))
+
+    cache.set(FLUSHED_BUCKET_KEY, current - 1, None)
+    logger.debug(f"Wrote last seen times of {len(seen)} users")
+    return len(seen)
@@ -12,7 +12,7 @@ LEDGER-CENTRIC DESIGN:
 
 import uuid
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.db.models import Sum, Q
 from django.utils import timezone
@@ -141,11 +141,54 @@ class LedgerEntry(TimeStampedModel):
             models.Index(fields=['owner_branch', 'entry_type']),
             models.Index(fields=['entry_date', 'source_type']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
         return f"{self.get_entry_type_display()} - {self.get_owner_display()} - {self.amount}"
     
+    def save(self, *args, **kwargs):
+        """
+        Save the entry and keep LedgerBalance in step, in the same transaction.
+        New ACTIVE entries also get their running balance in balance_after.
+        """
+        with transaction.atomic():
+            if self._state.adding:
+                if self.status == self.Status.ACTIVE:
+                    self.balance_after = self._apply_to_balances(self.amount)
+            else:
+                previous = LedgerEntry.objects.filter(pk=self.pk).first()
+                if previous is not None and previous._balance_state() != self._balance_state():
+                    if previous.status == self.Status.ACTIVE:
+                        previous._apply_to_balances(-previous.amount)
+                    if self.status == self.Status.ACTIVE:
+                        self._apply_to_balances(self.amount)
+            super().save(*args, **kwargs)
+    
+    def _apply_to_balances(self, amount):
+        """
+        Post amount to this entry's LedgerBalance row and to any month-end
+        checkpoints it falls inside. Returns the new running balance.
+        """
+        owner_key = self.get_owner_key()
+        LedgerCheckpoint.apply(self.owner_type, owner_key, self.entry_type, self.entry_date, amount)
+        return LedgerBalance.apply(self.owner_type, owner_key, self.entry_type, amount)
+    
+    def _balance_state(self):
+        """Fields that decide which balance row this entry counts towards, and by how much."""
+        return (self.status, self.owner_type, self.get_owner_key(), self.entry_type,
+                self.amount, self.entry_date)
+    
+    def get_owner_key(self):
+        """Key identifying this entry's owner in LedgerBalance."""
+        return LedgerBalance.owner_key_for(
+            self.owner_type,
+            owner_branch=self.owner_branch_id,
+            owner_area=self.owner_area_id,
+            owner_district=self.owner_district_id,
+            owner_member=self.owner_member_id,
+        )
+    
     def get_owner_display(self):
         if self.owner_type == self.OwnerType.MISSION:
             return "Mission"
@@ -165,3 +208,346 @@ class LedgerEntry(TimeStampedModel):
         elif self.counterparty_type == self.OwnerType.BRANCH and self.counterparty_branch:
             return self.counterparty_branch.name
         return ""
+
+
+class LedgerBalance(models.Model):
+    """
+    Materialized running balance per owner and entry type.
+    
+    One row per (owner_type, owner_key, entry_type), updated by LedgerEntry.save()
+    in the same transaction as the posting. Balance reads become a single-row
+    lookup instead of a SUM over the whole ledger history.
+    
+    owner_key is the owner's primary key as text ('' for Mission), so one table
+    covers every owner level without nullable foreign keys in the unique key.
+    Rebuild from raw entries with: python manage.py rebuild_ledger_balances
+    """
+    
+    owner_type = models.CharField(max_length=20, choices=LedgerEntry.OwnerType.choices)
+    owner_key = models.CharField(max_length=36, blank=True)
+    entry_type = models.CharField(max_length=20, choices=LedgerEntry.EntryType.choices)
+    
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Ledger Balance'
+        verbose_name_plural = 'Ledger Balances'
+        unique_together = ['owner_type', 'owner_key', 'entry_type']
+    
+    def __str__(self):
+        return f"{self.owner_type}:{self.owner_key or '-'} {self.entry_type} = {self.balance}"
+    
+    @staticmethod
+    def owner_key_for(owner_type, owner_branch=None, owner_area=None,
+                      owner_district=None, owner_member=None):
+        """
+        Build the owner key for an owner type.
+        Owners may be passed as model instances or primary keys.
+        Returns None when the owner for a non-mission type is not given.
+        """
+        owner = {
+            LedgerEntry.OwnerType.BRANCH: owner_branch,
+            LedgerEntry.OwnerType.AREA: owner_area,
+            LedgerEntry.OwnerType.DISTRICT: owner_district,
+            LedgerEntry.OwnerType.MEMBER: owner_member,
+        }.get(owner_type)
+        
+        if owner_type == LedgerEntry.OwnerType.MISSION:
+            return ''
+        if owner is None:
+            return None
+        return str(getattr(owner, 'pk', owner))
+    
+    @classmethod
+    def apply(cls, owner_type, owner_key, entry_type, amount):
+        """
+        Add amount to a balance row under a row lock and return the new balance.
+        Must run inside the posting's transaction.
+        """
+        with transaction.atomic():
+            row, _ = cls.objects.select_for_update().get_or_create(
+                owner_type=owner_type,
+                owner_key=owner_key or '',
+                entry_type=entry_type,
+            )
+            row.balance = row.balance + Decimal(str(amount))
+            row.save(update_fields=['balance', 'updated_at'])
+        return row.balance
+
+
+class LedgerCheckpoint(models.Model):
+    """
+    Closing balance per owner and entry type at the end of a locked month.
+    
+    Written by LedgerService.lock_entries_for_month. An as-of-date balance is
+    the latest checkpoint on or before the date plus the entries since, so
+    historical queries only sum a small delta instead of the whole history.
+    Late postings dated inside a checkpointed month are added to the affected
+    checkpoints by LedgerEntry.save(), so checkpoints always stay exact.
+    """
+    
+    owner_type = models.CharField(max_length=20, choices=LedgerEntry.OwnerType.choices)
+    owner_key = models.CharField(max_length=36, blank=True)
+    entry_type = models.CharField(max_length=20, choices=LedgerEntry.EntryType.choices)
+    
+    year = models.IntegerField()
+    month = models.IntegerField()
+    period_end = models.DateField()
+    
+    closing_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-period_end']
+        verbose_name = 'Ledger Checkpoint'
+        verbose_name_plural = 'Ledger Checkpoints'
+        unique_together = ['owner_type', 'owner_key', 'entry_type', 'year', 'month']
+        indexes = [
+            models.Index(fields=['owner_type', 'owner_key', 'entry_type', 'period_end']),
+        ]
+    
+    def __str__(self):
+        return f"{self.owner_type}:{self.owner_key or '-'} {self.entry_type} {self.month}/{self.year} = {self.closing_balance}"
+    
+    @classmethod
+    def apply(cls, owner_type, owner_key, entry_type, entry_date, amount):
+        """Add amount to every checkpoint of this key that closes on or after entry_date."""
+        return cls.objects.filter(
+            owner_type=owner_type,
+            owner_key=owner_key or '',
+            entry_type=entry_type,
+            period_end__gte=entry_date,
+        ).update(closing_balance=models.F('closing_balance') + Decimal(str(amount)))
+
+
+class LedgerOutbox(models.Model):
+    """
+    Transactional outbox for ledger postings.
+    
+    The ledger signal handlers only write a row here, in the same transaction
+    as the source document. A django-q worker (core.ledger_tasks) drains the
+    outbox in batches, posting the ledger entries with retries. The unique
+    idempotency_key keeps one row per source document: enqueueing it again
+    puts that row back in the queue, and the worker skips documents whose
+    entries already exist.
+    """
+    
+    class SourceType(models.TextChoices):
+        CONTRIBUTION = 'contribution', 'Contribution'
+        REMITTANCE = 'remittance', 'Remittance'
+        EXPENDITURE = 'expenditure', 'Expenditure'
+        COMMISSION = 'commission', 'Commission'
+        MISSION_DONATION = 'mission_donation', 'Mission Donation'
+    
+    source_type = models.CharField(max_length=20, choices=SourceType.choices)
+    source_id = models.CharField(max_length=36)
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+    
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    entries_posted = models.PositiveIntegerField(default=0)
+    
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Ledger Outbox Item'
+        verbose_name_plural = 'Ledger Outbox'
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_source_type_display()} {self.source_id} ({self.status})"
+    
+    @classmethod
+    def enqueue(cls, source_type, source_id):
+        """
+        Record that a source document needs ledger posting.
+        A single upsert: a source already in the outbox is made PENDING again
+        with fresh attempts, so one that FAILED or was posted before (and has
+        since been reverted and verified again) is picked up by the worker.
+        """
+        cls.objects.bulk_create([
+            cls(
+                source_type=source_type,
+                source_id=str(source_id),
+                idempotency_key=f"{source_type}:{source_id}",
+            )
+        ], update_conflicts=True, unique_fields=['idempotency_key'],
+            update_fields=['status', 'attempts', 'last_error', 'available_at', 'processed_at'])
+
+
+class LedgerEntryArchive(models.Model):
+    """
+    Cold storage for ledger entries of locked, fully closed years.
+    
+    LedgerService.archive_year moves a closed year here so the hot
+    LedgerEntry table only holds the open period. Columns mirror LedgerEntry
+    one-for-one and in the same order, so the two tables can be combined with
+    UNION (see LedgerService.get_entries). Archived entries still count
+    towards LedgerBalance and the month-end checkpoints, which are written
+    before the move and carried forward unchanged.
+    """
+    
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    
+    id = models.UUIDField(primary_key=True, editable=False)
+    entry_type = models.CharField(max_length=20, choices=LedgerEntry.EntryType.choices)
+    owner_type = models.CharField(max_length=20, choices=LedgerEntry.OwnerType.choices)
+    
+    owner_branch = models.ForeignKey(
+        'core.Branch', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    owner_area = models.ForeignKey(
+        'core.Area', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    owner_district = models.ForeignKey(
+        'core.District', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    owner_member = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.PROTECT, null=True, blank=True,
+        related_name='+'
+    )
+    
+    counterparty_type = models.CharField(max_length=20, choices=LedgerEntry.OwnerType.choices, blank=True)
+    counterparty_branch = models.ForeignKey(
+        'core.Branch', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    counterparty_area = models.ForeignKey(
+        'core.Area', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    counterparty_district = models.ForeignKey(
+        'core.District', on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+    balance_after = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    source_type = models.CharField(max_length=20, choices=LedgerEntry.SourceType.choices)
+    
+    contribution = models.ForeignKey(
+        'contributions.Contribution', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    expenditure = models.ForeignKey(
+        'expenditure.Expenditure', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    remittance = models.ForeignKey(
+        'contributions.Remittance', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    commission = models.ForeignKey(
+        'contributions.TitheCommission', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    
+    entry_date = models.DateField()
+    description = models.TextField(blank=True)
+    reference = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=20, choices=LedgerEntry.Status.choices)
+    # Reversals may point at either table, so no database constraint
+    reversed_by = models.ForeignKey(
+        LedgerEntry, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+'
+    )
+    is_locked = models.BooleanField(default=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-entry_date', '-created_at']
+        verbose_name = 'Archived Ledger Entry'
+        verbose_name_plural = 'Archived Ledger Entries'
+        indexes = [
+            models.Index(fields=['owner_type', 'entry_type', 'entry_date']),
+            models.Index(fields=['owner_branch', 'entry_type']),
+            models.Index(fields=['entry_date', 'source_type']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_entry_type_display()} - {self.entry_date} - {self.amount}"
+    
+    @classmethod
+    def from_entry(cls, entry):
+        """Build an (unsaved) archive row holding the same values as a LedgerEntry."""
+        return cls(**{
+            field.attname: getattr(entry, field.attname)
+            for field in LedgerEntry._meta.concrete_fields
+        })
+
+
+class LedgerArchivedYear(models.Model):
+    """
+    Register of years moved to LedgerEntryArchive.
+    Entries dated on or before period_end of the latest archived year live
+    in the archive table.
+    """
+    
+    year = models.IntegerField(unique=True)
+    period_end = models.DateField()
+    entry_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    archived_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='+'
+    )
+    
+    class Meta:
+        ordering = ['-year']
+        verbose_name = 'Archived Ledger Year'
+        verbose_name_plural = 'Archived Ledger Years'
+    
+    def __str__(self):
+        return f"Ledger {self.year} ({self.entry_count} entries)"
+    
+    @classmethod
+    def archived_through(cls):
+        """Last date held in the archive, or None when nothing is archived."""
+        return cls.objects.order_by('-period_end').values_list('period_end', flat=True).first()
+
+
+class LedgerVerificationRun(models.Model):
+    """
+    One run of the incremental ledger verifier (core.ledger_verifier).
+    
+    checked_through is the high-water mark: the next run only looks at ledger
+    entries, contributions and remittances changed after it.
+    """
+    
+    checked_from = models.DateTimeField(null=True, blank=True)
+    checked_through = models.DateTimeField()
+    
+    branches_checked = models.PositiveIntegerField(default=0)
+    contributions_checked = models.PositiveIntegerField(default=0)
+    remittances_checked = models.PositiveIntegerField(default=0)
+    flags_raised = models.PositiveIntegerField(default=0)
+    
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-checked_through']
+        verbose_name = 'Ledger Verification Run'
+        verbose_name_plural = 'Ledger Verification Runs'
+    
+    def __str__(self):
+        return f"Ledger verification through {self.checked_through:%Y-%m-%d %H:%M} ({self.flags_raised} flags)"
@@ -3,11 +3,32 @@ Ledger Service - Business logic for ledger operations.
 Handles creation of ledger entries from financial transactions.
 """
 
+from datetime import date, timedelta
 from decimal import Decimal
 from django.db import transaction
-from django.db.models import Sum, Q
+from django.db.models import Sum, Q, F, Case, When, Value, DecimalField
 from django.utils import timezone
 
+from core.cache import CacheNamespace
+
+# Cached receivables are keyed by ledger version, so this only bounds memory use
+RECEIVABLES_CACHE_TIMEOUT = 60 * 60
+
+LEDGER_CACHE = CacheNamespace('ledger', timeout=RECEIVABLES_CACHE_TIMEOUT)
+
+
+class InsufficientFundsError(Exception):
+    """Raised when a spender's available balance does not cover an expenditure."""
+    
+    def __init__(self, level, available):
+        self.level = level
+        self.available = available
+        if level == 'mission':
+            message = f"Insufficient Mission cash. Available: GH₵{available:.2f}"
+        else:
+            message = f"Insufficient branch funds. Spendable: GH₵{available:.2f}"
+        super().__init__(message)
+
 
 class LedgerService:
     """
@@ -26,91 +47,171 @@ class LedgerService:
         2. Mission RECEIVABLE +40 (owed by branch)
         3. Branch PAYABLE +40 (owed to mission)
         """
+        entries = cls.build_contribution_entries(contribution)
+        
+        with transaction.atomic():
+            for entry in entries:
+                entry.save()
+        
+        return entries
+    
+    @classmethod
+    def build_contribution_entries(cls, contribution):
+        """
+        Build (unsaved) ledger entries for a contribution.
+        Shared by create_contribution_entries and post_batch.
+        """
         from core.ledger_models import LedgerEntry
         
         entries = []
+        reference = contribution.reference or str(contribution.id)[:8]
         
-        with transaction.atomic():
-            # 1. Branch receives full cash
-            branch_cash = LedgerEntry.objects.create(
-                entry_type=LedgerEntry.EntryType.CASH,
+        # 1. Branch receives full cash
+        entries.append(LedgerEntry(
+            entry_type=LedgerEntry.EntryType.CASH,
+            owner_type=LedgerEntry.OwnerType.BRANCH,
+            owner_branch=contribution.branch,
+            amount=contribution.amount,
+            source_type=LedgerEntry.SourceType.CONTRIBUTION,
+            contribution=contribution,
+            entry_date=contribution.date,
+            description=f"Contribution received: {contribution.contribution_type.name}",
+            reference=reference
+        ))
+        
+        # 2. If mission has allocation, create RECEIVABLE for mission
+        if contribution.mission_amount > 0:
+            entries.append(LedgerEntry(
+                entry_type=LedgerEntry.EntryType.RECEIVABLE,
+                owner_type=LedgerEntry.OwnerType.MISSION,
+                counterparty_type=LedgerEntry.OwnerType.BRANCH,
+                counterparty_branch=contribution.branch,
+                amount=contribution.mission_amount,
+                source_type=LedgerEntry.SourceType.CONTRIBUTION,
+                contribution=contribution,
+                entry_date=contribution.date,
+                description=f"Mission allocation from {contribution.branch.name}: {contribution.contribution_type.name}",
+                reference=reference
+            ))
+            
+            # 3. Branch PAYABLE to mission
+            entries.append(LedgerEntry(
+                entry_type=LedgerEntry.EntryType.PAYABLE,
                 owner_type=LedgerEntry.OwnerType.BRANCH,
                 owner_branch=contribution.branch,
-                amount=contribution.amount,
+                counterparty_type=LedgerEntry.OwnerType.MISSION,
+                amount=contribution.mission_amount,
                 source_type=LedgerEntry.SourceType.CONTRIBUTION,
                 contribution=contribution,
                 entry_date=contribution.date,
-                description=f"Contribution received: {contribution.contribution_type.name}",
-                reference=contribution.reference or str(contribution.id)[:8]
+                description=f"Payable to Mission: {contribution.contribution_type.name}",
+                reference=reference
+            ))
+        
+        # 4. Area allocation (if any)
+        if contribution.area_amount > 0:
+            entries.append(LedgerEntry(
+                entry_type=LedgerEntry.EntryType.RECEIVABLE,
+                owner_type=LedgerEntry.OwnerType.AREA,
+                owner_area=contribution.branch.district.area,
+                counterparty_type=LedgerEntry.OwnerType.BRANCH,
+                counterparty_branch=contribution.branch,
+                amount=contribution.area_amount,
+                source_type=LedgerEntry.SourceType.CONTRIBUTION,
+                contribution=contribution,
+                entry_date=contribution.date,
+                description=f"Area allocation from {contribution.branch.name}",
+                reference=reference
+            ))
+        
+        # 5. District allocation (if any)
+        if contribution.district_amount > 0:
+            entries.append(LedgerEntry(
+                entry_type=LedgerEntry.EntryType.RECEIVABLE,
+                owner_type=LedgerEntry.OwnerType.DISTRICT,
+                owner_district=contribution.branch.district,
+                counterparty_type=LedgerEntry.OwnerType.BRANCH,
+                counterparty_branch=contribution.branch,
+                amount=contribution.district_amount,
+                source_type=LedgerEntry.SourceType.CONTRIBUTION,
+                contribution=contribution,
+                entry_date=contribution.date,
+                description=f"District allocation from {contribution.branch.name}",
+                reference=reference
+            ))
+        
+        return entries
+    
+    @classmethod
+    def post_batch(cls, contributions):
+        """
+        Post ledger entries for many contributions at once.
+        
+        Entries are built in memory and inserted with a single bulk_create,
+        with LedgerBalance updated once per affected balance row. Contributions
+        that are not verified or already have ledger entries are skipped.
+        Use with core.ledger_signals.suspend_ledger_signals() around the
+        contribution saves so the per-instance signal does not post them first.
+        
+        Returns the number of ledger entries posted.
+        """
+        from core.ledger_models import LedgerEntry
+        from contributions.models import Contribution
+        
+        ids = [c.pk for c in contributions if c.status == Contribution.Status.VERIFIED]
+        if not ids:
+            return 0
+        
+        with transaction.atomic():
+            already_posted = set(
+                LedgerEntry.objects.filter(contribution_id__in=ids)
+                .values_list('contribution_id', flat=True)
             )
-            entries.append(branch_cash)
+            batch = Contribution.objects.filter(pk__in=ids).exclude(
+                pk__in=already_posted
+            ).select_related('contribution_type', 'branch__district__area')
+            by_id = {c.pk: c for c in batch}
             
-            # 2. If mission has allocation, create RECEIVABLE for mission
-            if contribution.mission_amount > 0:
-                mission_receivable = LedgerEntry.objects.create(
-                    entry_type=LedgerEntry.EntryType.RECEIVABLE,
-                    owner_type=LedgerEntry.OwnerType.MISSION,
-                    counterparty_type=LedgerEntry.OwnerType.BRANCH,
-                    counterparty_branch=contribution.branch,
-                    amount=contribution.mission_amount,
-                    source_type=LedgerEntry.SourceType.CONTRIBUTION,
-                    contribution=contribution,
-                    entry_date=contribution.date,
-                    description=f"Mission allocation from {contribution.branch.name}: {contribution.contribution_type.name}",
-                    reference=contribution.reference or str(contribution.id)[:8]
-                )
-                entries.append(mission_receivable)
-                
-                # 3. Branch PAYABLE to mission
-                branch_payable = LedgerEntry.objects.create(
-                    entry_type=LedgerEntry.EntryType.PAYABLE,
-                    owner_type=LedgerEntry.OwnerType.BRANCH,
-                    owner_branch=contribution.branch,
-                    counterparty_type=LedgerEntry.OwnerType.MISSION,
-                    amount=contribution.mission_amount,
-                    source_type=LedgerEntry.SourceType.CONTRIBUTION,
-                    contribution=contribution,
-                    entry_date=contribution.date,
-                    description=f"Payable to Mission: {contribution.contribution_type.name}",
-                    reference=contribution.reference or str(contribution.id)[:8]
-                )
-                entries.append(branch_payable)
-            
-            # 4. Area allocation (if any)
-            if contribution.area_amount > 0:
-                area_receivable = LedgerEntry.objects.create(
-                    entry_type=LedgerEntry.EntryType.RECEIVABLE,
-                    owner_type=LedgerEntry.OwnerType.AREA,
-                    owner_area=contribution.branch.district.area,
-                    counterparty_type=LedgerEntry.OwnerType.BRANCH,
-                    counterparty_branch=contribution.branch,
-                    amount=contribution.area_amount,
-                    source_type=LedgerEntry.SourceType.CONTRIBUTION,
-                    contribution=contribution,
-                    entry_date=contribution.date,
-                    description=f"Area allocation from {contribution.branch.name}",
-                    reference=contribution.reference or str(contribution.id)[:8]
-                )
-                entries.append(area_receivable)
+            entries = []
+            for pk in ids:
+                if pk in by_id:
+                    entries.extend(cls.build_contribution_entries(by_id.pop(pk)))
             
-            # 5. District allocation (if any)
-            if contribution.district_amount > 0:
-                district_receivable = LedgerEntry.objects.create(
-                    entry_type=LedgerEntry.EntryType.RECEIVABLE,
-                    owner_type=LedgerEntry.OwnerType.DISTRICT,
-                    owner_district=contribution.branch.district,
-                    counterparty_type=LedgerEntry.OwnerType.BRANCH,
-                    counterparty_branch=contribution.branch,
-                    amount=contribution.district_amount,
-                    source_type=LedgerEntry.SourceType.CONTRIBUTION,
-                    contribution=contribution,
-                    entry_date=contribution.date,
-                    description=f"District allocation from {contribution.branch.name}",
-                    reference=contribution.reference or str(contribution.id)[:8]
-                )
-                entries.append(district_receivable)
+            if entries:
+                cls._apply_batch_to_balances(entries)
+                LedgerEntry.objects.bulk_create(entries)
         
-        return entries
+        return len(entries)
+    
+    @classmethod
+    def _apply_batch_to_balances(cls, entries):
+        """
+        Update LedgerBalance and checkpoints for unsaved ACTIVE entries and set
+        their balance_after, since bulk_create bypasses LedgerEntry.save().
+        """
+        from core.ledger_models import LedgerBalance, LedgerCheckpoint
+        
+        by_key = {}
+        for entry in entries:
+            key = (entry.owner_type, entry.get_owner_key() or '', entry.entry_type)
+            by_key.setdefault(key, []).append(entry)
+        
+        for (owner_type, owner_key, entry_type), key_entries in by_key.items():
+            total = sum((Decimal(str(e.amount)) for e in key_entries), Decimal('0'))
+            running = LedgerBalance.apply(owner_type, owner_key, entry_type, total) - total
+            for entry in key_entries:
+                running += Decimal(str(entry.amount))
+                entry.balance_after = running
+        
+        earliest = min(entry.entry_date for entry in entries)
+        if LedgerCheckpoint.objects.filter(period_end__gte=earliest).exists():
+            by_date = {}
+            for (owner_type, owner_key, entry_type), key_entries in by_key.items():
+                for entry in key_entries:
+                    date_key = (owner_type, owner_key, entry_type, entry.entry_date)
+                    by_date[date_key] = by_date.get(date_key, Decimal('0')) + Decimal(str(entry.amount))
+            for (owner_type, owner_key, entry_type, entry_date), amount in by_date.items():
+                LedgerCheckpoint.apply(owner_type, owner_key, entry_type, entry_date, amount)
     
     @classmethod
     def create_remittance_entries(cls, remittance, amount_remitted):
@@ -253,34 +354,281 @@ class LedgerService:
         
         return entries
     
+    @classmethod
+    def create_mission_donation_entries(cls, donation):
+        """
+        Create ledger entries when a mission donation is verified.
+        Mission donations go directly to Mission CASH (not through branch).
+        """
+        from core.ledger_models import LedgerEntry
+        
+        entries = []
+        
+        with transaction.atomic():
+            mission_cash_in = LedgerEntry.objects.create(
+                entry_type=LedgerEntry.EntryType.CASH,
+                owner_type=LedgerEntry.OwnerType.MISSION,
+                amount=donation.amount,
+                source_type=LedgerEntry.SourceType.CONTRIBUTION,
+                entry_date=donation.date,
+                description=f'Mission Donation #{donation.id} - {donation.get_donation_type_display()}',
+                reference=donation.payment_reference or str(donation.id)[:8]
+            )
+            entries.append(mission_cash_in)
+        
+        return entries
+    
     @classmethod
     def get_balance(cls, owner_type, entry_type, owner_branch=None, owner_area=None,
                    owner_district=None, owner_member=None, as_of_date=None):
         """
         Get the current balance for a specific owner and entry type.
+        
+        Current balances are read from the materialized LedgerBalance rows.
+        Balances as of a past date start from the latest month-end checkpoint
+        on or before that date and only sum the entries posted since.
         """
-        from core.ledger_models import LedgerEntry
+        from core.ledger_models import LedgerEntry, LedgerBalance, LedgerCheckpoint
         
-        queryset = LedgerEntry.objects.filter(
+        owner_key = LedgerBalance.owner_key_for(
+            owner_type,
+            owner_branch=owner_branch,
+            owner_area=owner_area,
+            owner_district=owner_district,
+            owner_member=owner_member,
+        )
+        
+        if not as_of_date:
+            balances = LedgerBalance.objects.filter(owner_type=owner_type, entry_type=entry_type)
+            if owner_key is not None:
+                balances = balances.filter(owner_key=owner_key)
+            total = balances.aggregate(total=Sum('balance'))['total']
+            return total or Decimal('0')
+        
+        filters = Q(
             owner_type=owner_type,
             entry_type=entry_type,
             status=LedgerEntry.Status.ACTIVE
         )
         
         if owner_type == LedgerEntry.OwnerType.BRANCH and owner_branch:
-            queryset = queryset.filter(owner_branch=owner_branch)
+            filters &= Q(owner_branch=owner_branch)
         elif owner_type == LedgerEntry.OwnerType.AREA and owner_area:
-            queryset = queryset.filter(owner_area=owner_area)
+            filters &= Q(owner_area=owner_area)
         elif owner_type == LedgerEntry.OwnerType.DISTRICT and owner_district:
-            queryset = queryset.filter(owner_district=owner_district)
+            filters &= Q(owner_district=owner_district)
         elif owner_type == LedgerEntry.OwnerType.MEMBER and owner_member:
-            queryset = queryset.filter(owner_member=owner_member)
+            filters &= Q(owner_member=owner_member)
+        
+        opening = Decimal('0')
+        start_date = None
+        if owner_key is not None:
+            checkpoint = LedgerCheckpoint.objects.filter(
+                owner_type=owner_type,
+                owner_key=owner_key,
+                entry_type=entry_type,
+                period_end__lte=as_of_date,
+            ).order_by('-period_end').first()
+            if checkpoint:
+                opening = checkpoint.closing_balance
+                filters &= Q(entry_date__gt=checkpoint.period_end)
+                start_date = checkpoint.period_end + timedelta(days=1)
+        
+        filters &= Q(entry_date__lte=as_of_date)
+        
+        total = cls._aggregate_ledger(filters, start_date, total=Sum('amount'))['total']
+        return opening + (total or Decimal('0'))
+    
+    @classmethod
+    def _ledger_models(cls, start_date=None):
+        """
+        The hot ledger table and, unless the range starts after the last
+        archived year, its archive of closed years.
+        """
+        from core.ledger_models import LedgerEntry, LedgerEntryArchive, LedgerArchivedYear
+        
+        archived_through = LedgerArchivedYear.archived_through()
+        if archived_through and (not start_date or start_date <= archived_through):
+            return (LedgerEntry, LedgerEntryArchive)
+        return (LedgerEntry,)
+    
+    @classmethod
+    def _aggregate_ledger(cls, filters, start_date=None, **aggregates):
+        """
+        Aggregate over the hot ledger and, when the range reaches into an
+        archived year, the archive, adding the results. start_date is the
+        first date the filters can match, if they are bounded.
+        """
+        totals = {}
+        for model in cls._ledger_models(start_date):
+            for key, value in model.objects.filter(filters).aggregate(**aggregates).items():
+                if value is not None:
+                    totals[key] = (totals.get(key) or Decimal('0')) + value
+                else:
+                    totals.setdefault(key, None)
+        return totals
+    
+    @classmethod
+    def _group_ledger(cls, filters, fields, start_date=None, **aggregates):
+        """
+        GROUP BY fields over the hot ledger and, when the range reaches into
+        an archived year, the archive.
+        Returns a list of value dicts, one per distinct group, with the
+        aggregates of both tables added together.
+        """
+        groups = {}
+        for model in cls._ledger_models(start_date):
+            rows = model.objects.filter(filters).values(*fields).annotate(**aggregates).order_by()
+            for row in rows:
+                key = tuple(row[field] for field in fields)
+                if key not in groups:
+                    groups[key] = row
+                    continue
+                for name in aggregates:
+                    if row[name] is not None:
+                        groups[key][name] = (groups[key][name] or Decimal('0')) + row[name]
+        return list(groups.values())
+    
+    @classmethod
+    def get_entries(cls, filters=None, start_date=None, end_date=None):
+        """
+        Unified read API over live and archived ledger entries, newest first.
+        
+        Ranges that stay inside the open period return a plain LedgerEntry
+        queryset. Ranges reaching into archived years return a UNION of both
+        tables; it yields LedgerEntry instances but only supports slicing,
+        count() and ordering, so apply every filter through the arguments.
+        """
+        from core.ledger_models import LedgerEntry, LedgerEntryArchive, LedgerArchivedYear
+        
+        filters = filters or Q()
+        if start_date:
+            filters &= Q(entry_date__gte=start_date)
+        if end_date:
+            filters &= Q(entry_date__lte=end_date)
+        
+        entries = LedgerEntry.objects.filter(filters)
+        
+        archived_through = LedgerArchivedYear.archived_through()
+        if archived_through and (not start_date or start_date <= archived_through):
+            entries = entries.order_by().union(
+                LedgerEntryArchive.objects.filter(filters).order_by(), all=True
+            )
+        
+        return entries.order_by('-entry_date', '-created_at')
+    
+    @classmethod
+    def rebuild_balances(cls):
+        """
+        Recompute every LedgerBalance row from the raw ACTIVE ledger entries,
+        archived years included. Returns the number of balance rows written.
+        """
+        from core.ledger_models import LedgerEntry, LedgerBalance
+        
+        totals = cls._group_ledger(
+            Q(status=LedgerEntry.Status.ACTIVE),
+            ['owner_type', 'entry_type', 'owner_branch', 'owner_area',
+             'owner_district', 'owner_member'],
+            total=Sum('amount')
+        )
+        
+        balances = {}
+        for item in totals:
+            owner_key = LedgerBalance.owner_key_for(
+                item['owner_type'],
+                owner_branch=item['owner_branch'],
+                owner_area=item['owner_area'],
+                owner_district=item['owner_district'],
+                owner_member=item['owner_member'],
+            ) or ''
+            key = (item['owner_type'], owner_key, item['entry_type'])
+            balances[key] = balances.get(key, Decimal('0')) + (item['total'] or Decimal('0'))
+        
+        with transaction.atomic():
+            LedgerBalance.objects.all().delete()
+            LedgerBalance.objects.bulk_create([
+                LedgerBalance(owner_type=owner_type, owner_key=owner_key,
+                              entry_type=entry_type, balance=balance)
+                for (owner_type, owner_key, entry_type), balance in balances.items()
+            ])
+        
+        return len(balances)
+    
+    @classmethod
+    def rebuild_balance_after(cls, batch_size=1000):
+        """
+        Recompute LedgerEntry.balance_after for all live entries in posting order.
+        Returns the number of entries updated.
+        """
+        from core.ledger_models import LedgerEntry, LedgerEntryArchive, LedgerBalance
+        
+        # Archived entries are frozen; live running balances continue from their totals
+        running = {}
+        archived = LedgerEntryArchive.objects.filter(
+            status=LedgerEntry.Status.ACTIVE
+        ).values(
+            'owner_type', 'entry_type', 'owner_branch', 'owner_area',
+            'owner_district', 'owner_member'
+        ).annotate(total=Sum('amount')).order_by()
+        for item in archived:
+            owner_key = LedgerBalance.owner_key_for(
+                item['owner_type'],
+                owner_branch=item['owner_branch'],
+                owner_area=item['owner_area'],
+                owner_district=item['owner_district'],
+                owner_member=item['owner_member'],
+            ) or ''
+            key = (item['owner_type'], owner_key, item['entry_type'])
+            running[key] = running.get(key, Decimal('0')) + item['total']
+        
+        pending = []
+        updated = 0
+        
+        entries = LedgerEntry.objects.filter(
+            status=LedgerEntry.Status.ACTIVE
+        ).order_by('created_at', 'id').only(
+            'id', 'owner_type', 'entry_type', 'amount', 'owner_branch',
+            'owner_area', 'owner_district', 'owner_member', 'balance_after'
+        )
+        
+        for entry in entries.iterator(chunk_size=batch_size):
+            key = (entry.owner_type, entry.get_owner_key() or '', entry.entry_type)
+            running[key] = running.get(key, Decimal('0')) + entry.amount
+            if entry.balance_after != running[key]:
+                entry.balance_after = running[key]
+                pending.append(entry)
+            if len(pending) >= batch_size:
+                LedgerEntry.objects.bulk_update(pending, ['balance_after'])
+                updated += len(pending)
+                pending = []
         
-        if as_of_date:
-            queryset = queryset.filter(entry_date__lte=as_of_date)
+        if pending:
+            LedgerEntry.objects.bulk_update(pending, ['balance_after'])
+            updated += len(pending)
         
-        total = queryset.aggregate(total=Sum('amount'))['total']
-        return total or Decimal('0')
+        return updated
+    
+    @classmethod
+    def rebuild_checkpoints(cls):
+        """
+        Recreate month-end checkpoints for every month that has locked entries.
+        Run after rebuild_balances, since checkpoints are derived from balances.
+        Returns the number of checkpoints written.
+        """
+        from core.ledger_models import LedgerEntry, LedgerEntryArchive, LedgerCheckpoint
+        
+        months = sorted(
+            set(LedgerEntry.objects.filter(is_locked=True).dates('entry_date', 'month')) |
+            set(LedgerEntryArchive.objects.dates('entry_date', 'month'))
+        )
+        
+        written = 0
+        with transaction.atomic():
+            LedgerCheckpoint.objects.all().delete()
+            for month_start in months:
+                written += cls.create_month_checkpoints(month_start.month, month_start.year)
+        
+        return written
     
     @classmethod
     def get_mission_cash_balance(cls, as_of_date=None):
@@ -334,6 +682,96 @@ class LedgerService:
         payables = cls.get_branch_payables(branch, as_of_date)
         return cash - payables
     
+    @classmethod
+    def get_branch_positions(cls):
+        """
+        Cash and payables to Mission of every branch, from the LedgerBalance
+        rows get_spendable checks, in one query.
+        Returns {owner_key: {'cash', 'payables', 'spendable'}}, keyed by
+        str(branch.pk); branches without balance rows are left out.
+        """
+        from core.ledger_models import LedgerEntry, LedgerBalance
+        
+        rows = LedgerBalance.objects.filter(
+            owner_type=LedgerEntry.OwnerType.BRANCH,
+            entry_type__in=[LedgerEntry.EntryType.CASH, LedgerEntry.EntryType.PAYABLE],
+        ).values_list('owner_key', 'entry_type', 'balance')
+        
+        positions = {}
+        for owner_key, entry_type, balance in rows:
+            position = positions.setdefault(owner_key, {'cash': Decimal('0'), 'payables': Decimal('0')})
+            position['cash' if entry_type == LedgerEntry.EntryType.CASH else 'payables'] += balance
+        for position in positions.values():
+            position['spendable'] = position['cash'] - position['payables']
+        return positions
+    
+    @classmethod
+    def get_spendable(cls, level, branch=None, lock=False):
+        """
+        Amount a spender may spend, read from its LedgerBalance rows only.
+        
+        Mission spends CASH only; a branch spends CASH minus PAYABLE to Mission.
+        With lock=True the rows are taken with SELECT ... FOR UPDATE, which
+        must happen inside a transaction; concurrent spenders for the same
+        owner then queue on the row instead of both passing the check.
+
+        Contributions reach the balance rows through the ledger outbox, so
+        a contribution verified in the last worker interval is not counted
+        yet. That only understates what may be spent; a contribution
+        unverified in that interval is still counted until the worker
+        posts its reversal.
+        """
+        from core.ledger_models import LedgerEntry, LedgerBalance
+        
+        if level == 'mission':
+            owner_type, owner_key = LedgerEntry.OwnerType.MISSION, ''
+        else:
+            owner_type, owner_key = LedgerEntry.OwnerType.BRANCH, str(branch.pk)
+        
+        rows = LedgerBalance.objects.filter(
+            owner_type=owner_type,
+            owner_key=owner_key,
+            entry_type__in=[LedgerEntry.EntryType.CASH, LedgerEntry.EntryType.PAYABLE],
+        ).order_by('entry_type')
+        if lock:
+            rows = rows.select_for_update()
+        
+        balances = dict(rows.values_list('entry_type', 'balance'))
+        cash = balances.get(LedgerEntry.EntryType.CASH, Decimal('0'))
+        if level == 'mission':
+            return cash
+        return cash - balances.get(LedgerEntry.EntryType.PAYABLE, Decimal('0'))
+    
+    @classmethod
+    def reserve_and_post_expenditure(cls, level, amount, branch=None, **fields):
+        """
+        Check funds and record an expenditure with its ledger entries atomically.
+        
+        The spender's balance rows stay locked from the check until the
+        expenditure's CASH entry has been posted, so two approvals racing for
+        the same funds cannot both pass. Raises InsufficientFundsError (and
+        creates nothing) when the amount exceeds what may be spent.
+        
+        Returns the created Expenditure.
+        """
+        from expenditure.models import Expenditure
+        from core.ledger_signals import suspend_ledger_signals
+        
+        amount = Decimal(str(amount))
+        
+        with transaction.atomic(), suspend_ledger_signals():
+            available = cls.get_spendable(level, branch, lock=True)
+            if amount > available:
+                raise InsufficientFundsError(level, available)
+            
+            expenditure = Expenditure.objects.create(
+                level=level, branch=branch, amount=amount, **fields
+            )
+            if expenditure.status in ['approved', 'paid']:
+                cls.create_expenditure_entries(expenditure)
+        
+        return expenditure
+    
     @classmethod
     def can_mission_spend(cls, amount):
         """
@@ -352,45 +790,120 @@ class LedgerService:
         spendable = cls.get_branch_spendable_cash(branch)
         return spendable >= amount
     
+    @classmethod
+    def get_receivables_version(cls):
+        """
+        Version stamp for the Mission's receivables.
+        
+        Every RECEIVABLE posting or reversal updates the Mission RECEIVABLE
+        LedgerBalance row, so its pk and updated_at change whenever the
+        receivables by branch can change. Read with one single-row query.
+        """
+        from core.ledger_models import LedgerEntry, LedgerBalance
+        
+        row = LedgerBalance.objects.filter(
+            owner_type=LedgerEntry.OwnerType.MISSION,
+            owner_key='',
+            entry_type=LedgerEntry.EntryType.RECEIVABLE
+        ).values_list('pk', 'updated_at').first()
+        
+        if not row:
+            return '0'
+        return f"{row[0]}.{row[1].timestamp()}"
+    
     @classmethod
     def get_receivables_by_branch(cls, as_of_date=None):
         """
-        Get Mission's receivables grouped by branch.
-        Returns dict: {branch: amount_owed}
+        Get Mission's receivables grouped by branch, highest first.
+        
+        Branch, district and area names are joined in the same query.
+        Returns a list of dicts:
+            {'branch': {'id', 'name', 'code'}, 'district': name,
+             'area': name, 'amount_owed': Decimal}
+        
+        Results are cached per (as_of_date, receivables version), so a new
+        RECEIVABLE posting invalidates them.
         """
         from core.ledger_models import LedgerEntry
-        from core.models import Branch
         
-        queryset = LedgerEntry.objects.filter(
-            owner_type=LedgerEntry.OwnerType.MISSION,
-            entry_type=LedgerEntry.EntryType.RECEIVABLE,
-            status=LedgerEntry.Status.ACTIVE
-        )
+        def compute():
+            filters = Q(
+                owner_type=LedgerEntry.OwnerType.MISSION,
+                entry_type=LedgerEntry.EntryType.RECEIVABLE,
+                status=LedgerEntry.Status.ACTIVE,
+                counterparty_branch__isnull=False
+            )
         
-        if as_of_date:
-            queryset = queryset.filter(entry_date__lte=as_of_date)
+            if as_of_date:
+                filters &= Q(entry_date__lte=as_of_date)
         
-        result = queryset.values('counterparty_branch').annotate(
-            total=Sum('amount')
-        ).filter(total__gt=0)
+            rows = cls._group_ledger(filters, [
+                'counterparty_branch',
+                'counterparty_branch__name',
+                'counterparty_branch__code',
+                'counterparty_branch__district__name',
+                'counterparty_branch__district__area__name',
+            ], total=Sum('amount'))
+            rows = sorted((row for row in rows if row['total'] > 0), key=lambda row: row['total'], reverse=True)
         
-        branch_receivables = {}
-        for item in result:
-            if item['counterparty_branch']:
-                try:
-                    branch = Branch.objects.get(pk=item['counterparty_branch'])
-                    branch_receivables[branch] = item['total']
-                except Branch.DoesNotExist:
-                    pass
+            return [
+                {
+                    'branch': {
+                        'id': row['counterparty_branch'],
+                        'name': row['counterparty_branch__name'],
+                        'code': row['counterparty_branch__code'],
+                    },
+                    'district': row['counterparty_branch__district__name'],
+                    'area': row['counterparty_branch__district__area__name'],
+                    'amount_owed': row['total'],
+                }
+                for row in rows
+            ]
         
-        return branch_receivables
+        cache_name = (
+            f"receivables_by_branch:{as_of_date.isoformat() if as_of_date else 'now'}:"
+            f"{cls.get_receivables_version()}"
+        )
+        return LEDGER_CACHE.get_or_compute(cache_name, compute)
     
     @classmethod
-    def get_monthly_summary(cls, owner_type, month, year, owner_branch=None):
+    def _monthly_summary_aggregates(cls):
         """
-        Get monthly ledger summary for reporting.
+        Conditional aggregates for the six monthly summary figures.
+        Cleared and outgoing amounts are negated so every figure is positive.
         """
         from core.ledger_models import LedgerEntry
+        
+        def conditional_sum(entry_type, incoming):
+            if incoming:
+                condition, value = Q(entry_type=entry_type, amount__gt=0), F('amount')
+            else:
+                condition, value = Q(entry_type=entry_type, amount__lt=0), -F('amount')
+            return Sum(
+                Case(When(condition, then=value), default=Value(Decimal('0'))),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+                default=Decimal('0'),
+            )
+        
+        return {
+            'cash_in': conditional_sum(LedgerEntry.EntryType.CASH, True),
+            'cash_out': conditional_sum(LedgerEntry.EntryType.CASH, False),
+            'receivables_added': conditional_sum(LedgerEntry.EntryType.RECEIVABLE, True),
+            'receivables_cleared': conditional_sum(LedgerEntry.EntryType.RECEIVABLE, False),
+            'payables_added': conditional_sum(LedgerEntry.EntryType.PAYABLE, True),
+            'payables_cleared': conditional_sum(LedgerEntry.EntryType.PAYABLE, False),
+        }
+    
+    @staticmethod
+    def _add_net_figures(summary):
+        summary['net_cash'] = summary['cash_in'] - summary['cash_out']
+        summary['net_receivables'] = summary['receivables_added'] - summary['receivables_cleared']
+        summary['net_payables'] = summary['payables_added'] - summary['payables_cleared']
+        return summary
+    
+    @classmethod
+    def _month_filters(cls, owner_type, month, year):
+        from core.ledger_models import LedgerEntry
         from datetime import date
         from calendar import monthrange
         
@@ -398,47 +911,62 @@ class LedgerService:
         _, last_day = monthrange(year, month)
         end_date = date(year, month, last_day)
         
-        queryset = LedgerEntry.objects.filter(
+        return Q(
             owner_type=owner_type,
             entry_date__gte=start_date,
             entry_date__lte=end_date,
             status=LedgerEntry.Status.ACTIVE
         )
+    
+    @classmethod
+    def get_monthly_summary(cls, owner_type, month, year, owner_branch=None):
+        """
+        Get monthly ledger summary for reporting.
+        Computed by the database with conditional aggregates.
+        """
+        filters = cls._month_filters(owner_type, month, year)
         
         if owner_branch:
-            queryset = queryset.filter(owner_branch=owner_branch)
-        
-        summary = {
-            'cash_in': Decimal('0'),
-            'cash_out': Decimal('0'),
-            'receivables_added': Decimal('0'),
-            'receivables_cleared': Decimal('0'),
-            'payables_added': Decimal('0'),
-            'payables_cleared': Decimal('0'),
-        }
+            filters &= Q(owner_branch=owner_branch)
         
-        for entry in queryset:
-            if entry.entry_type == LedgerEntry.EntryType.CASH:
-                if entry.amount > 0:
-                    summary['cash_in'] += entry.amount
-                else:
-                    summary['cash_out'] += abs(entry.amount)
-            elif entry.entry_type == LedgerEntry.EntryType.RECEIVABLE:
-                if entry.amount > 0:
-                    summary['receivables_added'] += entry.amount
-                else:
-                    summary['receivables_cleared'] += abs(entry.amount)
-            elif entry.entry_type == LedgerEntry.EntryType.PAYABLE:
-                if entry.amount > 0:
-                    summary['payables_added'] += entry.amount
-                else:
-                    summary['payables_cleared'] += abs(entry.amount)
+        summary = cls._aggregate_ledger(
+            filters, date(year, month, 1), **cls._monthly_summary_aggregates()
+        )
+        return cls._add_net_figures(summary)
+    
+    @classmethod
+    def get_monthly_summaries(cls, owner_type, month, year):
+        """
+        Get the monthly ledger summary for every owner of a type at once.
         
-        summary['net_cash'] = summary['cash_in'] - summary['cash_out']
-        summary['net_receivables'] = summary['receivables_added'] - summary['receivables_cleared']
-        summary['net_payables'] = summary['payables_added'] - summary['payables_cleared']
+        One GROUP BY over the month's entries (per ledger table), e.g. the
+        statement for every branch. Returns dict: {owner_id: summary}, where each summary has
+        the same keys as get_monthly_summary. Owners without entries in the
+        month are not included; for MISSION the only key is None.
+        """
+        from core.ledger_models import LedgerEntry
         
-        return summary
+        owner_field = {
+            LedgerEntry.OwnerType.BRANCH: 'owner_branch',
+            LedgerEntry.OwnerType.AREA: 'owner_area',
+            LedgerEntry.OwnerType.DISTRICT: 'owner_district',
+            LedgerEntry.OwnerType.MEMBER: 'owner_member',
+        }.get(owner_type)
+        
+        filters = cls._month_filters(owner_type, month, year)
+        aggregates = cls._monthly_summary_aggregates()
+        start_date = date(year, month, 1)
+        
+        if owner_field is None:
+            return {None: cls._add_net_figures(cls._aggregate_ledger(filters, start_date, **aggregates))}
+        
+        rows = cls._group_ledger(filters, [owner_field], start_date, **aggregates)
+        
+        summaries = {}
+        for row in rows:
+            owner_id = row.pop(owner_field)
+            summaries[owner_id] = cls._add_net_figures(row)
+        return summaries
     
     @classmethod
     def lock_entries_for_month(cls, month, year, branch=None):
@@ -465,4 +993,130 @@ class LedgerService:
             )
         
         count = queryset.update(is_locked=True, locked_at=timezone.now())
+        cls.create_month_checkpoints(month, year, branch)
         return count
+    
+    @classmethod
+    def create_month_checkpoints(cls, month, year, branch=None):
+        """
+        Record month-end closing balances in LedgerCheckpoint.
+        
+        Closing balance = current LedgerBalance minus entries dated after the
+        month end, so only the recent delta is summed. With a branch, only that
+        branch's and Mission's balances are checkpointed.
+        Returns the number of checkpoints written.
+        """
+        from core.ledger_models import LedgerEntry, LedgerBalance, LedgerCheckpoint
+        from datetime import date
+        from calendar import monthrange
+        
+        _, last_day = monthrange(year, month)
+        period_end = date(year, month, last_day)
+        
+        balances = LedgerBalance.objects.all()
+        if branch:
+            balances = balances.filter(
+                Q(owner_type=LedgerEntry.OwnerType.BRANCH, owner_key=str(branch.pk)) |
+                Q(owner_type=LedgerEntry.OwnerType.MISSION)
+            )
+        
+        later = cls._group_ledger(
+            Q(status=LedgerEntry.Status.ACTIVE, entry_date__gt=period_end),
+            ['owner_type', 'entry_type', 'owner_branch', 'owner_area',
+             'owner_district', 'owner_member'],
+            period_end + timedelta(days=1),
+            total=Sum('amount')
+        )
+        
+        posted_since = {}
+        for item in later:
+            owner_key = LedgerBalance.owner_key_for(
+                item['owner_type'],
+                owner_branch=item['owner_branch'],
+                owner_area=item['owner_area'],
+                owner_district=item['owner_district'],
+                owner_member=item['owner_member'],
+            ) or ''
+            key = (item['owner_type'], owner_key, item['entry_type'])
+            posted_since[key] = posted_since.get(key, Decimal('0')) + (item['total'] or Decimal('0'))
+        
+        written = 0
+        with transaction.atomic():
+            for balance in balances:
+                key = (balance.owner_type, balance.owner_key, balance.entry_type)
+                LedgerCheckpoint.objects.update_or_create(
+                    owner_type=balance.owner_type,
+                    owner_key=balance.owner_key,
+                    entry_type=balance.entry_type,
+                    year=year,
+                    month=month,
+                    defaults={
+                        'period_end': period_end,
+                        'closing_balance': balance.balance - posted_since.get(key, Decimal('0')),
+                    }
+                )
+                written += 1
+        
+        return written
+    
+    @classmethod
+    def archive_year(cls, year, user=None, batch_size=1000):
+        """
+        Move the ledger entries of a locked, fully closed year to the archive.
+        
+        Every entry dated on or before 31 December of the year is moved, which
+        also sweeps up late postings into years archived earlier. Month-end
+        checkpoints for the year are written first, so as-of-date balances
+        after the year keep starting from a checkpoint and only scan the open
+        period. LedgerBalance is left as is: archived entries still count.
+        
+        Returns the number of entries moved. Raises ValueError when the year
+        is not closed yet, has unlocked entries or is already archived.
+        """
+        from core.ledger_models import LedgerEntry, LedgerEntryArchive, LedgerArchivedYear
+        from datetime import date
+        
+        period_end = date(year, 12, 31)
+        if period_end >= date.today():
+            raise ValueError(f"{year} has not ended yet.")
+        if LedgerArchivedYear.objects.filter(year=year).exists():
+            raise ValueError(f"{year} is already archived.")
+        
+        entries = LedgerEntry.objects.filter(entry_date__lte=period_end)
+        if entries.filter(is_locked=False).exists():
+            raise ValueError(f"Lock every month up to December {year} before archiving.")
+        if LedgerEntry.objects.filter(
+            entry_date__gt=period_end, reversed_by__entry_date__lte=period_end
+        ).exists():
+            raise ValueError(f"Entries after {year} reverse entries of {year}; archive is not possible yet.")
+        
+        moved = 0
+        with transaction.atomic():
+            for month in range(1, 13):
+                cls.create_month_checkpoints(month, year)
+            
+            # Copy everything before deleting, so reversal links inside the
+            # year are archived before the delete clears them
+            batch = []
+            for entry in entries.order_by('entry_date', 'id').iterator(chunk_size=batch_size):
+                batch.append(LedgerEntryArchive.from_entry(entry))
+                if len(batch) >= batch_size:
+                    LedgerEntryArchive.objects.bulk_create(batch)
+                    moved += len(batch)
+                    batch = []
+            if batch:
+                LedgerEntryArchive.objects.bulk_create(batch)
+                moved += len(batch)
+            
+            ids = list(entries.values_list('id', flat=True))
+            for start in range(0, len(ids), batch_size):
+                LedgerEntry.objects.filter(pk__in=ids[start:start + batch_size]).delete()
+            
+            LedgerArchivedYear.objects.create(
+                year=year,
+                period_end=period_end,
+                entry_count=moved,
+                archived_by=user,
+            )
+        
+        return moved
@@ -1,147 +1,126 @@
 """
 Ledger Signals - Automatically create ledger entries from financial transactions.
 This integrates the ledger system with existing contribution/remittance/expenditure flows.
+
+Handlers do not post to the ledger inline. They record a LedgerOutbox row in
+the same transaction as the source document, and the django-q worker in
+core.ledger_tasks posts the entries with retries.
 """
 
+import threading
+from contextlib import contextmanager
+
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.db import transaction
 
 
+_state = threading.local()
+
+
+@contextmanager
+def suspend_ledger_signals():
+    """
+    Suspend the per-instance ledger signal handlers in this thread.
+    Used while saving a batch that is posted afterwards with LedgerService.post_batch.
+    """
+    _state.suspended = getattr(_state, 'suspended', 0) + 1
+    try:
+        yield
+    finally:
+        _state.suspended -= 1
+
+
+def ledger_signals_suspended():
+    """Whether ledger signal handlers are suspended in this thread."""
+    return getattr(_state, 'suspended', 0) > 0
+
+
 @receiver(post_save, sender='contributions.Contribution')
 def create_contribution_ledger_entries(sender, instance, created, **kwargs):
     """
-    Create ledger entries when a contribution is saved.
-    Only creates entries for verified contributions (NOT drafts).
+    Queue ledger posting when a contribution is saved.
+    Only verified contributions are posted (NOT drafts).
     Draft contributions do NOT create ledger entries until finalized.
     """
+    if ledger_signals_suspended():
+        return
+    
     # Only create ledger entries for verified contributions
     # Draft contributions are editable and should NOT have ledger entries
     if instance.status != 'verified':
         return
     
-    # Check if ledger entries already exist for this contribution
-    from core.ledger_models import LedgerEntry
-    existing = LedgerEntry.objects.filter(contribution=instance).exists()
-    if existing:
-        return
-    
-    try:
-        from core.ledger_service import LedgerService
-        LedgerService.create_contribution_entries(instance)
-    except Exception as e:
-        # Log error but don't break the contribution save
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to create ledger entries for contribution {instance.id}: {e}")
+    from core.ledger_models import LedgerOutbox
+    LedgerOutbox.enqueue(LedgerOutbox.SourceType.CONTRIBUTION, instance.pk)
 
 
 @receiver(post_save, sender='contributions.Remittance')
 def create_remittance_ledger_entries(sender, instance, created, **kwargs):
     """
-    Create ledger entries when a remittance is verified.
+    Queue ledger posting when a remittance is verified.
     Converts Mission RECEIVABLE to CASH.
     """
-    # Only process when status changes to verified
-    if instance.status != 'verified':
+    if ledger_signals_suspended():
         return
     
-    # Check if ledger entries already exist for this remittance
-    from core.ledger_models import LedgerEntry
-    existing = LedgerEntry.objects.filter(remittance=instance).exists()
-    if existing:
+    # Only process when status changes to verified
+    if instance.status != 'verified':
         return
     
     # Only create entries if there's an amount sent
     if instance.amount_sent <= 0:
         return
     
-    try:
-        from core.ledger_service import LedgerService
-        LedgerService.create_remittance_entries(instance, instance.amount_sent)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to create ledger entries for remittance {instance.id}: {e}")
+    from core.ledger_models import LedgerOutbox
+    LedgerOutbox.enqueue(LedgerOutbox.SourceType.REMITTANCE, instance.pk)
 
 
 @receiver(post_save, sender='expenditure.Expenditure')
 def create_expenditure_ledger_entries(sender, instance, created, **kwargs):
     """
-    Create ledger entries when an expenditure is approved/paid.
+    Queue ledger posting when an expenditure is approved/paid.
     Expenditures reduce CASH only.
     """
-    if not created:
+    if not created or ledger_signals_suspended():
         return
     
     # Only create ledger entries for approved or paid expenditures
     if instance.status not in ['approved', 'paid']:
         return
     
-    try:
-        from core.ledger_service import LedgerService
-        LedgerService.create_expenditure_entries(instance)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to create ledger entries for expenditure {instance.id}: {e}")
+    from core.ledger_models import LedgerOutbox
+    LedgerOutbox.enqueue(LedgerOutbox.SourceType.EXPENDITURE, instance.pk)
 
 
 @receiver(post_save, sender='contributions.TitheCommission')
 def create_commission_ledger_entries(sender, instance, created, **kwargs):
     """
-    Create ledger entries when a commission is paid.
+    Queue ledger posting when a commission is paid.
     """
-    # Only process when status changes to paid
-    if instance.status != 'paid':
+    if ledger_signals_suspended():
         return
     
-    # Check if ledger entries already exist
-    from core.ledger_models import LedgerEntry
-    existing = LedgerEntry.objects.filter(commission=instance).exists()
-    if existing:
+    # Only process when status changes to paid
+    if instance.status != 'paid':
         return
     
-    try:
-        from core.ledger_service import LedgerService
-        LedgerService.create_commission_entries(instance)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to create ledger entries for commission {instance.id}: {e}")
+    from core.ledger_models import LedgerOutbox
+    LedgerOutbox.enqueue(LedgerOutbox.SourceType.COMMISSION, instance.pk)
 
 
 @receiver(post_save, sender='contributions.MissionDonation')
 def create_mission_donation_ledger_entries(sender, instance, created, **kwargs):
     """
-    Create ledger entries when a mission donation is verified.
+    Queue ledger posting when a mission donation is verified.
     Mission donations go directly to Mission CASH (not through branch).
     """
-    # Only process verified donations
-    if instance.status != 'verified':
+    if ledger_signals_suspended():
         return
     
-    # Check if ledger entries already exist
-    from core.ledger_models import LedgerEntry
-    existing = LedgerEntry.objects.filter(
-        source_type=LedgerEntry.SourceType.CONTRIBUTION,
-        description__contains=f'Mission Donation #{instance.id}'
-    ).exists()
-    if existing:
+    # Only process verified donations
+    if instance.status != 'verified':
         return
     
-    try:
-        from core.ledger_service import LedgerService
-        # Create Mission CASH entry directly (no branch involvement)
-        LedgerService.create_entry(
-            entry_type=LedgerEntry.EntryType.CASH,
-            owner_type=LedgerEntry.OwnerType.MISSION,
-            source_type=LedgerEntry.SourceType.CONTRIBUTION,
-            amount=instance.amount,
-            entry_date=instance.date,
-            description=f'Mission Donation #{instance.id} - {instance.get_donation_type_display()}',
-        )
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Failed to create ledger entries for mission donation {instance.id}: {e}")
+    from core.ledger_models import LedgerOutbox
+    LedgerOutbox.enqueue(LedgerOutbox.SourceType.MISSION_DONATION, instance.pk)
@@ -0,0 +1,155 @@
+"""
+Ledger Tasks - Background posting of queued ledger work.
+Drains LedgerOutbox in batches from a django-q schedule (see core.schedules).
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Attempts before an outbox row is marked FAILED and left for manual retry
+MAX_ATTEMPTS = 8
+
+
+def process_ledger_outbox(batch_size=200):
+    """
+    Post ledger entries for pending outbox rows.
+
+    Contributions in the batch are posted together through
+    LedgerService.post_batch; other sources are posted one at a time.
+    Each row is marked DONE in the same transaction as its ledger entries,
+    so a row is never posted twice. Failures are retried with backoff.
+
+    Returns a dict with the number of rows done and failed.
+    """
+    from core.ledger_models import LedgerOutbox
+
+    result = {'done': 0, 'failed': 0, 'entries': 0}
+
+    with transaction.atomic():
+        rows = list(
+            LedgerOutbox.objects.select_for_update(skip_locked=True).filter(
+                status=LedgerOutbox.Status.PENDING,
+                available_at__lte=timezone.now()
+            ).order_by('created_at')[:batch_size]
+        )
+
+        contribution_rows = [r for r in rows if r.source_type == LedgerOutbox.SourceType.CONTRIBUTION]
+        other_rows = [r for r in rows if r.source_type != LedgerOutbox.SourceType.CONTRIBUTION]
+
+        if contribution_rows:
+            try:
+                with transaction.atomic():
+                    posted = _post_contributions(contribution_rows)
+                    _mark_done(contribution_rows, posted)
+                    result['done'] += len(contribution_rows)
+                    result['entries'] += sum(posted.values())
+            except Exception:
+                # Retry one by one so a single bad contribution does not block the batch
+                other_rows = contribution_rows + other_rows
+
+        for row in other_rows:
+            try:
+                with transaction.atomic():
+                    count = _post_row(row)
+                    _mark_done([row], {row.pk: count})
+                    result['done'] += 1
+                    result['entries'] += count
+            except Exception as e:
+                _mark_failed(row, e)
+                result['failed'] += 1
+
+    return result
+
+
+def _post_contributions(rows):
+    """Post a batch of contribution rows; returns {row pk: entries posted}."""
+    from django.db.models import Count
+    from contributions.models import Contribution
+    from core.ledger_models import LedgerEntry
+    from core.ledger_service import LedgerService
+
+    contributions = list(Contribution.objects.filter(pk__in=[r.source_id for r in rows]))
+    LedgerService.post_batch(contributions)
+
+    counts = dict(
+        LedgerEntry.objects.filter(contribution__in=contributions)
+        .values_list('contribution_id').annotate(n=Count('id')).order_by()
+    )
+    return {r.pk: counts.get(uuid.UUID(r.source_id), 0) for r in rows}
+
+
+def _post_row(row):
+    """Post a single outbox row; returns the number of ledger entries created."""
+    from core.ledger_models import LedgerEntry, LedgerOutbox
+    from core.ledger_service import LedgerService
+
+    if row.source_type == LedgerOutbox.SourceType.CONTRIBUTION:
+        from contributions.models import Contribution
+        contribution = Contribution.objects.filter(pk=row.source_id).first()
+        return LedgerService.post_batch([contribution]) if contribution else 0
+
+    if row.source_type == LedgerOutbox.SourceType.REMITTANCE:
+        from contributions.models import Remittance
+        remittance = Remittance.objects.filter(pk=row.source_id).first()
+        if (not remittance or remittance.status != 'verified' or remittance.amount_sent <= 0
+                or LedgerEntry.objects.filter(remittance=remittance).exists()):
+            return 0
+        return len(LedgerService.create_remittance_entries(remittance, remittance.amount_sent))
+
+    if row.source_type == LedgerOutbox.SourceType.EXPENDITURE:
+        from expenditure.models import Expenditure
+        expenditure = Expenditure.objects.filter(pk=row.source_id).first()
+        if (not expenditure or expenditure.status not in ['approved', 'paid']
+                or LedgerEntry.objects.filter(expenditure=expenditure).exists()):
+            return 0
+        return len(LedgerService.create_expenditure_entries(expenditure))
+
+    if row.source_type == LedgerOutbox.SourceType.COMMISSION:
+        from contributions.models import TitheCommission
+        commission = TitheCommission.objects.filter(pk=row.source_id).first()
+        if (not commission or commission.status != 'paid'
+                or LedgerEntry.objects.filter(commission=commission).exists()):
+            return 0
+        return len(LedgerService.create_commission_entries(commission))
+
+    if row.source_type == LedgerOutbox.SourceType.MISSION_DONATION:
+        from contributions.models import MissionDonation
+        donation = MissionDonation.objects.filter(pk=row.source_id).first()
+        if (not donation or donation.status != 'verified'
+                or LedgerEntry.objects.filter(
+                    source_type=LedgerEntry.SourceType.CONTRIBUTION,
+                    description__contains=f'Mission Donation #{donation.id}'
+                ).exists()):
+            return 0
+        return len(LedgerService.create_mission_donation_entries(donation))
+
+    raise ValueError(f"Unknown outbox source type: {row.source_type}")
+
+
+def _mark_done(rows, posted):
+    now = timezone.now()
+    for row in rows:
+        row.status = row.Status.DONE
+        row.attempts += 1
+        row.entries_posted = posted.get(row.pk, 0)
+        row.processed_at = now
+        row.last_error = ''
+    type(rows[0]).objects.bulk_update(
+        rows, ['status', 'attempts', 'entries_posted', 'processed_at', 'last_error']
+    )
+
+
+def _mark_failed(row, error):
+    row.attempts += 1
+    row.last_error = str(error)
+    row.status = row.Status.FAILED if row.attempts >= MAX_ATTEMPTS else row.Status.PENDING
+    # Exponential backoff: 1, 2, 4 ... minutes, capped at one hour
+    row.available_at = timezone.now() + timedelta(minutes=min(2 ** (row.attempts - 1), 60))
+    row.save(update_fields=['attempts', 'last_error', 'status', 'available_at'])
+    logger.error(f"Ledger outbox {row.idempotency_key} failed (attempt {row.attempts}): {error}")
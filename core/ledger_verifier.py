@@ -0,0 +1,218 @@
+"""
+Ledger Verifier - Incremental checks of the ledger's invariants.
+Runs from a django-q schedule (see core.schedules) and records problems as
+AuditFlag rows for the auditors.
+
+Checked on every run, for whatever changed since the last run's high-water mark:
+- Mission RECEIVABLE from a branch equals that branch's PAYABLE to Mission
+- Every verified Contribution has ledger entries
+- Every verified Remittance with an amount sent has ledger entries
+"""
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Sum, Q, Exists, OuterRef
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Changes newer than this are left for the next run, so postings still
+# waiting in the ledger outbox are not reported as missing
+SETTLE_MARGIN = timedelta(minutes=10)
+
+
+def verify_ledger(full=False):
+    """
+    Check the ledger invariants for everything changed since the last run.
+
+    Only branches with ledger entries changed in the window are re-balanced,
+    and only contributions/remittances changed in the window are checked, so
+    a run costs the same whatever the size of the ledger. With full=True the
+    whole history is checked.
+
+    Returns the LedgerVerificationRun recording the window and results.
+    """
+    from core.ledger_models import LedgerEntry, LedgerVerificationRun
+
+    started_at = timezone.now()
+    last_run = None if full else LedgerVerificationRun.objects.first()
+    since = last_run.checked_through if last_run else None
+    until = started_at - SETTLE_MARGIN
+
+    def changed():
+        window = Q(updated_at__lte=until)
+        if since:
+            window &= Q(updated_at__gt=since)
+        return window
+
+    # Branches whose receivable/payable position moved in the window
+    branch_ids = set()
+    for counterparty, owner in LedgerEntry.objects.filter(
+        changed(),
+        entry_type__in=[LedgerEntry.EntryType.RECEIVABLE, LedgerEntry.EntryType.PAYABLE],
+    ).values_list('counterparty_branch', 'owner_branch').distinct():
+        branch_ids.update(pk for pk in (counterparty, owner) if pk)
+
+    flags = []
+    flags += _check_receivables_match_payables(branch_ids)
+    contributions, contribution_flags = _check_contributions_posted(changed())
+    remittances, remittance_flags = _check_remittances_posted(changed())
+    flags += contribution_flags + remittance_flags
+
+    flags = _without_open_duplicates(flags)
+    if flags:
+        from auditing.models import AuditFlag
+        AuditFlag.objects.bulk_create(flags)
+        logger.warning(f"Ledger verifier raised {len(flags)} audit flag(s)")
+
+    # Recorded last, so a failed run is simply repeated from the same mark
+    run = LedgerVerificationRun.objects.create(
+        checked_from=since,
+        checked_through=until,
+        branches_checked=len(branch_ids),
+        contributions_checked=contributions,
+        remittances_checked=remittances,
+        flags_raised=len(flags),
+        started_at=started_at,
+        finished_at=timezone.now(),
+    )
+    return run
+
+
+def _check_receivables_match_payables(branch_ids):
+    """Compare Mission's receivable from each branch with the branch's payable to Mission."""
+    from django.contrib.contenttypes.models import ContentType
+    from auditing.models import AuditFlag
+    from core.models import Branch
+    from core.ledger_models import LedgerEntry
+    from core.ledger_service import LedgerService
+
+    if not branch_ids:
+        return []
+
+    receivables = {
+        row['counterparty_branch']: row['total'] or Decimal('0')
+        for row in LedgerService._group_ledger(
+            Q(owner_type=LedgerEntry.OwnerType.MISSION,
+              entry_type=LedgerEntry.EntryType.RECEIVABLE,
+              status=LedgerEntry.Status.ACTIVE,
+              counterparty_branch__in=branch_ids),
+            ['counterparty_branch'], total=Sum('amount')
+        )
+    }
+    payables = {
+        row['owner_branch']: row['total'] or Decimal('0')
+        for row in LedgerService._group_ledger(
+            Q(owner_type=LedgerEntry.OwnerType.BRANCH,
+              entry_type=LedgerEntry.EntryType.PAYABLE,
+              counterparty_type=LedgerEntry.OwnerType.MISSION,
+              status=LedgerEntry.Status.ACTIVE,
+              owner_branch__in=branch_ids),
+            ['owner_branch'], total=Sum('amount')
+        )
+    }
+
+    mismatched = [
+        pk for pk in branch_ids
+        if receivables.get(pk, Decimal('0')) != payables.get(pk, Decimal('0'))
+    ]
+    if not mismatched:
+        return []
+
+    branch_type = ContentType.objects.get_for_model(Branch)
+    names = dict(Branch.objects.filter(pk__in=mismatched).values_list('pk', 'name'))
+    return [
+        AuditFlag(
+            flag_type=AuditFlag.FlagType.LEDGER_IMBALANCE,
+            content_type=branch_type,
+            object_id=str(pk),
+            branch_id=pk,
+            severity='high',
+            description=(
+                f"Mission receivable from {names.get(pk, pk)} "
+                f"(GH₵{receivables.get(pk, Decimal('0')):,.2f}) does not match the branch's "
+                f"payable to Mission (GH₵{payables.get(pk, Decimal('0')):,.2f})."
+            ),
+        )
+        for pk in mismatched
+    ]
+
+
+def _check_contributions_posted(window):
+    """Find verified contributions changed in the window that have no ledger entries."""
+    from django.contrib.contenttypes.models import ContentType
+    from auditing.models import AuditFlag
+    from contributions.models import Contribution
+    from core.ledger_models import LedgerEntry, LedgerEntryArchive
+
+    contributions = Contribution.objects.filter(window, status=Contribution.Status.VERIFIED)
+    missing = contributions.annotate(
+        posted=Exists(LedgerEntry.objects.filter(contribution=OuterRef('pk'))),
+        archived=Exists(LedgerEntryArchive.objects.filter(contribution=OuterRef('pk'))),
+    ).filter(posted=False, archived=False).values_list('pk', 'branch_id', 'amount', 'date')
+
+    contribution_type = ContentType.objects.get_for_model(Contribution)
+    flags = [
+        AuditFlag(
+            flag_type=AuditFlag.FlagType.MISSING_LEDGER_ENTRIES,
+            content_type=contribution_type,
+            object_id=str(pk),
+            branch_id=branch_id,
+            severity='high',
+            description=f"Verified contribution of GH₵{amount:,.2f} on {on} has no ledger entries.",
+        )
+        for pk, branch_id, amount, on in missing
+    ]
+    return contributions.count(), flags
+
+
+def _check_remittances_posted(window):
+    """Find verified remittances changed in the window that have no ledger entries."""
+    from django.contrib.contenttypes.models import ContentType
+    from auditing.models import AuditFlag
+    from contributions.models import Remittance
+    from core.ledger_models import LedgerEntry, LedgerEntryArchive
+
+    remittances = Remittance.objects.filter(
+        window, status=Remittance.Status.VERIFIED, amount_sent__gt=0
+    )
+    missing = remittances.annotate(
+        posted=Exists(LedgerEntry.objects.filter(remittance=OuterRef('pk'))),
+        archived=Exists(LedgerEntryArchive.objects.filter(remittance=OuterRef('pk'))),
+    ).filter(posted=False, archived=False).values_list('pk', 'branch_id', 'amount_sent', 'month', 'year')
+
+    remittance_type = ContentType.objects.get_for_model(Remittance)
+    flags = [
+        AuditFlag(
+            flag_type=AuditFlag.FlagType.MISSING_LEDGER_ENTRIES,
+            content_type=remittance_type,
+            object_id=str(pk),
+            branch_id=branch_id,
+            severity='high',
+            description=f"Verified remittance of GH₵{amount:,.2f} for {month}/{year} has no ledger entries.",
+        )
+        for pk, branch_id, amount, month, year in missing
+    ]
+    return remittances.count(), flags
+
+
+def _without_open_duplicates(flags):
+    """Drop flags already raised for the same object and still open."""
+    from auditing.models import AuditFlag
+
+    if not flags:
+        return flags
+
+    open_flags = set(
+        AuditFlag.objects.filter(
+            status__in=[AuditFlag.Status.OPEN, AuditFlag.Status.UNDER_REVIEW],
+            flag_type__in={flag.flag_type for flag in flags},
+            object_id__in=[flag.object_id for flag in flags],
+        ).values_list('flag_type', 'content_type_id', 'object_id')
+    )
+    return [
+        flag for flag in flags
+        if (flag.flag_type, flag.content_type_id, flag.object_id) not in open_flags
+    ]
@@ -10,11 +10,12 @@ from calendar import monthrange, month_name
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum, Q
+from django.db.models import Q, prefetch_related_objects
 from django.http import JsonResponse
+from django.utils.dateparse import parse_date
 
 from core.models import Branch, Area, District
-from core.ledger_models import LedgerEntry
+from core.ledger_models import LedgerEntry, LedgerOutbox, LedgerArchivedYear
 from core.ledger_service import LedgerService
 
 
@@ -38,20 +39,20 @@ def ledger_dashboard(request):
     # Receivables by branch
     receivables_by_branch = LedgerService.get_receivables_by_branch()
     
-    # Branch summaries
+    # Branch summaries, from the same balance rows the spending check reads
     branches = Branch.objects.filter(is_active=True).select_related('district__area')
+    positions = LedgerService.get_branch_positions()
+    no_position = {'cash': Decimal('0'), 'payables': Decimal('0'), 'spendable': Decimal('0')}
     branch_summaries = []
     
     for branch in branches:
-        cash = LedgerService.get_branch_cash_balance(branch)
-        payables = LedgerService.get_branch_payables(branch)
-        spendable = cash - payables
+        position = positions.get(str(branch.pk), no_position)
         
         branch_summaries.append({
             'branch': branch,
-            'cash': cash,
-            'payables': payables,
-            'spendable': spendable,
+            'cash': position['cash'],
+            'payables': position['payables'],
+            'spendable': position['spendable'],
             'area': branch.district.area.name,
             'district': branch.district.name,
         })
@@ -105,30 +106,27 @@ def mission_financial_position(request):
     end_date = date(year, month, last_day)
     
     # Mission CASH entries
-    cash_entries = LedgerEntry.objects.filter(
+    cash_entries = LedgerService.get_entries(Q(
         owner_type=LedgerEntry.OwnerType.MISSION,
         entry_type=LedgerEntry.EntryType.CASH,
-        entry_date__gte=start_date,
-        entry_date__lte=end_date,
         status=LedgerEntry.Status.ACTIVE
-    ).order_by('-entry_date', '-created_at')
+    ), start_date=start_date, end_date=end_date)
     
     # Mission RECEIVABLE entries
-    receivable_entries = LedgerEntry.objects.filter(
+    receivable_entries = LedgerService.get_entries(Q(
         owner_type=LedgerEntry.OwnerType.MISSION,
         entry_type=LedgerEntry.EntryType.RECEIVABLE,
-        entry_date__gte=start_date,
-        entry_date__lte=end_date,
         status=LedgerEntry.Status.ACTIVE
-    ).order_by('-entry_date', '-created_at')
+    ), start_date=start_date, end_date=end_date)
     
     # Balances
     cash_balance = LedgerService.get_mission_cash_balance(as_of_date=end_date)
     receivables_balance = LedgerService.get_mission_receivables(as_of_date=end_date)
     
     # Monthly totals
-    cash_in = cash_entries.filter(amount__gt=0).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-    cash_out = cash_entries.filter(amount__lt=0).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+    summary = LedgerService.get_monthly_summary(LedgerEntry.OwnerType.MISSION, month, year)
+    cash_in = summary['cash_in']
+    cash_out = -summary['cash_out']
     
     # Year options for filter
     years = list(range(date.today().year - 5, date.today().year + 1))
@@ -184,23 +182,19 @@ def branch_financial_position(request, branch_id=None):
     end_date = date(year, month, last_day)
     
     # Branch ledger entries
-    cash_entries = LedgerEntry.objects.filter(
+    cash_entries = LedgerService.get_entries(Q(
         owner_type=LedgerEntry.OwnerType.BRANCH,
         owner_branch=branch,
         entry_type=LedgerEntry.EntryType.CASH,
-        entry_date__gte=start_date,
-        entry_date__lte=end_date,
         status=LedgerEntry.Status.ACTIVE
-    ).order_by('-entry_date', '-created_at')
+    ), start_date=start_date, end_date=end_date)
     
-    payable_entries = LedgerEntry.objects.filter(
+    payable_entries = LedgerService.get_entries(Q(
         owner_type=LedgerEntry.OwnerType.BRANCH,
         owner_branch=branch,
         entry_type=LedgerEntry.EntryType.PAYABLE,
-        entry_date__gte=start_date,
-        entry_date__lte=end_date,
         status=LedgerEntry.Status.ACTIVE
-    ).order_by('-entry_date', '-created_at')
+    ), start_date=start_date, end_date=end_date)
     
     # Balances
     cash_balance = LedgerService.get_branch_cash_balance(branch, as_of_date=end_date)
@@ -245,25 +239,9 @@ def outstanding_remittances(request):
         messages.error(request, 'Access denied.')
         return redirect('core:dashboard')
     
-    # Get all branches with payables > 0
-    branches = Branch.objects.filter(is_active=True).select_related('district__area')
-    
-    outstanding = []
-    total_outstanding = Decimal('0')
-    
-    for branch in branches:
-        payables = LedgerService.get_branch_payables(branch)
-        if payables > 0:
-            outstanding.append({
-                'branch': branch,
-                'area': branch.district.area.name,
-                'district': branch.district.name,
-                'amount_owed': payables,
-            })
-            total_outstanding += payables
-    
-    # Sort by amount owed (highest first)
-    outstanding.sort(key=lambda x: x['amount_owed'], reverse=True)
+    # Branch payables to Mission mirror the Mission's receivables by branch
+    outstanding = LedgerService.get_receivables_by_branch()
+    total_outstanding = sum((item['amount_owed'] for item in outstanding), Decimal('0'))
     
     context = {
         'outstanding': outstanding,
@@ -292,31 +270,33 @@ def ledger_audit_trail(request):
     start_date = request.GET.get('start_date', '')
     end_date = request.GET.get('end_date', '')
     
-    entries = LedgerEntry.objects.all().select_related(
-        'owner_branch', 'owner_area', 'owner_district',
-        'counterparty_branch', 'contribution', 'expenditure', 'remittance'
-    ).order_by('-entry_date', '-created_at')
-    
+    filters = Q()
     if owner_type:
-        entries = entries.filter(owner_type=owner_type)
+        filters &= Q(owner_type=owner_type)
     if entry_type:
-        entries = entries.filter(entry_type=entry_type)
+        filters &= Q(entry_type=entry_type)
     if source_type:
-        entries = entries.filter(source_type=source_type)
+        filters &= Q(source_type=source_type)
     if branch_id:
-        entries = entries.filter(
-            Q(owner_branch_id=branch_id) | Q(counterparty_branch_id=branch_id)
-        )
-    if start_date:
-        entries = entries.filter(entry_date__gte=start_date)
-    if end_date:
-        entries = entries.filter(entry_date__lte=end_date)
+        filters &= Q(owner_branch_id=branch_id) | Q(counterparty_branch_id=branch_id)
+    
+    # Reads archived years too when the date range reaches them
+    entries = LedgerService.get_entries(
+        filters,
+        start_date=parse_date(start_date) if start_date else None,
+        end_date=parse_date(end_date) if end_date else None,
+    )
     
     # Pagination
     from django.core.paginator import Paginator
     paginator = Paginator(entries, 50)
     page = request.GET.get('page', 1)
     entries = paginator.get_page(page)
+    entries.object_list = list(entries.object_list)
+    prefetch_related_objects(
+        entries.object_list, 'owner_branch', 'owner_area', 'owner_district',
+        'owner_member', 'counterparty_branch'
+    )
     
     branches = Branch.objects.filter(is_active=True).order_by('name')
     
@@ -332,11 +312,80 @@ def ledger_audit_trail(request):
         'selected_branch': branch_id,
         'selected_start_date': start_date,
         'selected_end_date': end_date,
+        'archived_through': LedgerArchivedYear.archived_through(),
     }
     
     return render(request, 'core/ledger_audit_trail.html', context)
 
 
+@login_required
+def ledger_outbox_status(request):
+    """
+    Ledger outbox dashboard: queue depth, posting lag and failed items.
+    Mission Admin and Auditor only; only Mission Admin can retry failures.
+    """
+    if not (request.user.is_mission_admin or request.user.is_auditor):
+        messages.error(request, 'Access denied.')
+        return redirect('core:dashboard')
+    
+    from django.utils import timezone
+    from django.db.models import Count, Min
+    
+    if request.method == 'POST' and request.user.is_mission_admin:
+        retried = LedgerOutbox.objects.filter(status=LedgerOutbox.Status.FAILED).update(
+            status=LedgerOutbox.Status.PENDING,
+            attempts=0,
+            available_at=timezone.now()
+        )
+        messages.success(request, f'{retried} failed item(s) queued for retry.')
+        return redirect('core:ledger_outbox_status')
+    
+    now = timezone.now()
+    counts = dict(
+        LedgerOutbox.objects.values_list('status').annotate(n=Count('id')).order_by()
+    )
+    oldest_pending = LedgerOutbox.objects.filter(
+        status=LedgerOutbox.Status.PENDING
+    ).aggregate(oldest=Min('created_at'))['oldest']
+    lag_seconds = int((now - oldest_pending).total_seconds()) if oldest_pending else 0
+    
+    source_labels = dict(LedgerOutbox.SourceType.choices)
+    pending_by_source = [
+        {'label': source_labels.get(item['source_type'], item['source_type']), 'count': item['n']}
+        for item in LedgerOutbox.objects.filter(
+            status=LedgerOutbox.Status.PENDING
+        ).values('source_type').annotate(n=Count('id')).order_by('-n')
+    ]
+    
+    processed_last_hour = LedgerOutbox.objects.filter(
+        status=LedgerOutbox.Status.DONE,
+        processed_at__gte=now - timedelta(hours=1)
+    ).count()
+    
+    failed_items = LedgerOutbox.objects.filter(
+        status=LedgerOutbox.Status.FAILED
+    ).order_by('-created_at')[:50]
+    retrying_items = LedgerOutbox.objects.filter(
+        status=LedgerOutbox.Status.PENDING,
+        attempts__gt=0
+    ).order_by('available_at')[:50]
+    
+    context = {
+        'pending_count': counts.get(LedgerOutbox.Status.PENDING, 0),
+        'failed_count': counts.get(LedgerOutbox.Status.FAILED, 0),
+        'done_count': counts.get(LedgerOutbox.Status.DONE, 0),
+        'oldest_pending': oldest_pending,
+        'lag_seconds': lag_seconds,
+        'lag_minutes': lag_seconds // 60,
+        'pending_by_source': pending_by_source,
+        'processed_last_hour': processed_last_hour,
+        'failed_items': failed_items,
+        'retrying_items': retrying_items,
+    }
+    
+    return render(request, 'core/ledger_outbox.html', context)
+
+
 @login_required
 def branch_contributions_readonly(request, branch_id):
     """
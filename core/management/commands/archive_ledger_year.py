@@ -0,0 +1,31 @@
+"""
+Management command to move a closed year of ledger entries to the archive.
+Every month of the year must be locked first. Archived entries remain
+readable through LedgerService.get_entries and the ledger audit trail.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from core.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = 'Move the ledger entries of a locked, closed year to the archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('year', type=int, help='Year to archive, e.g. 2024')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of entries copied per INSERT (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            moved = LedgerService.archive_year(options['year'], batch_size=options['batch_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {moved} ledger entries for {options['year']}."
+        ))
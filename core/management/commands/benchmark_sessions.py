@@ -0,0 +1,82 @@
+"""
+Management command to benchmark session writes per request.
+Replays the same logged-in requests under the old strategy (database sessions
+saved on every request) and the current one (cached_db sessions re-saved near
+expiry), and reports the django_session queries each one runs. Everything runs
+in a transaction that is rolled back, so it is safe against a live database.
+"""
+
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+SESSION_WRITE = re.compile(r'^(INSERT|UPDATE|DELETE)\b.*\bdjango_session\b', re.S)
+SESSION_READ = re.compile(r'^SELECT\b.*\bdjango_session\b', re.S)
+
+
+def strategies():
+    """(label, settings overrides) of the strategies compared."""
+    middleware = [m for m in settings.MIDDLEWARE if m != 'core.middleware.SessionRefreshMiddleware']
+    return [
+        ('db, save every request', {
+            'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+            'SESSION_SAVE_EVERY_REQUEST': True,
+            'MIDDLEWARE': middleware,
+        }),
+        ('current settings', {}),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compare session database reads and writes per request before and after the session refresh window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Requests replayed per strategy (default: 50)',
+        )
+        parser.add_argument(
+            '--url',
+            default=None,
+            help='Path requested (default: the notifications API polled by every page)',
+        )
+
+    def handle(self, *args, **options):
+        from accounts.models import User
+
+        count = max(options['requests'], 1)
+        url = options['url'] or reverse('core:notifications_api')
+
+        self.stdout.write(f'{count} requests to {url}')
+        with transaction.atomic():
+            user = User.objects.create_user(member_id='BENCH-SESSIONS', password='benchmark')
+            for label, overrides in strategies():
+                with override_settings(ALLOWED_HOSTS=['testserver'], SECURE_SSL_REDIRECT=False, **overrides):
+                    reads, writes = self.replay(user, url, count)
+                self.stdout.write(
+                    f'  {label:<24} {writes / count:6.2f} session writes/request'
+                    f'  {reads / count:6.2f} session reads/request'
+                )
+            transaction.set_rollback(True)
+
+    def replay(self, user, url, count):
+        """Session (reads, writes) over count requests after logging in."""
+        client = Client()
+        client.force_login(user)
+        client.get(url)  # Warm the cache and the first-request stamp
+
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(count):
+                client.get(url)
+
+        sql = [query['sql'] for query in captured.captured_queries]
+        reads = sum(1 for statement in sql if SESSION_READ.match(statement))
+        writes = sum(1 for statement in sql if SESSION_WRITE.match(statement))
+        return reads, writes
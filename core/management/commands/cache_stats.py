@@ -0,0 +1,36 @@
+"""
+Management command to show the cache hit rates.
+Prints the hits, misses and stampede waits of every core.cache namespace,
+summed over all processes that share the cache.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.cache import cache_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Show hit and miss counts of every cache namespace'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the counters after printing them',
+        )
+
+    def handle(self, *args, **options):
+        stats = cache_stats()
+        if not stats:
+            self.stdout.write('No cache lookups recorded yet.')
+        else:
+            self.stdout.write(f"{'namespace':<20} {'hits':>10} {'misses':>10} {'waits':>8} {'hit rate':>9}")
+            for namespace, row in stats.items():
+                self.stdout.write(
+                    f"{namespace:<20} {row['hits']:>10} {row['misses']:>10} {row['waits']:>8} "
+                    f"{row['hit_rate']:>8.1%}"
+                )
+
+        if options['reset']:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS('Cache counters cleared.'))
@@ -0,0 +1,30 @@
+"""
+Management command to drain the ledger outbox.
+The django-q worker does this every minute; this command is for manual runs
+(or cron, where no qcluster worker is available).
+"""
+
+from django.core.management.base import BaseCommand
+from core.ledger_tasks import process_ledger_outbox
+
+
+class Command(BaseCommand):
+    help = 'Post ledger entries for pending ledger outbox rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows to process per batch')
+        parser.add_argument('--all', action='store_true', help='Keep processing batches until the outbox is empty')
+
+    def handle(self, *args, **options):
+        done = failed = entries = 0
+        while True:
+            result = process_ledger_outbox(batch_size=options['batch_size'])
+            done += result['done']
+            failed += result['failed']
+            entries += result['entries']
+            if not options['all'] or result['done'] + result['failed'] == 0:
+                break
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {done} outbox rows ({entries} ledger entries). Failed: {failed}'
+        ))
@@ -0,0 +1,64 @@
+"""
+Management command to rebuild the monthly financial summaries.
+Recomputes BranchFinancialSummary and MissionFinancialSummary for a range of
+months from the raw contributions, expenditures, remittances, commissions and
+payroll runs. migrate backfills empty summary tables itself; run this after any
+bulk change made outside save().
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from core.financial_summaries import rebuild_summaries, rebuild_all_summaries
+
+
+def parse_month(value):
+    """Parse YYYY-MM into a (year, month) pair."""
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}', expected YYYY-MM")
+    if not 1 <= month <= 12:
+        raise CommandError(f"Invalid month '{value}', expected YYYY-MM")
+    return year, month
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly branch and mission financial summaries for a range of months'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from',
+            dest='start',
+            help='First month to rebuild, YYYY-MM (default: everything, or January of this year with --to)',
+        )
+        parser.add_argument(
+            '--to',
+            dest='end',
+            help='Last month to rebuild, YYYY-MM (default: current month)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Months recomputed in parallel (default: 4)',
+        )
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+
+        if not options['start'] and not options['end']:
+            written = rebuild_all_summaries(workers=workers)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} financial summary rows.'))
+            return
+
+        today = date.today()
+        start = parse_month(options['start']) if options['start'] else (today.year, 1)
+        end = parse_month(options['end']) if options['end'] else (today.year, today.month)
+        if start > end:
+            raise CommandError('--from must not be after --to')
+
+        written = rebuild_summaries(start, end, workers=workers)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {written} financial summary rows for {start[0]}-{start[1]:02d} to {end[0]}-{end[1]:02d}.'
+        ))
@@ -0,0 +1,36 @@
+"""
+Management command to rebuild materialized ledger balances.
+Recomputes LedgerBalance rows (and optionally checkpoints) from the raw ACTIVE ledger entries.
+Run after restoring data or after any bulk change made outside LedgerEntry.save().
+"""
+
+from django.core.management.base import BaseCommand
+from core.ledger_service import LedgerService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the LedgerBalance table from raw ledger entries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--balance-after',
+            action='store_true',
+            help='Also recompute LedgerEntry.balance_after for every entry in posting order',
+        )
+        parser.add_argument(
+            '--checkpoints',
+            action='store_true',
+            help='Also recreate month-end checkpoints for every locked month',
+        )
+
+    def handle(self, *args, **options):
+        rows = LedgerService.rebuild_balances()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} ledger balance rows.'))
+
+        if options['balance_after']:
+            updated = LedgerService.rebuild_balance_after()
+            self.stdout.write(self.style.SUCCESS(f'Updated balance_after on {updated} ledger entries.'))
+
+        if options['checkpoints']:
+            written = LedgerService.rebuild_checkpoints()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} month-end ledger checkpoints.'))
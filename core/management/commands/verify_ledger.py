@@ -0,0 +1,26 @@
+"""
+Management command to run the ledger invariant verifier.
+Normally runs every 15 minutes from the django-q schedule; use --full to
+re-check the whole history, e.g. after restoring a backup.
+"""
+
+from django.core.management.base import BaseCommand
+from core.ledger_verifier import verify_ledger
+
+
+class Command(BaseCommand):
+    help = 'Check ledger invariants for changes since the last run and raise audit flags'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Check the whole ledger instead of changes since the last run',
+        )
+
+    def handle(self, *args, **options):
+        run = verify_ledger(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {run.branches_checked} branches, {run.contributions_checked} contributions '
+            f'and {run.remittances_checked} remittances; raised {run.flags_raised} flag(s).'
+        ))
@@ -1,15 +1,18 @@
 import logging
 import json
-from django.utils import timezone
+import time
 from django.shortcuts import render
-from django.core.cache import cache
 from django.conf import settings
 from django.http import HttpResponse
 from django.core.exceptions import RequestDataTooBig
-from .models import SiteSettings
+from auditing.pipeline import audit_request
+from .last_seen import record_last_seen
+from .settings_cache import get_site_settings
 
 logger = logging.getLogger('core')
 
+SESSION_SAVED_AT_KEY = '_session_saved_at'
+
 class MaintenanceMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -22,7 +25,7 @@ class MaintenanceMiddleware:
 
         # Check maintenance mode
         try:
-            site_settings = SiteSettings.objects.first()
+            site_settings = get_site_settings()
             if site_settings and site_settings.maintenance_mode:
                 if not request.user.is_staff:
                     return render(request, 'core/maintenance.html', status=503)
@@ -31,18 +34,41 @@ class MaintenanceMiddleware:
 
         return self.get_response(request)
 
+class SessionRefreshMiddleware:
+    """
+    Slide the session expiry without writing the session on every request.
+
+    The time of the last save is kept in the session. A session is saved again
+    only once less than SESSION_REFRESH_WINDOW seconds remain before it expires,
+    so an active user stays logged in while most requests write nothing.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        session = getattr(request, 'session', None)
+        if session is None or session.session_key is None:
+            return response
+
+        now = int(time.time())
+        saved_at = session.get(SESSION_SAVED_AT_KEY)
+        refresh_after = settings.SESSION_COOKIE_AGE - getattr(settings, 'SESSION_REFRESH_WINDOW', 0)
+        # Stamp sessions that are being saved anyway, or whose expiry is near
+        if session.modified or saved_at is None or now - saved_at >= refresh_after:
+            session[SESSION_SAVED_AT_KEY] = now
+
+        return response
+
 class ActiveUserMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         if request.user.is_authenticated:
-            # Update last_login efficiently using cache to avoid DB writes on every request
-            cache_key = f'last_seen_{request.user.id}'
-            if not cache.get(cache_key):
-                request.user.last_login = timezone.now()
-                request.user.save(update_fields=['last_login'])
-                cache.set(cache_key, True, 300)  # Update every 5 minutes
+            # Buffered and written for all users at once (see core.last_seen)
+            record_last_seen(request.user.pk)
 
         return self.get_response(request)
 
@@ -59,7 +85,9 @@ class AuditLogMiddleware:
                 f"AUDIT: User {request.user.member_id} accessed {request.path} "
                 f"via {request.method} - Status: {response.status_code}"
             )
-            
+            # Queued; written in batches (see auditing.pipeline)
+            audit_request(request, response)
+
         return response
 
 class MultipartErrorHandler:
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:19
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_ledger_balances(apps, schema_editor):
+    """Seed LedgerBalance from the existing ACTIVE ledger entries."""
+    LedgerEntry = apps.get_model('core', 'LedgerEntry')
+    LedgerBalance = apps.get_model('core', 'LedgerBalance')
+
+    owner_fields = {
+        'branch': 'owner_branch',
+        'area': 'owner_area',
+        'district': 'owner_district',
+        'member': 'owner_member',
+    }
+
+    totals = LedgerEntry.objects.filter(status='active').values(
+        'owner_type', 'entry_type', 'owner_branch', 'owner_area',
+        'owner_district', 'owner_member'
+    ).annotate(total=Sum('amount')).order_by()
+
+    balances = {}
+    for item in totals:
+        field = owner_fields.get(item['owner_type'])
+        owner = item[field] if field else None
+        key = (item['owner_type'], str(owner) if owner else '', item['entry_type'])
+        balances[key] = balances.get(key, 0) + (item['total'] or 0)
+
+    LedgerBalance.objects.bulk_create([
+        LedgerBalance(owner_type=owner_type, owner_key=owner_key,
+                      entry_type=entry_type, balance=balance)
+        for (owner_type, owner_key, entry_type), balance in balances.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_ledger_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('owner_type', models.CharField(choices=[('mission', 'Mission (National)'), ('area', 'Area'), ('district', 'District'), ('branch', 'Branch'), ('member', 'Member')], max_length=20)),
+                ('owner_key', models.CharField(blank=True, max_length=36)),
+                ('entry_type', models.CharField(choices=[('cash', 'Cash (Physically Held)'), ('receivable', 'Receivable (Owed to Owner)'), ('payable', 'Payable (Owed by Owner)')], max_length=20)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Ledger Balance',
+                'verbose_name_plural': 'Ledger Balances',
+                'unique_together': {('owner_type', 'owner_key', 'entry_type')},
+            },
+        ),
+        migrations.RunPython(populate_ledger_balances, migrations.RunPython.noop),
+    ]
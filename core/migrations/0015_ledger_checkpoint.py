@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_ledger_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('owner_type', models.CharField(choices=[('mission', 'Mission (National)'), ('area', 'Area'), ('district', 'District'), ('branch', 'Branch'), ('member', 'Member')], max_length=20)),
+                ('owner_key', models.CharField(blank=True, max_length=36)),
+                ('entry_type', models.CharField(choices=[('cash', 'Cash (Physically Held)'), ('receivable', 'Receivable (Owed to Owner)'), ('payable', 'Payable (Owed by Owner)')], max_length=20)),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('period_end', models.DateField()),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Ledger Checkpoint',
+                'verbose_name_plural': 'Ledger Checkpoints',
+                'ordering': ['-period_end'],
+                'indexes': [models.Index(fields=['owner_type', 'owner_key', 'entry_type', 'period_end'], name='core_ledger_owner_t_8abdf2_idx')],
+                'unique_together': {('owner_type', 'owner_key', 'entry_type', 'year', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:24
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_ledger_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('contribution', 'Contribution'), ('remittance', 'Remittance'), ('expenditure', 'Expenditure'), ('commission', 'Commission'), ('mission_donation', 'Mission Donation')], max_length=20)),
+                ('source_id', models.CharField(max_length=36)),
+                ('idempotency_key', models.CharField(max_length=100, unique=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('entries_posted', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Ledger Outbox Item',
+                'verbose_name_plural': 'Ledger Outbox',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='core_ledger_status_9ab1ba_idx')],
+            },
+        ),
+    ]
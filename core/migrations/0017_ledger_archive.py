@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contributions', '0007_alter_contributiontype_scope_openingbalance_and_more'),
+        ('expenditure', '0005_expenditure_contribution_type'),
+        ('core', '0016_ledger_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerArchivedYear',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField(unique=True)),
+                ('period_end', models.DateField()),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('archived_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Ledger Year',
+                'verbose_name_plural': 'Archived Ledger Years',
+                'ordering': ['-year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerEntryArchive',
+            fields=[
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('entry_type', models.CharField(choices=[('cash', 'Cash (Physically Held)'), ('receivable', 'Receivable (Owed to Owner)'), ('payable', 'Payable (Owed by Owner)')], max_length=20)),
+                ('owner_type', models.CharField(choices=[('mission', 'Mission (National)'), ('area', 'Area'), ('district', 'District'), ('branch', 'Branch'), ('member', 'Member')], max_length=20)),
+                ('counterparty_type', models.CharField(blank=True, choices=[('mission', 'Mission (National)'), ('area', 'Area'), ('district', 'District'), ('branch', 'Branch'), ('member', 'Member')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('balance_after', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('source_type', models.CharField(choices=[('contribution', 'Contribution'), ('expenditure', 'Expenditure'), ('remittance', 'Remittance'), ('commission', 'Commission'), ('external_income', 'External Income'), ('adjustment', 'Manual Adjustment'), ('opening_balance', 'Opening Balance')], max_length=20)),
+                ('entry_date', models.DateField()),
+                ('description', models.TextField(blank=True)),
+                ('reference', models.CharField(blank=True, max_length=100)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('reversed', 'Reversed'), ('cleared', 'Cleared')], max_length=20)),
+                ('is_locked', models.BooleanField(default=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('commission', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contributions.tithecommission')),
+                ('contribution', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contributions.contribution')),
+                ('counterparty_area', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.area')),
+                ('counterparty_branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.branch')),
+                ('counterparty_district', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.district')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('expenditure', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='expenditure.expenditure')),
+                ('owner_area', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.area')),
+                ('owner_branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.branch')),
+                ('owner_district', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.district')),
+                ('owner_member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('remittance', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='contributions.remittance')),
+                ('reversed_by', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.ledgerentry')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Ledger Entry',
+                'verbose_name_plural': 'Archived Ledger Entries',
+                'ordering': ['-entry_date', '-created_at'],
+                'indexes': [models.Index(fields=['owner_type', 'entry_type', 'entry_date'], name='core_ledger_owner_t_82d8db_idx'), models.Index(fields=['owner_branch', 'entry_type'], name='core_ledger_owner_b_fc7a11_idx'), models.Index(fields=['entry_date', 'source_type'], name='core_ledger_entry_d_f175f9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_ledger_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerVerificationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_from', models.DateTimeField(blank=True, null=True)),
+                ('checked_through', models.DateTimeField()),
+                ('branches_checked', models.PositiveIntegerField(default=0)),
+                ('contributions_checked', models.PositiveIntegerField(default=0)),
+                ('remittances_checked', models.PositiveIntegerField(default=0)),
+                ('flags_raised', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Ledger Verification Run',
+                'verbose_name_plural': 'Ledger Verification Runs',
+                'ordering': ['-checked_through'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['updated_at'], name='core_ledger_updated_0a7753_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-17 02:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_ledger_verification_run'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='branchfinancialsummary',
+            name='fiscal_year',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='branch_summaries', to='core.fiscalyear'),
+        ),
+        migrations.AlterField(
+            model_name='missionfinancialsummary',
+            name='fiscal_year',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='mission_summaries', to='core.fiscalyear'),
+        ),
+    ]
@@ -15,6 +15,7 @@ from core.models import Branch, Area, District, FiscalYear, SiteSettings
 from contributions.models import Remittance, Contribution
 from expenditure.models import Expenditure, ExpenditureCategory
 from payroll.models import PayrollRun, PaySlip
+from core.financial_helpers import annotate_branch_financials, branch_subquery_sum, branch_subquery_count
 
 
 @login_required
@@ -525,25 +526,38 @@ def branch_financial_overview(request):
 
     total_branch_expenditures = branch_expenditures.aggregate(total=Sum('amount'))['total'] or Decimal('0')
 
-    # Branch-wise summary
+    # Branch-wise summary, one query for every branch via correlated subqueries
+    if month:
+        period_start = date(year, month, 1)
+        period_end = date(year, month, calendar.monthrange(year, month)[1])
+    else:
+        period_start, period_end = date(year, 1, 1), date(year, 12, 31)
+    
+    period_expenditures = Expenditure.objects.filter(
+        level='branch', date__gte=period_start, date__lte=period_end
+    )
+    summary_rows = annotate_branch_financials(
+        branches.select_related('district'), period_start, period_end
+    ).annotate(
+        local_expenditures=branch_subquery_sum(period_expenditures, 'amount'),
+        contribution_count=branch_subquery_count(
+            Contribution.objects.filter(date__gte=period_start, date__lte=period_end)
+        ),
+        expenditure_count=branch_subquery_count(period_expenditures),
+    )
+    
     branch_summary = []
-    for branch in branches:
-        # Branch contributions for this period
-        branch_contrib = branch_contributions.filter(branch=branch).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
-        # Branch expenditures for this period
-        branch_exp = branch_expenditures.filter(branch=branch).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
+    for branch in summary_rows:
         # Local balance calculation
-        local_balance = branch_contrib - branch_exp
+        local_balance = branch.total_contributions - branch.local_expenditures
 
         branch_summary.append({
             'branch': branch,
-            'total_contributions': branch_contrib,
-            'total_expenditures': branch_exp,
+            'total_contributions': branch.total_contributions,
+            'total_expenditures': branch.local_expenditures,
             'local_balance': local_balance,
-            'contribution_count': branch_contributions.filter(branch=branch).count(),
-            'expenditure_count': branch_expenditures.filter(branch=branch).count(),
+            'contribution_count': branch.contribution_count,
+            'expenditure_count': branch.expenditure_count,
         })
 
     # Overall totals
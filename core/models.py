@@ -3,9 +3,13 @@ Core Models - Church Hierarchy Structure
 SDSCC: Mission → Area → District → Branch → Members
 """
 
+import json
 import uuid
+from datetime import date, datetime
+from decimal import Decimal
 from django.db import models
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 
 class TimeStampedModel(models.Model):
@@ -690,7 +694,7 @@ class SpecialDateReminder(models.Model):
 class MissionFinancialSummary(TimeStampedModel):
     """Track monthly financial summary at mission level."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    fiscal_year = models.ForeignKey(FiscalYear, on_delete=models.PROTECT, related_name='mission_summaries')
+    fiscal_year = models.ForeignKey(FiscalYear, on_delete=models.PROTECT, related_name='mission_summaries', null=True, blank=True)
     month = models.IntegerField()  # 1-12
     year = models.IntegerField()
     
@@ -744,7 +748,7 @@ class MissionFinancialSummary(TimeStampedModel):
 class BranchFinancialSummary(TimeStampedModel):
     """Track monthly financial summary at branch level."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    fiscal_year = models.ForeignKey(FiscalYear, on_delete=models.PROTECT, related_name='branch_summaries')
+    fiscal_year = models.ForeignKey(FiscalYear, on_delete=models.PROTECT, related_name='branch_summaries', null=True, blank=True)
     branch = models.ForeignKey(Branch, on_delete=models.PROTECT, related_name='financial_summaries')
     month = models.IntegerField()  # 1-12
     year = models.IntegerField()
@@ -821,6 +825,54 @@ class BranchFinancialSummary(TimeStampedModel):
         self.save()
 
 
+class SnapshotJSONEncoder(DjangoJSONEncoder):
+    """Tag Decimals and dates so they come back as the same types, not strings."""
+    
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return {'__decimal__': str(o)}
+        if isinstance(o, datetime):
+            return {'__datetime__': o.isoformat()}
+        if isinstance(o, date):
+            return {'__date__': o.isoformat()}
+        return super().default(o)
+
+
+class SnapshotJSONDecoder(json.JSONDecoder):
+    """Decode the values tagged by SnapshotJSONEncoder."""
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('object_hook', self.decode_tagged)
+        super().__init__(*args, **kwargs)
+    
+    @staticmethod
+    def decode_tagged(obj):
+        if '__decimal__' in obj:
+            return Decimal(obj['__decimal__'])
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+        return obj
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed figures of one dashboard scope ('mission', 'area:<id>',
+    'district:<id>' or 'branch:<id>'), rebuilt by core.dashboard_snapshots.
+    """
+    scope = models.CharField(max_length=64, unique=True)
+    data = models.JSONField(default=dict, encoder=SnapshotJSONEncoder, decoder=SnapshotJSONDecoder)
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Dashboard Snapshot'
+        verbose_name_plural = 'Dashboard Snapshots'
+    
+    def __str__(self):
+        return f"{self.scope} as of {self.computed_at:%Y-%m-%d %H:%M}"
+
+
 # Import calendar models to register them with Django
 from .calendar_models import CalendarEvent, YearlyCalendar
 from .models_assets import ChurchAsset, ChurchAssetMaintenance, ChurchAssetTransfer
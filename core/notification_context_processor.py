@@ -1,121 +1,133 @@
 """
 Notification Context Processor - Add notification counts to all templates
+
+The counts are computed in one query and cached per user and day in the
+'notification-counts' cache namespace (see core.cache). A user's entry is
+dropped when their notifications or announcement reads change, and the whole
+namespace is invalidated when announcements, events, contributions, welfare
+payments or users change (see core.notification_signals), so rendering a page
+in steady state runs no count queries.
 """
 
-from django.db.models import Q
-from django.db.models.functions import Cast
-from django.db.models import TextField
-from django.utils import timezone
+from django.db.models import Q, F, Func, Value, Exists, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
 from datetime import date, timedelta
 
+from core.cache import CacheNamespace
 from core.models import Notification
-from announcements.models import Announcement, Event
+from announcements.models import Announcement, AnnouncementRead, Event
 
+NOTIFICATION_COUNTS_TIMEOUT = 5 * 60
+
+NOTIFICATION_COUNTS = CacheNamespace('notification-counts', timeout=NOTIFICATION_COUNTS_TIMEOUT)
 
-def notification_counts(request):
-    """Add notification counts to template context."""
-    if not request.user.is_authenticated:
-        return {}
-    
-    user = request.user
-    today = date.today()
-    
-    # Unread notifications
-    unread_notifications = Notification.objects.filter(
-        recipient=user,
-        is_read=False
-    ).count()
-    
-    # Unread announcements (published in last 7 days, not yet viewed)
-    seven_days_ago = today - timedelta(days=7)
-    
-    # Get announcements user can see based on scope
-    announcements_query = Q(is_published=True, publish_date__gte=seven_days_ago)
-    
-    if user.branch:
-        # User can see mission-wide and their branch announcements
-        announcements_query &= (
-            Q(scope='mission') |
-            (Q(scope='branch') & Q(branch=user.branch))
-        )
-        
-        # Add district and area announcements if applicable
-        if user.branch.district:
-            announcements_query |= (Q(scope='district') & Q(district=user.branch.district))
-            
-            if user.branch.district.area:
-                announcements_query |= (Q(scope='area') & Q(area=user.branch.district.area))
-    else:
-        # Mission-level users see all
-        announcements_query &= Q(scope='mission')
-    
-    # Count announcements that don't have read notifications
-    # Use subquery to check for read notifications
-    from django.db.models import Exists, OuterRef
-
-    unread_announcements = Announcement.objects.filter(announcements_query).exclude(
-        # Exclude announcements that have been marked as read by this user
-        Exists(
-            Notification.objects.filter(
-                recipient=user,
-                notification_type='announcement',
-                is_read=True,
-                link=Cast(OuterRef('pk'), TextField())
-            )
-        )
-    ).count()
-
-    # Upcoming events (next 30 days)
-    thirty_days_ahead = today + timedelta(days=30)
-
-    events_query = Q(is_published=True, start_date__gte=today, start_date__lte=thirty_days_ahead)
-
-    if user.branch:
-        events_query &= (
-            Q(scope='mission') |
-            (Q(scope='branch') & Q(branch=user.branch))
-        )
-
-        if user.branch.district:
-            events_query |= (Q(scope='district') & Q(district=user.branch.district))
-
-            if user.branch.district.area:
-                events_query |= (Q(scope='area') & Q(area=user.branch.district.area))
-    else:
-        events_query &= Q(scope='mission')
 
-    upcoming_events = Event.objects.filter(events_query).count()
+def _counts_name(user_id, today):
+    return f'user:{user_id}:{today.isoformat()}'
+
+
+def invalidate_notification_counts(user_id=None):
+    """Drop one user's cached counts, or every user's when user_id is None."""
+    if user_id is not None:
+        NOTIFICATION_COUNTS.delete(_counts_name(user_id, date.today()))
+    else:
+        NOTIFICATION_COUNTS.invalidate()
+
+
+def _count(queryset):
+    """Scalar subquery counting the rows of queryset."""
+    counted = queryset.order_by().annotate(
+        row_count=Func(F('pk'), function='COUNT', output_field=IntegerField())
+    ).values('row_count')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def _scope_filter(user):
+    """Mission-wide items, plus those of the user's branch, district and area."""
+    if not user.branch_id:
+        # Mission-level users see mission-wide items
+        return Q(scope='mission')
+
+    from core.rollups import get_hierarchy
+
+    scope = Q(scope='mission') | Q(scope='branch', branch_id=user.branch_id)
+    parents = get_hierarchy().parents(user.branch_id)
+    if parents is None:
+        parents = get_hierarchy(refresh=True).parents(user.branch_id)
+    if parents:
+        district_id, area_id = parents
+        scope |= Q(scope='district', district_id=district_id) | Q(scope='area', area_id=area_id)
+    return scope
+
+
+def compute_notification_counts(user, today):
+    """Every counter for the user, in a single query."""
+    from accounts.models import User
+
+    scope = _scope_filter(user)
+    counts = {
+        # Unread notifications
+        'unread_notifications': _count(Notification.objects.filter(recipient=user, is_read=False)),
+
+        # Announcements published in the last 7 days that the user has not opened
+        'unread_announcements': _count(Announcement.objects.filter(
+            scope,
+            is_published=True,
+            publish_date__gte=today - timedelta(days=7),
+        ).exclude(
+            Exists(AnnouncementRead.objects.filter(user=user, announcement=OuterRef('pk')))
+        )),
+
+        # Upcoming events (next 30 days)
+        'upcoming_events': _count(Event.objects.filter(
+            scope,
+            is_published=True,
+            start_date__gte=today,
+            start_date__lte=today + timedelta(days=30),
+        )),
+    }
 
     # Pending approvals (for admins)
-    pending_approvals = 0
     if user.is_any_admin:
         from contributions.models import Contribution
         from expenditure.models import WelfarePayment
 
-        pending_contributions = Contribution.objects.filter(status='pending').count()
-        pending_welfare = WelfarePayment.objects.filter(
-            branch=user.branch if user.branch else None
-        ).exclude(approved_by__isnull=False).count() if user.branch else 0
-
-        pending_approvals = pending_contributions + pending_welfare
+        counts['pending_contributions'] = _count(Contribution.objects.filter(status='pending'))
+        if user.branch_id:
+            counts['pending_welfare'] = _count(WelfarePayment.objects.filter(
+                branch_id=user.branch_id, approved_by__isnull=True
+            ))
 
     # Birthdays this month (for branch admins and pastors)
-    birthdays_this_month = 0
-    if user.is_branch_executive or user.is_pastor:
-        from accounts.models import User as UserModel
-
-        if user.branch:
-            birthdays_this_month = UserModel.objects.filter(
-                branch=user.branch,
-                is_active=True,
-                date_of_birth__month=today.month
-            ).count()
-
+    if (user.is_branch_executive or user.is_pastor) and user.branch_id:
+        counts['birthdays_this_month'] = _count(User.objects.filter(
+            branch_id=user.branch_id,
+            is_active=True,
+            date_of_birth__month=today.month
+        ))
+
+    row = User.objects.filter(pk=user.pk).annotate(**counts).values(*counts).first() or {}
+
+    unread_notifications = row.get('unread_notifications', 0)
+    unread_announcements = row.get('unread_announcements', 0)
+    pending_approvals = row.get('pending_contributions', 0) + row.get('pending_welfare', 0)
     return {
         'unread_notifications': unread_notifications,
         'unread_announcements': unread_announcements,
-        'upcoming_events': upcoming_events,
+        'upcoming_events': row.get('upcoming_events', 0),
         'pending_approvals': pending_approvals,
-        'birthdays_this_month': birthdays_this_month,
+        'birthdays_this_month': row.get('birthdays_this_month', 0),
         'total_notifications': unread_notifications + unread_announcements + pending_approvals,
     }
+
+
+def notification_counts(request):
+    """Add notification counts to template context."""
+    if not request.user.is_authenticated:
+        return {}
+
+    user = request.user
+    today = date.today()
+    return NOTIFICATION_COUNTS.get_or_compute(
+        _counts_name(user.pk, today), lambda: compute_notification_counts(user, today)
+    )
@@ -0,0 +1,49 @@
+"""
+Notification Signals - Invalidate the cached notification counts.
+
+A user's counts are dropped when their notifications or announcement reads
+change; changes to announcements, events, contributions, welfare payments
+and users make every user's counts stale. Both happen once the transaction
+commits. See core.notification_context_processor.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from core.notification_context_processor import invalidate_notification_counts
+
+# Model -> field holding the user whose counts it changes
+USER_SOURCES = {
+    'core.Notification': 'recipient_id',
+    'announcements.AnnouncementRead': 'user_id',
+}
+# Models whose changes reach the counts of many users
+SHARED_SOURCES = [
+    'announcements.Announcement',
+    'announcements.Event',
+    'contributions.Contribution',
+    'expenditure.WelfarePayment',
+    'accounts.User',
+]
+# Saves touching only these fields (logins, announcement views) change no count
+UNCOUNTED_FIELDS = {'last_login', 'view_count'}
+
+
+def invalidate_user_counts(sender, instance, **kwargs):
+    user_id = getattr(instance, USER_SOURCES[sender._meta.label])
+    transaction.on_commit(lambda: invalidate_notification_counts(user_id))
+
+
+def invalidate_all_counts(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= UNCOUNTED_FIELDS:
+        return
+    transaction.on_commit(invalidate_notification_counts)
+
+
+for source in USER_SOURCES:
+    post_save.connect(invalidate_user_counts, sender=source, dispatch_uid=f'notification_counts_save:{source}')
+    post_delete.connect(invalidate_user_counts, sender=source, dispatch_uid=f'notification_counts_delete:{source}')
+
+for source in SHARED_SOURCES:
+    post_save.connect(invalidate_all_counts, sender=source, dispatch_uid=f'notification_counts_save:{source}')
+    post_delete.connect(invalidate_all_counts, sender=source, dispatch_uid=f'notification_counts_delete:{source}')
@@ -0,0 +1,198 @@
+"""
+Hierarchy Rollups - Branch figures rolled up to districts, areas and Mission.
+
+Reports fetch their figures once, grouped by branch, and roll them up in
+memory instead of running one aggregate per district or area:
+
+    rows = group_by_branch(Contribution.objects.filter(date__year=2026),
+                           total_contributions=Sum('amount'))
+    totals = rollup(rows)
+    totals.districts[district_id]['total_contributions']
+    totals.mission['total_contributions']
+
+The branch -> district -> area map comes from the cache and is dropped by
+core.signals whenever an Area, District or Branch is saved or deleted.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from core.cache import CacheNamespace
+
+HIERARCHY_CACHE_TIMEOUT = 60 * 60
+
+HIERARCHY_CACHE = CacheNamespace('hierarchy', timeout=HIERARCHY_CACHE_TIMEOUT)
+
+ZERO = Decimal('0.00')
+
+
+class Hierarchy:
+    """
+    Branch -> district -> area map for the whole Mission.
+
+    Each level is a dict of id -> {'name', 'code', 'is_active', parent id},
+    kept as plain values so the map can live in the cache.
+    """
+
+    def __init__(self, areas, districts, branches):
+        self.areas = areas
+        self.districts = districts
+        self.branches = branches
+
+    @classmethod
+    def load(cls):
+        """Read the hierarchy from the database: one query per level."""
+        from core.models import Area, District, Branch
+
+        fields = ['id', 'name', 'code', 'is_active']
+        return cls(
+            areas={row.pop('id'): row for row in Area.objects.values(*fields)},
+            districts={row.pop('id'): row for row in District.objects.values(*fields, 'area_id')},
+            branches={row.pop('id'): row for row in Branch.objects.values(*fields, 'district_id')},
+        )
+
+    def parents(self, branch_id):
+        """(district_id, area_id) of a branch, or None if the branch is unknown."""
+        branch = self.branches.get(branch_id)
+        if branch is None:
+            return None
+        district_id = branch['district_id']
+        return district_id, self.districts[district_id]['area_id']
+
+
+def get_hierarchy(refresh=False):
+    """The cached Hierarchy, loaded on first use or when refresh is True."""
+    if not refresh:
+        return HIERARCHY_CACHE.get_or_compute('all', Hierarchy.load)
+    hierarchy = Hierarchy.load()
+    HIERARCHY_CACHE.set('all', hierarchy)
+    return hierarchy
+
+
+def invalidate_hierarchy(**kwargs):
+    """Drop the cached hierarchy. Connected to Area/District/Branch save and delete."""
+    HIERARCHY_CACHE.invalidate()
+
+
+class Rollup:
+    """Totals per branch, district and area, plus the Mission-wide total."""
+
+    def __init__(self, fields, zero=ZERO):
+        self.fields = list(fields)
+        self.zero = zero
+        self.derived = {}
+        self.branches = {}
+        self.districts = {}
+        self.areas = {}
+        self.mission = self.empty()
+
+    def empty(self):
+        row = {field: self.zero for field in self.fields}
+        for field, compute in self.derived.items():
+            row[field] = compute(row)
+        return row
+
+    def derive(self, field, compute):
+        """Add a field computed from the others, e.g. a net balance, to every row."""
+        self.derived[field] = compute
+        for totals in (self.branches, self.districts, self.areas, {None: self.mission}):
+            for row in totals.values():
+                row[field] = compute(row)
+        return self
+
+    def level(self, name):
+        """The totals dict for 'branch', 'district' or 'area'."""
+        return {'branch': self.branches, 'district': self.districts, 'area': self.areas}[name]
+
+    def get(self, level, entity_id):
+        """Totals of one entity, zero for every field when it had no rows."""
+        return self.level(level).get(entity_id) or self.empty()
+
+    def _add(self, row, values):
+        for field in self.fields:
+            row[field] += values.get(field) or self.zero
+
+    def _row(self, totals, entity_id):
+        row = totals.get(entity_id)
+        if row is None:
+            row = totals[entity_id] = self.empty()
+        return row
+
+
+def group_by_branch(queryset, branch_field='branch', **aggregates):
+    """
+    Run one grouped query and return {branch_id: {name: value}}.
+
+    Rows without a branch (Mission-level records) are left out.
+    """
+    rows = queryset.order_by().values(branch_field).annotate(**aggregates)
+    return {
+        row.pop(branch_field): row
+        for row in rows
+        if row[branch_field] is not None
+    }
+
+
+def merge_rows(*grouped):
+    """Merge several group_by_branch() results into one {branch_id: {field: value}}."""
+    merged = {}
+    for rows in grouped:
+        for branch_id, values in rows.items():
+            merged.setdefault(branch_id, {}).update(values)
+    return merged
+
+
+def rollup(branch_rows, fields=None, hierarchy=None, zero=ZERO):
+    """
+    Roll {branch_id: {field: value}} up the hierarchy in a single pass.
+
+    Fields default to every field seen in the rows. Branches missing from the
+    cached hierarchy (created in another process) trigger one reload.
+    """
+    if fields is None:
+        fields = []
+        for values in branch_rows.values():
+            fields.extend(field for field in values if field not in fields)
+
+    if hierarchy is None:
+        hierarchy = get_hierarchy()
+        if any(branch_id not in hierarchy.branches for branch_id in branch_rows):
+            hierarchy = get_hierarchy(refresh=True)
+
+    result = Rollup(fields, zero=zero)
+    for branch_id, values in branch_rows.items():
+        parents = hierarchy.parents(branch_id)
+        if parents is None:
+            continue
+        district_id, area_id = parents
+        result._add(result._row(result.branches, branch_id), values)
+        result._add(result._row(result.districts, district_id), values)
+        result._add(result._row(result.areas, area_id), values)
+        result._add(result.mission, values)
+    return result
+
+
+def period_financials(year, months=None):
+    """
+    Contributions and expenditures of a year (optionally some months), all statuses.
+
+    Two grouped queries, rolled up to every level. Fields are
+    total_contributions, total_expenditure and net_balance.
+    """
+    from contributions.models import Contribution
+    from expenditure.models import Expenditure
+
+    contributions = Contribution.objects.filter(date__year=year)
+    expenditures = Expenditure.objects.filter(date__year=year)
+    if months:
+        contributions = contributions.filter(date__month__in=months)
+        expenditures = expenditures.filter(date__month__in=months)
+
+    return rollup(
+        merge_rows(
+            group_by_branch(contributions, total_contributions=Sum('amount')),
+            group_by_branch(expenditures, total_expenditure=Sum('amount')),
+        ),
+        fields=['total_contributions', 'total_expenditure'],
+    ).derive('net_balance', lambda row: row['total_contributions'] - row['total_expenditure'])
@@ -0,0 +1,40 @@
+"""
+Background Schedules - django-q periodic tasks for SDSCC.
+Registered (idempotently, by name) after every `migrate`, so deploys that run
+migrations as their release command keep the schedules up to date.
+Run the worker with: python manage.py qcluster
+"""
+
+from django.conf import settings
+
+# name -> schedule definition
+SCHEDULES = {
+    'Process ledger outbox': {
+        'func': 'core.ledger_tasks.process_ledger_outbox',
+        'schedule_type': 'I',  # Schedule.MINUTES
+        'minutes': 1,
+    },
+    'Verify ledger invariants': {
+        'func': 'core.ledger_verifier.verify_ledger',
+        'schedule_type': 'I',
+        'minutes': 15,
+    },
+    'Write last seen times': {
+        'func': 'core.last_seen.flush_last_seen',
+        'schedule_type': 'I',
+        'minutes': max(1, getattr(settings, 'LAST_SEEN_FLUSH_SECONDS', 60) // 60),
+    },
+    'Refresh dashboard snapshots': {
+        'func': 'core.dashboard_snapshots.refresh_dashboard_snapshots',
+        'schedule_type': 'I',
+        'minutes': getattr(settings, 'DASHBOARD_SNAPSHOT_MINUTES', 10),
+    },
+}
+
+
+def ensure_schedules(**kwargs):
+    """Create or update the django-q Schedule rows in SCHEDULES."""
+    from django_q.models import Schedule
+    
+    for name, definition in SCHEDULES.items():
+        Schedule.objects.update_or_create(name=name, defaults=definition)
@@ -0,0 +1,78 @@
+"""
+Settings Cache - Process-local SiteSettings shared by every request.
+
+The maintenance middleware, the site_settings context processor, the PWA
+manifest and the currency filter all read the singleton through
+get_site_settings(). Each process keeps one loaded copy, and the version of
+the 'site-settings' cache namespace (see core.cache) tells it when another
+process has saved the settings:
+
+    site_settings = get_site_settings()
+    site_settings.maintenance_mode, site_settings.currency_symbol
+
+The stamp is checked once per request (and on every call outside a request),
+so rendering a page in steady state runs no settings queries. Saving or
+deleting SiteSettings calls invalidate_site_settings() (see core.signals).
+
+The copy is shared: read it, never modify it. Views that edit the settings
+keep using SiteSettings.get_settings().
+"""
+
+import threading
+
+from django.core.signals import request_started, request_finished
+from django.db import transaction
+
+from core.cache import CacheNamespace
+
+SITE_SETTINGS = CacheNamespace('site-settings')
+
+# (version, SiteSettings) loaded by this process
+_loaded = None
+
+# Per thread: whether a request is running, and whether it checked the version
+_request = threading.local()
+
+
+def get_site_settings():
+    """The SiteSettings singleton, loaded once per process and version."""
+    global _loaded
+    from core.models import SiteSettings
+
+    loaded = _loaded
+    if loaded is not None and getattr(_request, 'checked', False):
+        return loaded[1]
+
+    version = SITE_SETTINGS.version()
+    if loaded is None or loaded[0] != version:
+        loaded = _loaded = (version, SiteSettings.get_settings())
+    _request.checked = getattr(_request, 'active', False)
+    return loaded[1]
+
+
+def invalidate_site_settings(**kwargs):
+    """
+    Make every process reload the settings once the current transaction
+    commits. Connected to SiteSettings save and delete.
+    """
+    def bump():
+        global _loaded
+        _loaded = None
+        _request.checked = False
+        SITE_SETTINGS.invalidate()
+
+    transaction.on_commit(bump)
+
+
+def _start_request(**kwargs):
+    _request.active = True
+    _request.checked = False
+
+
+def _end_request(**kwargs):
+    _request.active = False
+    _request.checked = False
+
+
+request_started.connect(_start_request, dispatch_uid='site_settings_start_request')
+request_finished.connect(_end_request, dispatch_uid='site_settings_end_request')
@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Notification, Branch
+from .models import Notification, Area, District, Branch, SiteSettings
+from .rollups import invalidate_hierarchy
+from .settings_cache import invalidate_site_settings
+from accounts.authentication import invalidate_cached_user
 from accounts.models import UserProfile
 import logging
 
@@ -30,3 +33,27 @@ def prevent_branch_deletion_with_members(sender, instance, **kwargs):
     """Prevent deleting a branch if it has active members."""
     if instance.users.filter(is_active=True).exists():
         raise ValueError(f"Cannot delete branch '{instance.name}' because it has active members.")
+
+for hierarchy_model in (Area, District, Branch):
+    post_save.connect(invalidate_hierarchy, sender=hierarchy_model, dispatch_uid=f'hierarchy_save:{hierarchy_model.__name__}')
+    post_delete.connect(invalidate_hierarchy, sender=hierarchy_model, dispatch_uid=f'hierarchy_delete:{hierarchy_model.__name__}')
+
+post_save.connect(invalidate_site_settings, sender=SiteSettings, dispatch_uid='site_settings_save')
+post_delete.connect(invalidate_site_settings, sender=SiteSettings, dispatch_uid='site_settings_delete')
+
+
+def drop_cached_user(sender, instance, **kwargs):
+    """A saved or deleted user is loaded afresh by the auth backend."""
+    invalidate_cached_user(instance.pk)
+
+
+def drop_cached_users(sender, **kwargs):
+    """Cached users carry their branch, district and area."""
+    invalidate_cached_user()
+
+
+post_save.connect(drop_cached_user, sender=User, dispatch_uid='cached_user_save')
+post_delete.connect(drop_cached_user, sender=User, dispatch_uid='cached_user_delete')
+for hierarchy_model in (Area, District, Branch):
+    post_save.connect(drop_cached_users, sender=hierarchy_model, dispatch_uid=f'cached_users_save:{hierarchy_model.__name__}')
+    post_delete.connect(drop_cached_users, sender=hierarchy_model, dispatch_uid=f'cached_users_delete:{hierarchy_model.__name__}')
@@ -0,0 +1,56 @@
+"""
+Summary Signals - Keep the monthly financial summaries in step with their sources.
+
+pre_save/pre_delete record the facts of the stored row, post_save/post_delete
+apply the difference in the same transaction as the change itself.
+See core.financial_summaries for the fact rules.
+"""
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+
+from core.financial_summaries import facts_for, diff_facts, apply_deltas
+
+SUMMARY_SOURCES = [
+    'contributions.Contribution',
+    'contributions.Remittance',
+    'contributions.TitheCommission',
+    'expenditure.Expenditure',
+    'payroll.PayrollRun',
+]
+
+
+def remember_stored_facts(sender, instance, raw=False, **kwargs):
+    """Record the facts of the row as currently stored, before it changes."""
+    if raw:
+        return
+    stored = None
+    if not instance._state.adding and instance.pk:
+        stored = sender.objects.filter(pk=instance.pk).first()
+    instance._summary_facts = facts_for(stored) if stored else []
+
+
+def apply_saved_facts(sender, instance, raw=False, **kwargs):
+    """Apply the change in facts made by a save."""
+    if raw:
+        return
+    before = getattr(instance, '_summary_facts', [])
+    after = facts_for(instance)
+    instance._summary_facts = after
+    apply_deltas(diff_facts(before, after))
+
+
+def apply_deleted_facts(sender, instance, **kwargs):
+    """Remove a deleted row's facts."""
+    before = getattr(instance, '_summary_facts', [])
+    apply_deltas(diff_facts(before, []))
+
+
+def remember_facts_before_delete(sender, instance, **kwargs):
+    instance._summary_facts = facts_for(instance)
+
+
+for source in SUMMARY_SOURCES:
+    pre_save.connect(remember_stored_facts, sender=source, dispatch_uid=f'summary_pre_save:{source}')
+    post_save.connect(apply_saved_facts, sender=source, dispatch_uid=f'summary_post_save:{source}')
+    pre_delete.connect(remember_facts_before_delete, sender=source, dispatch_uid=f'summary_pre_delete:{source}')
+    post_delete.connect(apply_deleted_facts, sender=source, dispatch_uid=f'summary_post_delete:{source}')
@@ -100,8 +100,8 @@ def currency(value, decimals=2):
     Usage: {{ amount|currency }} or {{ amount|currency:0 }}
     """
     try:
-        from core.models import SiteSettings
-        settings = SiteSettings.get_settings()
+        from core.settings_cache import get_site_settings
+        settings = get_site_settings()
         symbol = settings.currency_symbol if settings else 'GH₵ '
     except Exception:
         symbol = 'GH₵ '
@@ -125,8 +125,8 @@ def currency(value, decimals=2):
 def currency_symbol():
     """Return the currency symbol from site settings."""
     try:
-        from core.models import SiteSettings
-        settings = SiteSettings.get_settings()
+        from core.settings_cache import get_site_settings
+        settings = get_site_settings()
         return settings.currency_symbol if settings else 'GH₵ '
     except Exception:
         return 'GH₵ '
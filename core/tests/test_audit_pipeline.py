@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from auditing import pipeline
+from auditing.models import AuditLog
+from auditing.pipeline import (
+    audit_pipeline_stats, enqueue_audit, flush_audit_queue, start_audit_writer, stop_audit_writer,
+    write_remaining_audit_entries,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_queue():
+    pipeline._queue.clear()
+    pipeline._wake.clear()
+    pipeline._stats.update(queued=0, dropped=0, batches=0, failed=0, high_water=0)
+    yield
+    pipeline._queue.clear()
+
+
+def logout_entry(user):
+    return AuditLog(
+        user=user, content_type_id=pipeline.ContentType.objects.get_for_model(user).pk,
+        object_id=str(user.pk), action=AuditLog.Action.LOGOUT,
+    )
+
+
+@pytest.mark.django_db
+class TestAuditPipeline:
+    def test_mutating_requests_are_queued_not_written(self, client, member):
+        client.force_login(member)
+
+        with CaptureQueriesContext(connection) as captured:
+            client.post(reverse('core:notifications'), {'action': 'mark_all_read'})
+
+        # Neither the audit table nor the task broker is touched in the request
+        assert not [q for q in captured.captured_queries if 'auditing_auditlog' in q['sql']]
+        assert not [q for q in captured.captured_queries if 'django_q' in q['sql']]
+        assert audit_pipeline_stats()['depth'] == 1
+
+        assert flush_audit_queue() == 1
+        log = AuditLog.objects.get()
+        assert log.action == AuditLog.Action.REQUEST
+        assert log.user == member
+        assert log.changes == {'method': 'POST', 'path': '/notifications/', 'status': 302}
+
+    def test_log_helper_queues_without_queries(self, member, django_assert_num_queries, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            AuditLog.log(member, AuditLog.Action.UPDATE, member)  # Warm the content type cache
+
+        with django_assert_num_queries(0), django_capture_on_commit_callbacks(execute=True):
+            AuditLog.log(member, AuditLog.Action.UPDATE, member, changes={'role': 'member'})
+
+        assert audit_pipeline_stats()['depth'] == 2
+
+    def test_rolled_back_action_is_not_logged(self, member, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError), transaction.atomic():
+                AuditLog.log(member, AuditLog.Action.UPDATE, member)
+                assert audit_pipeline_stats()['depth'] == 0
+                raise RuntimeError('action failed')
+
+        assert audit_pipeline_stats()['depth'] == 0
+
+    def test_full_batch_wakes_the_writer(self, settings, member, django_assert_num_queries, django_capture_on_commit_callbacks):
+        settings.AUDIT_BATCH_SIZE = 3
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(2):
+                AuditLog.log(member, AuditLog.Action.VIEW, member)
+        assert not pipeline._wake.is_set()
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(5):
+                AuditLog.log(member, AuditLog.Action.VIEW, member)
+        assert pipeline._wake.is_set()
+
+        with django_assert_num_queries(3):
+            assert flush_audit_queue() == 7
+        assert audit_pipeline_stats() == {
+            'queued': 7, 'dropped': 0, 'batches': 3, 'failed': 0, 'depth': 0, 'high_water': 7
+        }
+
+    def test_full_queue_drops_and_counts(self, settings, member, monkeypatch, django_capture_on_commit_callbacks):
+        settings.AUDIT_QUEUE_SIZE = 2
+
+        def database_down(entries):
+            raise ConnectionError('database down')
+
+        monkeypatch.setattr(pipeline, 'write_audit_batch', database_down)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(4):
+                AuditLog.log(member, AuditLog.Action.VIEW, member)
+        flush_audit_queue()
+
+        stats = audit_pipeline_stats()
+        assert stats['depth'] == 2  # Kept for the next flush
+        assert stats['dropped'] == 2
+        assert stats['failed'] == 1
+
+    def test_remaining_entries_are_written_at_exit(self, member):
+        enqueue_audit(logout_entry(member))
+
+        assert write_remaining_audit_entries() == 1
+        assert AuditLog.objects.filter(action=AuditLog.Action.LOGOUT).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_background_writer_drains_the_queue(settings, member):
+    settings.AUDIT_FLUSH_SECONDS = 0.05
+    start_audit_writer()
+    try:
+        enqueue_audit(logout_entry(member))
+
+        deadline = time.monotonic() + 5
+        while not AuditLog.objects.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop_audit_writer()
+
+    assert AuditLog.objects.filter(action=AuditLog.Action.LOGOUT).count() == 1
+    assert audit_pipeline_stats()['depth'] == 0
@@ -0,0 +1,133 @@
+import threading
+import time
+from datetime import date
+from io import StringIO
+
+import pytest
+
+from django.core.management import call_command
+
+from core.cache import CacheNamespace, cache_stats, get_tag_versions, invalidate_tags, month_tag
+from core.models import FiscalYear, MonthlyClose
+
+
+REPORTS = CacheNamespace('reports-test')
+WIDGETS = CacheNamespace('widgets-test')
+
+
+class TestNamespaces:
+    def test_names_do_not_collide_across_namespaces(self):
+        REPORTS.set('totals', 1)
+        WIDGETS.set('totals', 2)
+
+        assert REPORTS.get('totals') == 1
+        assert WIDGETS.get('totals') == 2
+
+    def test_tag_invalidation(self):
+        REPORTS.set('branch-1', 'one', tags=['branch:1', 'month:2026-09'])
+        REPORTS.set('branch-2', 'two', tags=['branch:2', 'month:2026-09'])
+
+        invalidate_tags('branch:1')
+
+        assert REPORTS.get('branch-1', tags=['branch:1', 'month:2026-09']) is None
+        assert REPORTS.get('branch-2', tags=['branch:2', 'month:2026-09']) == 'two'
+
+        invalidate_tags(month_tag(date(2026, 9, 14)))
+        assert REPORTS.get('branch-2', tags=['branch:2', 'month:2026-09']) is None
+
+    def test_namespace_invalidation(self):
+        REPORTS.set('totals', 1)
+        WIDGETS.set('totals', 2)
+
+        REPORTS.invalidate()
+
+        assert REPORTS.get('totals') is None
+        assert WIDGETS.get('totals') == 2
+
+    def test_delete_and_version(self):
+        REPORTS.set('totals', 1)
+        REPORTS.set('other', 2)
+        version = REPORTS.version()
+
+        REPORTS.delete('totals')
+        assert REPORTS.get('totals') is None
+        assert REPORTS.get('other') == 2
+        assert REPORTS.version() == version
+
+        REPORTS.invalidate()
+        assert REPORTS.version() != version
+
+    def test_none_is_cached(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+
+        assert REPORTS.get_or_compute('nothing', compute) is None
+        assert REPORTS.get_or_compute('nothing', compute) is None
+        assert len(calls) == 1
+
+
+class TestStampedeProtection:
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'value'
+
+        def read():
+            results.append(REPORTS.get_or_compute('slow', compute))
+
+        threads = [threading.Thread(target=read) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ['value'] * 5
+        assert cache_stats()['reports-test']['waits'] == 4
+
+
+class TestStats:
+    def test_hits_and_misses_per_namespace(self):
+        for _ in range(3):
+            REPORTS.get_or_compute('totals', lambda: 1)
+        WIDGETS.get('missing')
+
+        stats = cache_stats()
+
+        assert stats['reports-test'] == {'hits': 2, 'misses': 1, 'waits': 0, 'hit_rate': 2 / 3}
+        assert stats['widgets-test']['misses'] == 1
+
+    def test_command_prints_the_counters(self):
+        REPORTS.get_or_compute('totals', lambda: 1)
+        REPORTS.get_or_compute('totals', lambda: 1)
+        out = StringIO()
+
+        call_command('cache_stats', reset=True, stdout=out)
+
+        assert 'reports-test' in out.getvalue()
+        assert '50.0%' in out.getvalue()
+        assert cache_stats() == {}
+
+
+@pytest.mark.django_db
+def test_month_close_invalidates_its_month(django_capture_on_commit_callbacks):
+    from core.models import Area, District, Branch
+
+    area = Area.objects.create(name="Tag Area", code="TA")
+    district = District.objects.create(name="Tag District", code="TD", area=area)
+    branch = Branch.objects.create(name="Tag Branch", code="TB", district=district)
+    fiscal_year = FiscalYear.objects.create(year=2026, start_date=date(2026, 1, 1), end_date=date(2026, 12, 31))
+    before = get_tag_versions(['month:2026-09', 'month:2026-08'])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        MonthlyClose.objects.create(fiscal_year=fiscal_year, branch=branch, month=9, year=2026)
+
+    after = get_tag_versions(['month:2026-09', 'month:2026-08'])
+    assert after['month:2026-09'] != before['month:2026-09']
+    assert after['month:2026-08'] == before['month:2026-08']
@@ -0,0 +1,62 @@
+import pytest
+from decimal import Decimal
+
+from django.utils import timezone
+
+from accounts.models import User
+from core.models import Branch
+from core.dashboard_cache import get_versions, cached_fragment
+from contributions.models import Contribution
+
+
+def add_contribution(branch, contribution_type, amount):
+    return Contribution.objects.create(
+        contribution_type=contribution_type, branch=branch,
+        date=timezone.now().date(), amount=Decimal(amount)
+    )
+
+
+@pytest.mark.django_db
+class TestScopeVersions:
+    def test_save_bumps_branch_and_every_scope_above(self, branch, tithe_type, django_capture_on_commit_callbacks):
+        scopes = ['mission', f'area:{branch.district.area_id}', f'district:{branch.district_id}', f'branch:{branch.pk}']
+        other = Branch.objects.create(name="Other", code="OB", district=branch.district)
+        before = get_versions(scopes + [f'branch:{other.pk}'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            add_contribution(branch, tithe_type, '10.00')
+
+        after = get_versions(scopes + [f'branch:{other.pk}'])
+        assert all(after[scope] != before[scope] for scope in scopes)
+        assert after[f'branch:{other.pk}'] == before[f'branch:{other.pk}']
+
+    def test_moving_a_record_bumps_both_branches(self, branch, tithe_type, django_capture_on_commit_callbacks):
+        other = Branch.objects.create(name="Other", code="OB", district=branch.district)
+        contribution = add_contribution(branch, tithe_type, '10.00')
+        before = get_versions([f'branch:{branch.pk}', f'branch:{other.pk}'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            contribution.branch = other
+            contribution.save()
+
+        after = get_versions([f'branch:{branch.pk}', f'branch:{other.pk}'])
+        assert after[f'branch:{branch.pk}'] != before[f'branch:{branch.pk}']
+        assert after[f'branch:{other.pk}'] != before[f'branch:{other.pk}']
+
+    def test_login_does_not_bump(self, branch, django_capture_on_commit_callbacks):
+        user = User.objects.create_user(member_id='00002', password='pass', branch=branch)
+        before = get_versions([f'branch:{branch.pk}'])
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.last_login = timezone.now()
+            user.save(update_fields=['last_login'])
+
+        assert get_versions([f'branch:{branch.pk}']) == before
+
+    def test_fragment_is_computed_once_per_version(self, branch):
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+
+        assert cached_fragment('mission', 'figure', compute) == 1
+        assert cached_fragment('mission', 'figure', compute) == 1
+
@@ -0,0 +1,142 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from core import dashboard_snapshots
+from core.models import FiscalYear, MonthlyClose, DashboardSnapshot
+from core.dashboard_snapshots import refresh_dashboard_snapshots, get_snapshot
+from test_dashboards import add_busy_branch
+
+
+@pytest.mark.django_db
+class TestSnapshotRefresh:
+    def test_one_snapshot_per_scope_with_rolled_up_figures(self, district, tithe_type):
+        first = add_busy_branch(district, tithe_type, 1)
+        second = add_busy_branch(district, tithe_type, 2)
+
+        assert refresh_dashboard_snapshots() == 5  # Mission, area, district, two branches
+
+        area = get_snapshot(f'area:{district.area_id}').data
+        assert area['monthly_contributions'] == Decimal('30.00')
+        assert area['total_members'] == 2
+        assert area['district_members'] == {str(district.pk): 2}
+        assert get_snapshot(f'district:{district.pk}').data['branch_members'] == {
+            str(first.pk): 1, str(second.pk): 1
+        }
+        branch = get_snapshot(f'branch:{second.pk}').data
+        assert branch['last_attendance']['total_attendance'] == 2
+        assert isinstance(branch['last_attendance']['date'], date)
+        assert get_snapshot('mission').data['total_branches'] == 2
+
+    def test_queries_do_not_grow_with_branches(self, district, tithe_type):
+        add_busy_branch(district, tithe_type, 1)
+        with CaptureQueriesContext(connection) as one_branch:
+            refresh_dashboard_snapshots()
+
+        for n in range(2, 7):
+            add_busy_branch(district, tithe_type, n)
+        with CaptureQueriesContext(connection) as six_branches:
+            refresh_dashboard_snapshots()
+
+        assert len(six_branches) == len(one_branch)
+
+    def test_deleted_scopes_are_dropped(self, district, tithe_type):
+        branch = add_busy_branch(district, tithe_type, 1)
+        DashboardSnapshot.objects.create(scope='branch:gone', data={}, computed_at=branch.created_at)
+
+        refresh_dashboard_snapshots()
+
+        assert not DashboardSnapshot.objects.filter(scope='branch:gone').exists()
+
+    def test_month_close_queues_one_refresh(
+        self, district, tithe_type, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        queued = []
+        monkeypatch.setattr(dashboard_snapshots, 'async_task', lambda func: queued.append(func))
+        branches = [add_busy_branch(district, tithe_type, n) for n in (1, 2)]
+        fiscal_year = FiscalYear.objects.create(year=2026, start_date=date(2026, 1, 1), end_date=date(2026, 12, 31))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for branch in branches:
+                MonthlyClose.objects.create(
+                    fiscal_year=fiscal_year, branch=branch, month=9, year=2026, is_closed=True
+                )
+
+        assert queued == ['core.dashboard_snapshots.refresh_dashboard_snapshots']
+
+
+@pytest.mark.django_db
+class TestSnapshotDashboards:
+    def test_area_dashboard_reads_only_the_snapshot(self, client, settings, district, tithe_type):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        client.force_login(User.objects.create_user(
+            member_id='00002', password='pass', role='area_executive', managed_area=district.area
+        ))
+        add_busy_branch(district, tithe_type, 1)
+        refresh_dashboard_snapshots()
+        add_busy_branch(district, tithe_type, 2)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(reverse('core:area_dashboard'))
+
+        # Stale until the next refresh, and no aggregates in the request
+        assert response.context['monthly_contributions'] == Decimal('10.00')
+        assert b'Figures as of' in response.content
+        assert not [q for q in captured.captured_queries if 'SUM(' in q['sql']]
+
+        refresh_dashboard_snapshots()
+        assert client.get(reverse('core:area_dashboard')).context['monthly_contributions'] == Decimal('30.00')
+
+    def test_first_visit_queues_missing_snapshots(
+        self, client, settings, monkeypatch, district, tithe_type, django_capture_on_commit_callbacks
+    ):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        queued = []
+        monkeypatch.setattr(dashboard_snapshots, 'async_task', lambda func: queued.append(func))
+        branch = add_busy_branch(district, tithe_type, 1)
+        client.force_login(User.objects.create_user(
+            member_id='00003', password='pass', role='branch_executive', branch=branch
+        ))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with CaptureQueriesContext(connection) as captured:
+                response = client.get(reverse('core:branch_dashboard'))
+            client.get(reverse('core:branch_dashboard'))
+
+        # Nothing is computed in the request; one rebuild is queued for both visits
+        assert response.context['total_members'] == 0
+        assert b'Figures are being calculated' in response.content
+        assert not [q for q in captured.captured_queries if 'SUM(' in q['sql']]
+        assert queued == ['core.dashboard_snapshots.refresh_dashboard_snapshots']
+        assert not DashboardSnapshot.objects.exists()
+
+        refresh_dashboard_snapshots()
+        response = client.get(reverse('core:branch_dashboard'))
+        assert response.context['total_members'] == 2
+        assert response.context['absentees_count'] == 1
+
+    def test_admin_refresh(self, client, district, tithe_type):
+        add_busy_branch(district, tithe_type, 1)
+        refresh_dashboard_snapshots()
+        add_busy_branch(district, tithe_type, 2)
+        client.force_login(User.objects.create_superuser(member_id='00001', password='pass'))
+
+        response = client.post(reverse('core:refresh_dashboard'))
+
+        assert response.status_code == 302
+        assert get_snapshot('mission').data['total_branches'] == 2
+
+    def test_members_cannot_refresh(self, client, district, tithe_type):
+        add_busy_branch(district, tithe_type, 1)
+        refresh_dashboard_snapshots()
+        add_busy_branch(district, tithe_type, 2)
+        client.force_login(User.objects.create_user(member_id='00004', password='pass', role='member'))
+
+        client.post(reverse('core:refresh_dashboard'))
+
+        assert get_snapshot('mission').data['total_branches'] == 1
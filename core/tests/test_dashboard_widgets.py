@@ -0,0 +1,108 @@
+import pytest
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from core.dashboard_widget_views import DASHBOARD_WIDGETS
+from test_dashboards import add_busy_branch
+
+
+@pytest.fixture
+def executive(client, district):
+    user = User.objects.create_user(
+        member_id='00002', password='pass', role='district_executive', managed_district=district
+    )
+    client.force_login(user)
+    return user
+
+
+def widget_url(name):
+    return reverse('core:dashboard_widget', args=[name])
+
+
+@pytest.mark.django_db
+class TestDashboardWidgets:
+    @pytest.mark.parametrize('name', list(DASHBOARD_WIDGETS))
+    def test_widget_renders_with_validators(self, client, executive, district, tithe_type, name):
+        add_busy_branch(district, tithe_type, 1)
+
+        response = client.get(widget_url(name))
+
+        assert response.status_code == 200
+        assert response.json()['widget'] == name
+        assert response['ETag']
+        assert response['Last-Modified']
+        assert 'no-cache' in response['Cache-Control']
+
+    def test_unchanged_widget_is_not_modified(self, client, executive, district, tithe_type):
+        add_busy_branch(district, tithe_type, 1)
+        etag = client.get(widget_url('recent_contributions'))['ETag']
+
+        response = client.get(widget_url('recent_contributions'), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert not response.content
+
+    def test_data_change_gives_a_new_etag(
+        self, client, executive, district, tithe_type, django_capture_on_commit_callbacks
+    ):
+        add_busy_branch(district, tithe_type, 1)
+        etag = client.get(widget_url('branch_performance'))['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            add_busy_branch(district, tithe_type, 2)
+
+        response = client.get(widget_url('branch_performance'), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert 'Branch 2' in response.json()['html']
+
+    def test_week_attendance_ranks_busiest_branch_first(self, client, executive, district, tithe_type):
+        for n in range(1, 4):
+            add_busy_branch(district, tithe_type, n)
+
+        html = client.get(widget_url('week_attendance')).json()['html']
+
+        assert html.index('Branch 3') < html.index('Branch 2') < html.index('Branch 1')
+
+    def test_birthdays_are_scoped_and_within_a_week(self, client, executive, district, tithe_type):
+        branch = add_busy_branch(district, tithe_type, 1)
+        today = timezone.localdate()
+        User.objects.create_user(
+            member_id='20001', password='pass', first_name='Soon', last_name='Celebrant',
+            branch=branch, date_of_birth=(today + timedelta(days=3)).replace(year=1992)
+        )
+        User.objects.create_user(
+            member_id='20002', password='pass', first_name='Later', last_name='Celebrant',
+            branch=branch, date_of_birth=(today + timedelta(days=20)).replace(year=1992)
+        )
+
+        html = client.get(widget_url('birthdays')).json()['html']
+
+        assert 'Soon Celebrant' in html
+        assert 'Later Celebrant' not in html
+
+    def test_birthday_age_is_current_age(self, district, tithe_type):
+        from core.utils import get_upcoming_birthdays
+
+        branch = add_busy_branch(district, tithe_type, 1)
+        today = timezone.localdate()
+        User.objects.create_user(
+            member_id='20003', password='pass', branch=branch,
+            date_of_birth=(today + timedelta(days=3)).replace(year=1992)
+        )
+
+        [birthday] = get_upcoming_birthdays(branch)
+
+        assert birthday['days_until'] == 3
+        assert birthday['age'] == today.year - 1992
+
+    def test_members_have_no_widgets(self, client, district):
+        client.force_login(User.objects.create_user(member_id='00003', password='pass', role='member'))
+
+        assert client.get(widget_url('recent_contributions')).status_code == 403
+
+    def test_unknown_widget(self, client, executive):
+        assert client.get(widget_url('payroll')).status_code == 404
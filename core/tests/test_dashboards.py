@@ -0,0 +1,65 @@
+import pytest
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from attendance.models import AttendanceSession, ServiceType
+from core.models import Branch
+from core.dashboard_snapshots import refresh_dashboard_snapshots
+from contributions.models import Contribution
+
+
+def add_busy_branch(district, contribution_type, n):
+    """A branch with a member, a contribution and an attendance session this week."""
+    today = timezone.now().date()
+    branch = Branch.objects.create(name=f"Branch {n}", code=f"B{n}", district=district)
+    User.objects.create_user(member_id=f'1{n:04d}', password='pass', role='member', branch=branch)
+    Contribution.objects.create(
+        contribution_type=contribution_type, branch=branch, date=today, amount=Decimal('10.00') * n
+    )
+    service_type, _ = ServiceType.objects.get_or_create(name="Sunday Service", code="SUN")
+    AttendanceSession.objects.create(branch=branch, service_type=service_type, date=today, total_attendance=n)
+    return branch
+
+
+def dashboard_queries(client, url):
+    """Queries of a dashboard load with a cold cache; the session write-back is left out."""
+    cache.clear()
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [q for q in captured.captured_queries if q['sql'].startswith('SELECT')], response
+
+
+@pytest.mark.django_db
+class TestDashboardQueryCounts:
+    @pytest.mark.parametrize('role, url_name', [
+        ('area_executive', 'core:area_dashboard'),
+        ('district_executive', 'core:district_dashboard'),
+    ])
+    def test_queries_do_not_grow_with_branches(self, client, settings, district, tithe_type, role, url_name):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        executive = User.objects.create_user(
+            member_id='00002', password='pass', role=role,
+            managed_area=district.area if role == 'area_executive' else None,
+            managed_district=district if role == 'district_executive' else None,
+        )
+        client.force_login(executive)
+        add_busy_branch(district, tithe_type, 1)
+        client.get(reverse(url_name))  # create this week's attendance record
+
+        one_branch, _ = dashboard_queries(client, reverse(url_name))
+
+        for n in range(2, 7):
+            add_busy_branch(district, tithe_type, n)
+        refresh_dashboard_snapshots()
+
+        six_branches, response = dashboard_queries(client, reverse(url_name))
+
+        assert len(six_branches) == len(one_branch)
+        assert response.context['total_members'] == 6
@@ -0,0 +1,112 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from core.models import Branch
+from core.financial_helpers import (
+    annotate_branch_financials, get_branch_balance, get_expected_mission_due,
+    expected_mission_due_by_branch
+)
+from contributions.models import Contribution, Remittance
+from expenditure.models import Expenditure, ExpenditureCategory
+
+
+def add_branch_activity(district, contribution_type, n):
+    branch = Branch.objects.create(name=f"Branch {n}", code=f"B{n}", district=district)
+    category, _ = ExpenditureCategory.objects.get_or_create(name="Utilities", code="UTIL")
+    Contribution.objects.create(
+        contribution_type=contribution_type, branch=branch,
+        date=date(2026, 3, 4), amount=Decimal('100.00') * n
+    )
+    Expenditure.objects.create(
+        level='branch', branch=branch, category=category, title="Power",
+        amount=Decimal('10.00'), date=date(2026, 3, 9), status='approved'
+    )
+    # Spans a year boundary: December 2025 lies inside a 2025-12..2026-03 range
+    Remittance.objects.create(
+        branch=branch, month=12, year=2025, amount_sent=Decimal('5.00'),
+        status=Remittance.Status.VERIFIED
+    )
+    return branch
+
+
+@pytest.mark.django_db
+class TestExpectedMissionDue:
+    def test_single_aggregate_over_stored_mission_share(self, district, tithe_type, django_assert_num_queries):
+        branch = add_branch_activity(district, tithe_type, 3)
+
+        with django_assert_num_queries(1):
+            expected = get_expected_mission_due(branch, date(2026, 1, 1), date(2026, 12, 31))
+
+        assert expected == Decimal('120.00')
+        assert get_expected_mission_due(branch, date(2026, 1, 1), date(2026, 12, 31), months=[4]) == Decimal('0.00')
+
+    def test_batched_by_branch(self, district, tithe_type, django_assert_num_queries):
+        first = add_branch_activity(district, tithe_type, 1)
+        second = add_branch_activity(district, tithe_type, 2)
+        Branch.objects.create(name="Quiet", code="Q", district=district)
+
+        with django_assert_num_queries(1):
+            expected = expected_mission_due_by_branch(date(2026, 1, 1), date(2026, 12, 31))
+
+        assert expected == {first.pk: Decimal('40.00'), second.pk: Decimal('80.00')}
+
+
+@pytest.mark.django_db
+class TestAnnotateBranchFinancials:
+    def test_matches_per_branch_helpers(self, district, tithe_type):
+        branches = [add_branch_activity(district, tithe_type, n) for n in (1, 2)]
+        start, end = date(2025, 12, 1), date(2026, 3, 31)
+
+        annotated = {b.pk: b for b in annotate_branch_financials(Branch.objects.all(), start, end)}
+
+        for branch in branches:
+            expected = get_branch_balance(branch, start, end)
+            row = annotated[branch.pk]
+            assert row.total_contributions == expected['total_contributions']
+            assert row.total_expenditures == expected['total_expenditures']
+            assert row.total_remitted == expected['total_remitted'] == Decimal('5.00')
+            assert row.branch_balance == expected['branch_balance']
+            assert row.expected_mission_due == get_expected_mission_due(branch, start, end)
+
+    def test_branch_without_activity_is_zero(self, district):
+        Branch.objects.create(name="Quiet", code="Q", district=district)
+
+        row = annotate_branch_financials(Branch.objects.all()).get()
+
+        assert row.total_contributions == Decimal('0.00')
+        assert row.expected_mission_due == Decimal('0.00')
+        assert row.branch_balance == Decimal('0.00')
+
+    @pytest.mark.parametrize('url_name, params', [
+        ('reports:comprehensive_statistics', {'year': '2026', 'month': '3'}),
+        ('reports:final_financial_report', {'year': '2026', 'month': '3'}),
+        ('core:branch_financial_overview', {'year': '2026'}),
+    ])
+    def test_report_queries_do_not_grow_with_branches(self, client, settings, district, tithe_type, url_name, params):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        admin = User.objects.create_superuser(member_id='00001', password='pass')
+        client.force_login(admin)
+        add_branch_activity(district, tithe_type, 1)
+        client.get(reverse(url_name), params)  # warm session and settings caches
+
+        with CaptureQueriesContext(connection) as one_branch:
+            assert client.get(reverse(url_name), params).status_code == 200
+
+        for n in range(2, 6):
+            add_branch_activity(district, tithe_type, n)
+        client.get(reverse(url_name), params)  # new branches drop the cached hierarchy
+
+        with CaptureQueriesContext(connection) as five_branches:
+            assert client.get(reverse(url_name), params).status_code == 200
+
+        # Only reads are counted: the session write-back depends on timing
+        def data_queries(captured):
+            return [q for q in captured.captured_queries if q['sql'].startswith('SELECT')]
+
+        assert len(data_queries(five_branches)) == len(data_queries(one_branch))
@@ -0,0 +1,193 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from core.models import BranchFinancialSummary, MissionFinancialSummary
+from core.financial_summaries import backfill_summaries, rebuild_summaries, branch_summary_totals, mission_summary_totals
+from contributions.models import Contribution, Remittance
+from expenditure.models import Expenditure, ExpenditureCategory
+
+
+@pytest.fixture
+def category():
+    return ExpenditureCategory.objects.create(name="Utilities", code="UTIL")
+
+
+def summary(branch, year, month):
+    return BranchFinancialSummary.objects.get(branch=branch, year=year, month=month)
+
+
+def summary_rows():
+    fields = ['branch_id', 'year', 'month', 'total_tithe', 'total_branch_expenses',
+              'remittance_to_mission', 'total_income', 'total_expenditure',
+              'opening_balance', 'closing_balance']
+    return (
+        sorted(BranchFinancialSummary.objects.values_list(*fields)),
+        sorted(MissionFinancialSummary.objects.values_list(
+            'year', 'month', 'total_remittances', 'total_mission_expenses', 'opening_balance', 'closing_balance'
+        )),
+    )
+
+
+@pytest.mark.django_db
+class TestIncrementalSummaries:
+    def test_records_saved_with_form_dates(self, branch, category):
+        Expenditure.objects.create(
+            level='branch', branch=branch, category=category, title="Power",
+            amount=Decimal('20.00'), date='2026-05-09', status='approved'
+        )
+
+        assert summary(branch, 2026, 5).total_branch_expenses == Decimal('20.00')
+
+    def test_contribution_changes_move_between_months(self, branch, tithe_type):
+        contribution = Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 3, 4), amount=Decimal('100.00')
+        )
+        assert summary(branch, 2026, 3).total_tithe == Decimal('100.00')
+
+        contribution.amount = Decimal('150.00')
+        contribution.date = date(2026, 4, 2)
+        contribution.save()
+
+        march, april = summary(branch, 2026, 3), summary(branch, 2026, 4)
+        assert march.total_tithe == Decimal('0.00')
+        assert april.total_tithe == Decimal('150.00')
+        assert april.closing_balance == Decimal('150.00')
+
+        contribution.delete()
+        assert summary(branch, 2026, 4).closing_balance == Decimal('0.00')
+
+    def test_earlier_month_change_shifts_later_balances(self, branch, tithe_type, category):
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 5, 1), amount=Decimal('80.00')
+        )
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 3, 1), amount=Decimal('100.00')
+        )
+        expense = Expenditure.objects.create(
+            level='branch', branch=branch, category=category, title="Power",
+            amount=Decimal('30.00'), date=date(2026, 3, 9), status='pending'
+        )
+        assert summary(branch, 2026, 5).opening_balance == Decimal('100.00')
+
+        expense.status = 'approved'
+        expense.save()
+
+        may = summary(branch, 2026, 5)
+        assert summary(branch, 2026, 3).total_branch_expenses == Decimal('30.00')
+        assert may.opening_balance == Decimal('70.00')
+        assert may.closing_balance == Decimal('150.00')
+
+    def test_verified_remittance_counts_for_branch_and_mission(self, branch):
+        remittance = Remittance.objects.create(
+            branch=branch, month=3, year=2026, amount_sent=Decimal('40.00')
+        )
+        assert not MissionFinancialSummary.objects.exists()
+
+        remittance.status = Remittance.Status.VERIFIED
+        remittance.save()
+
+        assert summary(branch, 2026, 3).remittance_to_mission == Decimal('40.00')
+        assert mission_summary_totals(2026)['total_remittances'] == Decimal('40.00')
+        assert branch_summary_totals(2026, group_by='district')[branch.district_id]['total_expenditure'] == Decimal('40.00')
+
+
+@pytest.mark.django_db
+class TestRebuildSummaries:
+    def test_rebuild_matches_incremental(self, branch, tithe_type, category):
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 1, 4), amount=Decimal('100.00')
+        )
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 3, 4), amount=Decimal('60.00')
+        )
+        Expenditure.objects.create(
+            level='mission', category=category, title="Rent",
+            amount=Decimal('25.00'), date=date(2026, 2, 9), status='paid'
+        )
+        Remittance.objects.create(
+            branch=branch, month=2, year=2026, amount_sent=Decimal('10.00'),
+            status=Remittance.Status.VERIFIED
+        )
+        incremental = summary_rows()
+
+        BranchFinancialSummary.objects.update(total_tithe=0, opening_balance=0, closing_balance=0)
+        MissionFinancialSummary.objects.all().delete()
+        rebuild_summaries((2026, 1), (2026, 3), workers=1)
+
+        assert summary_rows() == incremental
+
+    def test_range_rebuild_carries_earlier_balances_forward(self, branch, tithe_type):
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 1, 4), amount=Decimal('100.00')
+        )
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 3, 4), amount=Decimal('60.00')
+        )
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 5, 4), amount=Decimal('20.00')
+        )
+        incremental = summary_rows()
+
+        BranchFinancialSummary.objects.filter(month=3).update(total_tithe=0)
+        BranchFinancialSummary.objects.filter(month__gte=3).update(opening_balance=0, closing_balance=0)
+        rebuild_summaries((2026, 3), (2026, 3), workers=1)
+
+        assert summary_rows() == incremental
+        assert summary(branch, 2026, 5).closing_balance == Decimal('180.00')
+
+    def test_command_keeps_closed_status(self, branch, tithe_type):
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 1, 4), amount=Decimal('100.00')
+        )
+        BranchFinancialSummary.objects.update(is_closed=True, total_tithe=0)
+
+        call_command('rebuild_financial_summaries', '--from', '2026-01', '--to', '2026-01', '--workers', '1')
+
+        january = summary(branch, 2026, 1)
+        assert january.is_closed
+        assert january.total_tithe == Decimal('100.00')
+
+    def test_migrate_backfills_empty_summaries(self, branch, tithe_type):
+        Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch, date=date(2026, 1, 4), amount=Decimal('100.00')
+        )
+        incremental = summary_rows()
+        BranchFinancialSummary.objects.all().delete()
+        MissionFinancialSummary.objects.all().delete()
+
+        assert backfill_summaries() > 0
+        assert summary_rows() == incremental
+        assert backfill_summaries() == 0  # Existing summaries are left to the command
+
+
+@pytest.mark.django_db
+class TestMissionYearlyExports:
+    @pytest.fixture
+    def mission_admin(self, client, mission_admin):
+        client.force_login(mission_admin)
+        return mission_admin
+
+    @pytest.fixture
+    def mission_expense(self, category):
+        return Expenditure.objects.create(
+            level='mission', category=category, title="Rent",
+            amount=Decimal('25.00'), date=date(2026, 2, 9), status='paid'
+        )
+
+    def test_excel_export(self, client, mission_admin, mission_expense):
+        response = client.get(reverse('reports:export_mission_yearly_excel'), {'year': 2026})
+
+        assert response.status_code == 200
+        assert 'spreadsheetml' in response['Content-Type']
+
+    def test_pdf_export(self, client, mission_admin, mission_expense):
+        response = client.get(reverse('reports:export_mission_yearly_pdf'), {'year': 2026})
+
+        # Without WeasyPrint's system libraries the view falls back to the report page
+        assert response.status_code in (200, 302)
+        if response.status_code == 302:
+            assert response.url.startswith(reverse('reports:mission_yearly_report'))
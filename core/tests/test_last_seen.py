@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from core import last_seen
+from core.last_seen import SLOT_BATCH_SIZE, record_last_seen, flush_last_seen
+from core.schedules import SCHEDULES
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    forget_this_process()
+    yield
+    forget_this_process()
+
+
+def forget_this_process():
+    """Start over as a process that has not recorded anyone yet."""
+    last_seen._seen.clear()
+    last_seen._seen_bucket = None
+    last_seen._slot = None
+
+
+@pytest.fixture
+def next_bucket(monkeypatch):
+    """Move the clock on to the next bucket, finishing the current one."""
+    current = last_seen._current_bucket()
+
+    def advance():
+        monkeypatch.setattr(last_seen, '_current_bucket', lambda: current + 1)
+
+    return advance
+
+
+def user_writes(captured):
+    return [q for q in captured.captured_queries if q['sql'].startswith('UPDATE "accounts_user"')]
+
+
+@pytest.mark.django_db
+class TestLastSeen:
+    def test_requests_are_buffered_not_written(self, client, next_bucket):
+        user = User.objects.create_user(member_id='00002', password='pass', role='member')
+        client.force_login(user)
+        User.objects.filter(pk=user.pk).update(last_login=None)
+
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(3):
+                client.get(reverse('core:notifications_api'))
+
+        assert not user_writes(captured)
+        user.refresh_from_db()
+        assert user.last_login is None
+
+        next_bucket()
+        assert flush_last_seen() == 1
+        user.refresh_from_db()
+        assert user.last_login is not None
+
+    def test_flush_writes_every_user_in_one_statement(self, next_bucket):
+        users = [
+            User.objects.create_user(member_id=f'0000{n}', password='pass', role='member')
+            for n in range(2, 5)
+        ]
+        now = timezone.now()
+        for n, user in enumerate(users):
+            record_last_seen(user.pk, now - timedelta(minutes=n))
+        # Another worker saw the first user later in the same bucket
+        forget_this_process()
+        record_last_seen(users[0].pk, now + timedelta(seconds=5))
+        assert cache.get(f'last-seen:{last_seen._current_bucket()}:1') == {users[0].pk: now + timedelta(seconds=5)}
+
+        next_bucket()
+        with CaptureQueriesContext(connection) as captured:
+            assert flush_last_seen() == 3
+
+        assert len(user_writes(captured)) == 1
+        assert User.objects.get(pk=users[0].pk).last_login == now + timedelta(seconds=5)
+        for n, user in enumerate(users[1:], start=1):
+            user.refresh_from_db()
+            assert user.last_login == now - timedelta(minutes=n)
+        assert flush_last_seen() == 0  # already written
+
+    def test_flush_reads_slots_not_users(self, next_bucket, django_assert_num_queries):
+        users = [
+            User.objects.create_user(member_id=f'0000{n}', password='pass', role='member')
+            for n in range(2, 5)
+        ]
+        for n in range(SLOT_BATCH_SIZE + 2):  # More workers than one slot read
+            forget_this_process()
+            record_last_seen(users[n % 3].pk)
+
+        next_bucket()
+        # No query for the user ids: only the UPDATE
+        with django_assert_num_queries(1):
+            assert flush_last_seen() == 3
+
+    def test_current_bucket_is_left_for_the_next_run(self):
+        user = User.objects.create_user(member_id='00002', password='pass', role='member')
+        record_last_seen(user.pk)
+
+        assert flush_last_seen() == 0
+
+    def test_flush_runs_on_a_schedule(self):
+        assert SCHEDULES['Write last seen times']['func'] == 'core.last_seen.flush_last_seen'
@@ -0,0 +1,479 @@
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Branch
+from core.ledger_models import (
+    LedgerEntry, LedgerBalance, LedgerCheckpoint, LedgerOutbox, LedgerEntryArchive
+)
+from core.ledger_service import LedgerService, InsufficientFundsError
+from core.ledger_signals import suspend_ledger_signals
+from core.ledger_tasks import process_ledger_outbox
+from core import ledger_verifier
+from auditing.models import AuditFlag
+from contributions.models import Contribution, TitheCommission
+from expenditure.models import Expenditure, ExpenditureCategory
+from expenditure.views import check_spending_allowed
+
+
+def record_contribution(branch, contribution_type, amount, on):
+    """Save a verified contribution and drain the ledger outbox, as the worker would."""
+    contribution = Contribution.objects.create(
+        contribution_type=contribution_type, branch=branch,
+        date=on, amount=Decimal(amount)
+    )
+    process_ledger_outbox()
+    return contribution
+
+
+@pytest.mark.django_db
+class TestLedgerBalances:
+    def test_contribution_updates_balance_table(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+
+        assert LedgerService.get_branch_cash_balance(branch) == Decimal('100.00')
+        assert LedgerService.get_branch_payables(branch) == Decimal('40.00')
+        assert LedgerService.get_mission_receivables() == Decimal('40.00')
+        assert LedgerService.get_branch_spendable_cash(branch) == Decimal('60.00')
+
+    def test_balance_after_is_running_balance(self, branch, tithe_type):
+        for amount in ('100.00', '50.00'):
+            record_contribution(branch, tithe_type, amount, date(2026, 1, 4))
+
+        balances_after = LedgerEntry.objects.filter(
+            owner_type=LedgerEntry.OwnerType.BRANCH,
+            entry_type=LedgerEntry.EntryType.CASH,
+        ).order_by('balance_after').values_list('balance_after', flat=True)
+        assert list(balances_after) == [Decimal('100.00'), Decimal('150.00')]
+
+    def test_reversal_removes_amount_from_balance(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        entry = LedgerEntry.objects.get(
+            owner_type=LedgerEntry.OwnerType.BRANCH,
+            entry_type=LedgerEntry.EntryType.CASH,
+        )
+        entry.status = LedgerEntry.Status.REVERSED
+        entry.save()
+
+        assert LedgerService.get_branch_cash_balance(branch) == Decimal('0')
+
+    def test_rebuild_matches_maintained_balances(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        maintained = set(LedgerBalance.objects.values_list('owner_type', 'owner_key', 'entry_type', 'balance'))
+
+        LedgerBalance.objects.all().delete()
+        LedgerService.rebuild_balances()
+
+        rebuilt = set(LedgerBalance.objects.values_list('owner_type', 'owner_key', 'entry_type', 'balance'))
+        assert rebuilt == maintained
+
+
+@pytest.mark.django_db
+class TestLedgerCheckpoints:
+    def test_locking_month_writes_checkpoints(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        LedgerService.lock_entries_for_month(1, 2026, branch)
+
+        checkpoint = LedgerCheckpoint.objects.get(
+            owner_type=LedgerEntry.OwnerType.BRANCH,
+            owner_key=str(branch.pk),
+            entry_type=LedgerEntry.EntryType.CASH,
+            year=2026, month=1,
+        )
+        assert checkpoint.closing_balance == Decimal('100.00')
+
+    def test_as_of_balance_uses_checkpoint_plus_delta(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        LedgerService.lock_entries_for_month(1, 2026, branch)
+        record_contribution(branch, tithe_type, '30.00', date(2026, 2, 1))
+        # Late entry dated inside the checkpointed month
+        record_contribution(branch, tithe_type, '10.00', date(2026, 1, 20))
+
+        assert LedgerService.get_branch_cash_balance(branch, as_of_date=date(2026, 1, 31)) == Decimal('110.00')
+        assert LedgerService.get_branch_cash_balance(branch, as_of_date=date(2026, 2, 28)) == Decimal('140.00')
+        assert LedgerService.get_mission_receivables(as_of_date=date(2026, 1, 31)) == Decimal('44.00')
+
+
+@pytest.mark.django_db
+class TestLedgerPostBatch:
+    def test_post_batch_posts_all_entries(self, branch, tithe_type):
+        with suspend_ledger_signals():
+            contributions = [
+                Contribution.objects.create(
+                    contribution_type=tithe_type, branch=branch,
+                    date=date(2026, 1, 4), amount=Decimal('10.00')
+                )
+                for _ in range(5)
+            ]
+        assert not LedgerEntry.objects.exists()
+
+        posted = LedgerService.post_batch(contributions)
+
+        assert posted == 15
+        assert LedgerService.get_branch_cash_balance(branch) == Decimal('50.00')
+        assert LedgerService.get_mission_receivables() == Decimal('20.00')
+        balances_after = sorted(LedgerEntry.objects.filter(
+            entry_type=LedgerEntry.EntryType.CASH
+        ).values_list('balance_after', flat=True))
+        assert balances_after == [Decimal('10.00'), Decimal('20.00'), Decimal('30.00'), Decimal('40.00'), Decimal('50.00')]
+
+    def test_post_batch_skips_already_posted(self, branch, tithe_type):
+        contribution = record_contribution(branch, tithe_type, '10.00', date(2026, 1, 4))
+
+        assert LedgerService.post_batch([contribution]) == 0
+        assert LedgerService.get_branch_cash_balance(branch) == Decimal('10.00')
+
+    def test_post_batch_query_count_is_bounded(self, branch, tithe_type, django_assert_max_num_queries):
+        with suspend_ledger_signals():
+            contributions = [
+                Contribution.objects.create(
+                    contribution_type=tithe_type, branch=branch,
+                    date=date(2026, 1, 4), amount=Decimal('10.00')
+                )
+                for _ in range(50)
+            ]
+
+        # Per-row posting would take well over 150 queries for 50 contributions
+        with django_assert_max_num_queries(40):
+            LedgerService.post_batch(contributions)
+
+
+@pytest.mark.django_db
+class TestLedgerOutbox:
+    def test_save_only_queues_posting(self, branch, tithe_type):
+        contribution = Contribution.objects.create(
+            contribution_type=tithe_type, branch=branch,
+            date=date(2026, 1, 4), amount=Decimal('100.00')
+        )
+
+        assert not LedgerEntry.objects.exists()
+        item = LedgerOutbox.objects.get()
+        assert item.source_id == str(contribution.pk)
+        assert item.status == LedgerOutbox.Status.PENDING
+
+    def test_worker_posts_once(self, branch, tithe_type):
+        contribution = record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        contribution.description = 'Edited'
+        contribution.save()
+        process_ledger_outbox()
+
+        assert LedgerOutbox.objects.get().status == LedgerOutbox.Status.DONE
+        assert LedgerEntry.objects.filter(contribution=contribution).count() == 3
+        assert LedgerService.get_branch_cash_balance(branch) == Decimal('100.00')
+
+    def test_failed_posting_is_retried_later(self):
+        LedgerOutbox.enqueue(LedgerOutbox.SourceType.REMITTANCE, 'not-a-uuid')
+
+        result = process_ledger_outbox()
+
+        item = LedgerOutbox.objects.get()
+        assert result['failed'] == 1
+        assert item.status == LedgerOutbox.Status.PENDING
+        assert item.attempts == 1
+        assert item.last_error
+        assert process_ledger_outbox()['failed'] == 0  # backing off
+
+
+    def test_reverified_source_is_queued_again(self, branch, tithe_type):
+        contribution = record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        LedgerEntry.objects.filter(contribution=contribution).delete()  # reverted
+        contribution.status = Contribution.Status.DRAFT
+        contribution.save()
+
+        contribution.status = Contribution.Status.VERIFIED
+        contribution.save()
+
+        item = LedgerOutbox.objects.get()
+        assert item.status == LedgerOutbox.Status.PENDING
+        assert item.attempts == 0
+        process_ledger_outbox()
+        assert LedgerEntry.objects.filter(contribution=contribution).count() == 3
+
+    def test_failed_source_is_queued_again(self):
+        LedgerOutbox.enqueue(LedgerOutbox.SourceType.REMITTANCE, 'not-a-uuid')
+        LedgerOutbox.objects.update(status=LedgerOutbox.Status.FAILED, attempts=8, last_error='boom')
+
+        LedgerOutbox.enqueue(LedgerOutbox.SourceType.REMITTANCE, 'not-a-uuid')
+
+        item = LedgerOutbox.objects.get()
+        assert (item.status, item.attempts, item.last_error) == (LedgerOutbox.Status.PENDING, 0, '')
+
+@pytest.mark.django_db
+class TestReceivablesByBranch:
+    def test_joins_branch_details_without_per_branch_queries(self, branch, tithe_type, django_assert_num_queries):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        cache.clear()
+
+        # Version lookup, archived-year lookup and one grouped query on the live ledger
+        with django_assert_num_queries(3):
+            receivables = LedgerService.get_receivables_by_branch()
+
+        assert receivables == [{
+            'branch': {'id': branch.pk, 'name': 'Test Branch', 'code': 'TB'},
+            'district': 'Test District',
+            'area': 'Test Area',
+            'amount_owed': Decimal('40.00'),
+        }]
+
+    def test_cached_until_new_receivable_posted(self, branch, tithe_type, django_assert_num_queries):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        LedgerService.get_receivables_by_branch()
+
+        with django_assert_num_queries(1):
+            LedgerService.get_receivables_by_branch()
+
+        record_contribution(branch, tithe_type, '50.00', date(2026, 1, 5))
+        assert LedgerService.get_receivables_by_branch()[0]['amount_owed'] == Decimal('60.00')
+
+
+@pytest.mark.django_db
+class TestMonthlySummaries:
+    def test_summaries_for_every_branch_in_one_grouped_query(self, branch, tithe_type, django_assert_num_queries):
+        other = Branch.objects.create(name="Other Branch", code="OB", district=branch.district)
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        record_contribution(other, tithe_type, '50.00', date(2026, 1, 11))
+        record_contribution(other, tithe_type, '70.00', date(2026, 2, 1))
+
+        # Archived-year lookup and one GROUP BY on the live ledger
+        with django_assert_num_queries(2):
+            summaries = LedgerService.get_monthly_summaries(LedgerEntry.OwnerType.BRANCH, 1, 2026)
+
+        assert set(summaries) == {branch.pk, other.pk}
+        assert summaries[other.pk]['cash_in'] == Decimal('50.00')
+        assert summaries[other.pk]['payables_added'] == Decimal('20.00')
+        assert summaries[branch.pk] == LedgerService.get_monthly_summary(
+            LedgerEntry.OwnerType.BRANCH, 1, 2026, owner_branch=branch
+        )
+
+    def test_outgoing_amounts_are_positive(self, branch):
+        LedgerEntry.objects.create(
+            entry_date=date(2026, 1, 4), owner_type=LedgerEntry.OwnerType.BRANCH,
+            owner_branch=branch, entry_type=LedgerEntry.EntryType.CASH,
+            amount=Decimal('-25.00'), source_type=LedgerEntry.SourceType.EXPENDITURE,
+            description='Expense'
+        )
+
+        summary = LedgerService.get_monthly_summary(LedgerEntry.OwnerType.BRANCH, 1, 2026)
+
+        assert summary['cash_out'] == Decimal('25.00')
+        assert summary['cash_in'] == Decimal('0')
+        assert summary['net_cash'] == Decimal('-25.00')
+
+
+@pytest.mark.django_db
+class TestLedgerArchive:
+    def close_year(self, year):
+        for month in range(1, 13):
+            LedgerService.lock_entries_for_month(month, year)
+
+    def test_archive_table_mirrors_ledger_columns(self):
+        assert [f.column for f in LedgerEntryArchive._meta.concrete_fields] == \
+            [f.column for f in LedgerEntry._meta.concrete_fields]
+
+    def test_archive_moves_closed_year(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2025, 3, 2))
+        record_contribution(branch, tithe_type, '50.00', date(2026, 1, 4))
+        self.close_year(2025)
+
+        moved = LedgerService.archive_year(2025)
+
+        assert moved == 3
+        assert not LedgerEntry.objects.filter(entry_date__year=2025).exists()
+        assert LedgerEntryArchive.objects.count() == 3
+        # Balances and as-of reads still include the archived year
+        assert LedgerService.get_branch_cash_balance(branch) == Decimal('150.00')
+        assert LedgerService.get_branch_cash_balance(branch, as_of_date=date(2025, 3, 31)) == Decimal('100.00')
+        assert LedgerService.get_branch_cash_balance(branch, as_of_date=date(2026, 1, 31)) == Decimal('150.00')
+        assert LedgerService.get_receivables_by_branch()[0]['amount_owed'] == Decimal('60.00')
+        assert LedgerService.get_monthly_summary(
+            LedgerEntry.OwnerType.BRANCH, 3, 2025, owner_branch=branch
+        )['cash_in'] == Decimal('100.00')
+
+    def test_as_of_balance_inside_archived_year(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2025, 3, 2))
+        record_contribution(branch, tithe_type, '30.00', date(2025, 3, 20))
+        self.close_year(2025)
+        LedgerService.archive_year(2025)
+
+        # Only archived entries fall after the February checkpoint
+        assert LedgerService.get_branch_cash_balance(branch, as_of_date=date(2025, 3, 15)) == Decimal('100.00')
+        assert LedgerService.get_monthly_summaries(
+            LedgerEntry.OwnerType.BRANCH, 3, 2025
+        )[branch.pk]['cash_in'] == Decimal('130.00')
+
+    def test_open_period_reads_skip_archive(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2025, 3, 2))
+        record_contribution(branch, tithe_type, '50.00', date(2026, 1, 4))
+        self.close_year(2025)
+        LedgerService.archive_year(2025)
+        archive_table = LedgerEntryArchive._meta.db_table
+
+        with CaptureQueriesContext(connection) as captured:
+            summary = LedgerService.get_monthly_summary(
+                LedgerEntry.OwnerType.BRANCH, 1, 2026, owner_branch=branch
+            )
+            balance = LedgerService.get_branch_cash_balance(branch, as_of_date=date(2026, 1, 31))
+
+        assert summary['cash_in'] == Decimal('50.00')
+        assert balance == Decimal('150.00')
+        assert not [q for q in captured.captured_queries if archive_table in q['sql']]
+
+    def test_unified_read_covers_archive(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2025, 3, 2))
+        record_contribution(branch, tithe_type, '50.00', date(2026, 1, 4))
+        self.close_year(2025)
+        LedgerService.archive_year(2025)
+
+        cash = Q(entry_type=LedgerEntry.EntryType.CASH)
+        entries = list(LedgerService.get_entries(cash))
+        assert [e.amount for e in entries] == [Decimal('50.00'), Decimal('100.00')]
+        assert all(isinstance(e, LedgerEntry) for e in entries)
+        assert LedgerService.get_entries(cash, start_date=date(2026, 1, 1)).count() == 1
+
+    def test_archive_requires_locked_year(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2025, 3, 2))
+
+        with pytest.raises(ValueError):
+            LedgerService.archive_year(2025)
+        assert LedgerEntry.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestLedgerVerifier:
+    @pytest.fixture(autouse=True)
+    def no_settle_margin(self, monkeypatch):
+        monkeypatch.setattr(ledger_verifier, 'SETTLE_MARGIN', timedelta(0))
+
+    def test_balanced_ledger_raises_no_flags(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+
+        run = ledger_verifier.verify_ledger()
+
+        assert run.branches_checked == 1
+        assert run.contributions_checked == 1
+        assert not AuditFlag.objects.exists()
+
+    def test_receivable_payable_mismatch_is_flagged(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        LedgerEntry.objects.filter(entry_type=LedgerEntry.EntryType.PAYABLE).delete()
+
+        ledger_verifier.verify_ledger()
+
+        flag = AuditFlag.objects.get()
+        assert flag.flag_type == AuditFlag.FlagType.LEDGER_IMBALANCE
+        assert flag.branch == branch
+
+    def test_unposted_contribution_is_flagged_once(self, branch, tithe_type):
+        with suspend_ledger_signals():
+            contribution = Contribution.objects.create(
+                contribution_type=tithe_type, branch=branch,
+                date=date(2026, 1, 4), amount=Decimal('100.00')
+            )
+
+        ledger_verifier.verify_ledger()
+        ledger_verifier.verify_ledger(full=True)
+
+        flag = AuditFlag.objects.get()
+        assert flag.flag_type == AuditFlag.FlagType.MISSING_LEDGER_ENTRIES
+        assert flag.object_id == str(contribution.pk)
+
+    def test_next_run_only_checks_new_changes(self, branch, tithe_type):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        ledger_verifier.verify_ledger()
+
+        run = ledger_verifier.verify_ledger()
+
+        assert run.contributions_checked == 0
+        assert run.branches_checked == 0
+
+
+@pytest.mark.django_db
+class TestSpendAuthorization:
+    @pytest.fixture
+    def category(self):
+        return ExpenditureCategory.objects.create(name="Utilities", code="UTIL")
+
+    def spend(self, branch, category, amount):
+        return LedgerService.reserve_and_post_expenditure(
+            'branch', amount, branch=branch, category=category,
+            date=date(2026, 1, 5), title='Light bill'
+        )
+
+    def test_spend_posts_immediately(self, branch, tithe_type, category):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+
+        expenditure = self.spend(branch, category, '45.00')
+
+        assert LedgerEntry.objects.filter(expenditure=expenditure).count() == 1
+        assert LedgerService.get_spendable('branch', branch) == Decimal('15.00')
+        assert not LedgerOutbox.objects.filter(source_type=LedgerOutbox.SourceType.EXPENDITURE).exists()
+
+    def test_overspend_is_rejected_without_side_effects(self, branch, tithe_type, category):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        self.spend(branch, category, '45.00')
+
+        with pytest.raises(InsufficientFundsError) as excinfo:
+            self.spend(branch, category, '20.00')
+
+        assert excinfo.value.available == Decimal('15.00')
+        assert Expenditure.objects.count() == 1
+
+    def test_spending_check_fails_closed(self, branch, monkeypatch):
+        def broken(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+        monkeypatch.setattr(LedgerService, 'get_spendable', broken)
+
+        allowed, _, available = check_spending_allowed('branch', branch=branch, amount='1.00')
+
+        assert not allowed
+        assert available == Decimal('0')
+
+    def test_dashboard_shows_the_checked_spendable(self, client, settings, mission_admin, branch, tithe_type, category):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        self.spend(branch, category, '45.00')
+        # The branch's payable row drifts from Mission's receivable, as the verifier flags
+        LedgerBalance.objects.filter(
+            owner_key=str(branch.pk), entry_type=LedgerEntry.EntryType.PAYABLE
+        ).update(balance=Decimal('50.00'))
+        client.force_login(mission_admin)
+
+        response = client.get(reverse('core:ledger_dashboard'))
+
+        summary, = response.context['branch_summaries']
+        assert (summary['cash'], summary['payables']) == (Decimal('55.00'), Decimal('50.00'))
+        assert summary['spendable'] == LedgerService.get_spendable('branch', branch) == Decimal('5.00')
+
+    def test_expenditure_form_checks_branch_funds(self, client, mission_admin, branch, tithe_type, category):
+        record_contribution(branch, tithe_type, '100.00', date(2026, 1, 4))
+        client.force_login(mission_admin)
+
+        for amount in ['70.00', '45.00']:
+            client.post(reverse('expenditure:add'), {
+                'category': category.pk, 'amount': amount, 'date': '2026-01-05',
+                'description': 'Light bill', 'branch': branch.pk,
+            })
+
+        assert list(Expenditure.objects.values_list('amount', flat=True)) == [Decimal('45.00')]
+        assert LedgerService.get_spendable('branch', branch) == Decimal('15.00')
+
+    def test_commission_payment_checks_mission_cash(self, client, mission_admin, branch):
+        commission = TitheCommission.objects.create(
+            recipient=mission_admin, branch=branch, month=1, year=2026,
+            commission_amount=Decimal('25.00'), status=TitheCommission.Status.APPROVED,
+        )
+        client.force_login(mission_admin)
+
+        client.post(reverse('contributions:commission_management'), {
+            'action': 'pay_commission', 'commission_id': commission.pk, 'payment_reference': 'C-1',
+        })
+
+        commission.refresh_from_db()
+        assert commission.status == TitheCommission.Status.APPROVED
+        assert not Expenditure.objects.exists()
@@ -0,0 +1,78 @@
+import pytest
+
+from django.test import RequestFactory
+from django.utils import timezone
+
+from accounts.models import User
+from announcements.models import Announcement, AnnouncementRead
+from core.models import Branch, Notification
+from core.notification_context_processor import notification_counts
+from core.rollups import get_hierarchy
+
+
+@pytest.fixture
+def member(branch):
+    return User.objects.create_user(member_id='00002', password='pass', role='member', branch=branch)
+
+
+def counts_for(user):
+    request = RequestFactory().get('/')
+    request.user = user
+    return notification_counts(request)
+
+
+def announce(title, **kwargs):
+    kwargs.setdefault('scope', 'mission')
+    kwargs.setdefault('is_published', True)
+    return Announcement.objects.create(title=title, content=title, publish_date=timezone.now(), **kwargs)
+
+
+@pytest.mark.django_db
+class TestNotificationCounts:
+    def test_counts_follow_scope_and_read_state(self, branch, member):
+        other = Branch.objects.create(name="Other", code="OB", district=branch.district)
+        announce("Everyone")
+        read = announce("Own district", scope='district', district=branch.district)
+        announce("Other branch", scope='branch', branch=other)
+        announce("Draft", scope='district', district=branch.district, is_published=False)
+        AnnouncementRead.objects.create(announcement=read, user=member)
+        Notification.objects.create(recipient=member, notification_type='system', title="Hi", message="Hi")
+
+        counts = counts_for(member)
+
+        assert counts['unread_announcements'] == 1
+        assert counts['unread_notifications'] == 2  # Plus the welcome notification
+        assert counts['total_notifications'] == 3
+
+    def test_one_query_then_none(self, branch, member, django_assert_num_queries):
+        get_hierarchy()
+
+        with django_assert_num_queries(1):
+            counts_for(member)
+        with django_assert_num_queries(0):
+            counts_for(member)
+
+    def test_saves_invalidate_the_cached_counts(self, branch, member, django_capture_on_commit_callbacks):
+        Notification.objects.filter(recipient=member).delete()
+        assert counts_for(member)['total_notifications'] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Notification.objects.create(recipient=member, notification_type='system', title="Hi", message="Hi")
+        assert counts_for(member)['unread_notifications'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            announcement = announce("New")
+        assert counts_for(member)['unread_announcements'] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            AnnouncementRead.objects.create(announcement=announcement, user=member)
+        assert counts_for(member)['unread_announcements'] == 0
+
+    def test_opening_an_announcement_marks_it_read(self, client, settings, branch, member):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        announcement = announce("Read me")
+        client.force_login(member)
+
+        client.get(f'/announcements/{announcement.pk}/')
+
+        assert AnnouncementRead.objects.filter(announcement=announcement, user=member).exists()
@@ -0,0 +1,132 @@
+import pytest
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from core.models import Area, District, Branch
+from core.rollups import rollup, get_hierarchy, period_financials
+from contributions.models import Contribution
+from expenditure.models import Expenditure, ExpenditureCategory
+
+
+@pytest.fixture
+def hierarchy():
+    north = Area.objects.create(name="North", code="N")
+    south = Area.objects.create(name="South", code="S")
+    districts = [
+        District.objects.create(name="North One", code="N1", area=north),
+        District.objects.create(name="North Two", code="N2", area=north),
+        District.objects.create(name="South One", code="S1", area=south),
+    ]
+    return north, south, districts
+
+
+def add_branch(district, contribution_type, n, amount):
+    branch = Branch.objects.create(name=f"Branch {n}", code=f"B{n}", district=district)
+    category, _ = ExpenditureCategory.objects.get_or_create(name="Utilities", code="UTIL")
+    Contribution.objects.create(
+        contribution_type=contribution_type, branch=branch,
+        date=date(2026, 2, 4), amount=Decimal(amount)
+    )
+    Expenditure.objects.create(
+        level='branch', branch=branch, category=category, title="Power",
+        amount=Decimal('10.00'), date=date(2026, 8, 9), status='pending'
+    )
+    return branch
+
+
+@pytest.mark.django_db
+class TestRollup:
+    def test_rolls_branches_up_every_level(self, hierarchy):
+        north, south, (n1, n2, s1) = hierarchy
+        branches = [Branch.objects.create(name=f"B{n}", code=f"B{n}", district=d) for n, d in enumerate([n1, n1, n2, s1])]
+
+        totals = rollup({branch.pk: {'amount': Decimal(n + 1)} for n, branch in enumerate(branches)})
+
+        assert totals.get('district', n1.pk) == {'amount': Decimal('3')}
+        assert totals.get('area', north.pk) == {'amount': Decimal('6')}
+        assert totals.get('area', south.pk) == {'amount': Decimal('4')}
+        assert totals.mission == {'amount': Decimal('10')}
+        assert totals.get('district', District.objects.create(name="Empty", code="E", area=south).pk) == {
+            'amount': Decimal('0.00')
+        }
+
+    def test_hierarchy_is_cached_and_refreshed_on_change(self, hierarchy, django_assert_num_queries):
+        north, south, (n1, n2, s1) = hierarchy
+        get_hierarchy()
+
+        with django_assert_num_queries(0):
+            get_hierarchy()
+
+        branch = Branch.objects.create(name="New", code="NEW", district=s1)
+        assert rollup({branch.pk: {'amount': 1}}, zero=0).get('area', south.pk) == {'amount': 1}
+
+    def test_period_financials_filters_months(self, hierarchy, tithe_type):
+        north, south, (n1, n2, s1) = hierarchy
+        add_branch(n1, tithe_type, 1, '100.00')
+        add_branch(s1, tithe_type, 2, '50.00')
+
+        year = period_financials(2026)
+        assert year.get('area', north.pk) == {
+            'total_contributions': Decimal('100.00'),
+            'total_expenditure': Decimal('10.00'),
+            'net_balance': Decimal('90.00'),
+        }
+        assert year.mission['net_balance'] == Decimal('130.00')
+
+        first_quarter = period_financials(2026, [1, 2, 3])
+        assert first_quarter.mission['total_expenditure'] == Decimal('0.00')
+        assert first_quarter.get('district', n2.pk)['net_balance'] == Decimal('0.00')
+
+
+@pytest.mark.django_db
+class TestAuditorFinancialReports:
+    @pytest.mark.parametrize('params', [
+        {'level': 'branch', 'period': 'yearly', 'year': '2026'},
+        {'level': 'branch', 'period': 'monthly', 'year': '2026', 'month': '2'},
+        {'level': 'district', 'period': 'quarterly', 'year': '2026', 'quarter': '1'},
+        {'level': 'area', 'period': 'yearly', 'year': '2026'},
+    ])
+    def test_queries_do_not_grow_with_branches(self, client, settings, hierarchy, tithe_type, params):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        north, south, districts = hierarchy
+        client.force_login(User.objects.create_superuser(member_id='00001', password='pass'))
+        add_branch(districts[0], tithe_type, 1, '100.00')
+        client.get(reverse('auditing:financial_reports'), params)  # warm session, settings and hierarchy caches
+
+        with CaptureQueriesContext(connection) as one_branch:
+            client.get(reverse('auditing:financial_reports'), params)
+
+        for n in range(2, 7):
+            add_branch(districts[n % 3], tithe_type, n, '100.00')
+        client.get(reverse('auditing:financial_reports'), params)
+
+        with CaptureQueriesContext(connection) as six_branches:
+            response = client.get(reverse('auditing:financial_reports'), params)
+
+        # Only reads are counted: the session write-back depends on timing
+        def data_queries(captured):
+            return [q for q in captured.captured_queries if q['sql'].startswith('SELECT')]
+
+        assert response.status_code == 200
+        assert len(data_queries(six_branches)) == len(data_queries(one_branch))
+
+    def test_district_rows_match_raw_totals(self, client, settings, hierarchy, tithe_type):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        north, south, (n1, n2, s1) = hierarchy
+        client.force_login(User.objects.create_superuser(member_id='00001', password='pass'))
+        add_branch(n1, tithe_type, 1, '100.00')
+        add_branch(n1, tithe_type, 2, '40.00')
+
+        response = client.get(reverse('auditing:financial_reports'), {
+            'level': 'district', 'period': 'yearly', 'year': '2026'
+        })
+
+        reports = response.context['reports']
+        assert [r['entity_name'] for r in reports] == ["North One (North)"]
+        assert reports[0]['total_contributions'] == Decimal('140.00')
+        assert reports[0]['net_balance'] == Decimal('120.00')
@@ -0,0 +1,64 @@
+import time
+from io import StringIO
+
+import pytest
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from core.middleware import SESSION_SAVED_AT_KEY
+
+
+@pytest.fixture
+def member_client(client):
+    client.force_login(User.objects.create_user(member_id='00002', password='pass', role='member'))
+    client.get(reverse('core:notifications_api'))
+    return client
+
+
+def session_writes(captured):
+    return [
+        q for q in captured.captured_queries
+        if 'django_session' in q['sql'] and not q['sql'].startswith('SELECT')
+    ]
+
+
+@pytest.mark.django_db
+class TestSessionRefresh:
+    def test_requests_do_not_write_the_session(self, member_client):
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(5):
+                response = member_client.get(reverse('core:notifications_api'))
+
+        assert response.status_code == 200
+        assert not session_writes(captured)
+        assert settings.SESSION_COOKIE_NAME not in response.cookies
+
+    def test_session_near_expiry_is_saved_again(self, member_client):
+        session = member_client.session
+        stale = int(time.time()) - settings.SESSION_COOKIE_AGE + settings.SESSION_REFRESH_WINDOW - 1
+        session[SESSION_SAVED_AT_KEY] = stale
+        session.save()
+
+        with CaptureQueriesContext(connection) as captured:
+            response = member_client.get(reverse('core:notifications_api'))
+
+        assert session_writes(captured)
+        assert response.cookies[settings.SESSION_COOKIE_NAME]['max-age'] == settings.SESSION_COOKIE_AGE
+        assert member_client.session[SESSION_SAVED_AT_KEY] > stale
+
+
+@pytest.mark.django_db
+def test_benchmark_reports_writes_per_request():
+    out = StringIO()
+
+    call_command('benchmark_sessions', requests=3, stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert '1.00 session writes/request' in lines[1]
+    assert '0.00 session writes/request' in lines[2]
+    assert not User.objects.filter(member_id='BENCH-SESSIONS').exists()
@@ -0,0 +1,79 @@
+import pytest
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from core.models import SiteSettings
+from core.cache import invalidate_tags
+from core.settings_cache import get_site_settings, invalidate_site_settings
+from core.templatetags.core_tags import currency
+
+
+@pytest.fixture(autouse=True)
+def fresh_site_settings(django_capture_on_commit_callbacks):
+    # Test transactions roll back without signals, so drop this process's copy too
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_site_settings()
+    yield
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_site_settings()
+
+
+def settings_queries(captured):
+    return [q for q in captured.captured_queries if 'core_sitesettings' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestSettingsCache:
+    def test_loaded_once_per_process(self):
+        get_site_settings()
+
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(3):
+                assert currency(5) == 'GH₵ 5.00'
+            get_site_settings()
+
+        assert not captured.captured_queries
+
+    def test_steady_state_requests_run_no_settings_queries(self, client, settings):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        client.force_login(User.objects.create_user(member_id='00002', password='pass', role='member'))
+        client.get(reverse('core:dashboard'))
+
+        with CaptureQueriesContext(connection) as captured:
+            client.get(reverse('core:dashboard'))
+            client.get(reverse('core:manifest'))
+
+        assert not settings_queries(captured)
+
+    def test_save_reloads_the_settings(self, django_capture_on_commit_callbacks):
+        site_settings = SiteSettings.get_settings()
+        assert get_site_settings().currency_symbol == 'GH₵'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            site_settings.currency_symbol = '$'
+            site_settings.save()
+
+        assert currency(5) == '$ 5.00'
+
+    def test_other_process_saves_are_seen(self):
+        get_site_settings()
+        # Another process saved: the row changed and the shared stamp moved on
+        SiteSettings.objects.update(site_name='Renamed')
+        invalidate_tags('namespace:site-settings')
+
+        assert get_site_settings().site_name == 'Renamed'
+
+    def test_maintenance_mode_blocks_members(self, client, settings, django_capture_on_commit_callbacks):
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        client.force_login(User.objects.create_user(member_id='00002', password='pass', role='member'))
+        assert client.get(reverse('core:dashboard')).status_code == 200
+
+        with django_capture_on_commit_callbacks(execute=True):
+            site_settings = SiteSettings.get_settings()
+            site_settings.maintenance_mode = True
+            site_settings.save()
+
+        assert client.get(reverse('core:dashboard')).status_code == 503
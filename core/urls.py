@@ -8,6 +8,7 @@ from . import views_assets
 from . import monthly_closing_views
 from . import archive_views
 from . import ledger_views
+from . import dashboard_widget_views
 
 app_name = 'core'
 
@@ -25,6 +26,8 @@ urlpatterns = [
     path('dashboard/pastor/', views.pastor_dashboard, name='pastor_dashboard'),
     path('dashboard/staff/', views.staff_dashboard, name='staff_dashboard'),
     path('dashboard/member/', views.member_dashboard, name='member_dashboard'),
+    path('dashboard/refresh/', views.refresh_dashboard, name='refresh_dashboard'),
+    path('api/dashboard/widgets/<slug:widget>/', dashboard_widget_views.dashboard_widget, name='dashboard_widget'),
     
     # Search
     path('search/', views.search, name='search'),
@@ -117,6 +120,7 @@ urlpatterns = [
     path('ledger/branch/<uuid:branch_id>/', ledger_views.branch_financial_position, name='branch_financial_position'),
     path('ledger/outstanding/', ledger_views.outstanding_remittances, name='outstanding_remittances'),
     path('ledger/audit-trail/', ledger_views.ledger_audit_trail, name='ledger_audit_trail'),
+    path('ledger/outbox/', ledger_views.ledger_outbox_status, name='ledger_outbox_status'),
     path('ledger/branch/<uuid:branch_id>/contributions/', ledger_views.branch_contributions_readonly, name='branch_contributions_readonly'),
     path('api/ledger/balance/', ledger_views.api_ledger_balance, name='api_ledger_balance'),
 
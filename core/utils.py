@@ -8,7 +8,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from django.http import HttpResponse
 from django.utils import timezone
-from django.db.models import Sum, Count, Avg
+from django.db.models import Sum, Count, Avg, Q
 
 
 # ============ NOTIFICATION HELPERS ============
@@ -74,7 +74,11 @@ def notify_admins(branch, notification_type, title, message, link=''):
         )
     
     if notifications:
+        from .notification_context_processor import invalidate_notification_counts
         Notification.objects.bulk_create(notifications)
+        # bulk_create sends no signals
+        for notification in notifications:
+            invalidate_notification_counts(notification.recipient_id)
     
     return len(notifications)
 
@@ -253,34 +257,42 @@ def export_to_pdf(title, headers, data, filename, orientation='portrait'):
 
 # ============ BIRTHDAY/ANNIVERSARY HELPERS ============
 
-def get_upcoming_birthdays(branch=None, days=7):
-    """Get members with birthdays in the next N days."""
+def get_upcoming_birthdays(branch=None, days=7, users=None):
+    """
+    Get members with birthdays in the next N days.
+    
+    Birthdays are matched on month and day in the database, so only the
+    celebrants are loaded. `users` narrows the search to a queryset.
+    """
     from accounts.models import User
     
     today = date.today()
-    upcoming = []
-    
-    users = User.objects.filter(is_active=True)
+    upcoming = {}
+    for offset in range(days + 1):
+        day = today + timedelta(days=offset)
+        upcoming[(day.month, day.day)] = day
+    
+    if users is None:
+        users = User.objects.all()
+    users = users.filter(is_active=True)
     if branch:
         users = users.filter(branch=branch)
     
-    for user in users.select_related('branch'):
-        if user.date_of_birth:
-            # Check if birthday falls within next N days
-            bday_this_year = user.date_of_birth.replace(year=today.year)
-            if bday_this_year < today:
-                bday_this_year = bday_this_year.replace(year=today.year + 1)
-            
-            days_until = (bday_this_year - today).days
-            if 0 <= days_until <= days:
-                upcoming.append({
-                    'user': user,
-                    'date': bday_this_year,
-                    'days_until': days_until,
-                    'age': today.year - user.date_of_birth.year
-                })
-    
-    return sorted(upcoming, key=lambda x: x['days_until'])
+    matches = Q()
+    for month, day in upcoming:
+        matches |= Q(date_of_birth__month=month, date_of_birth__day=day)
+    
+    birthdays = []
+    for user in users.filter(matches).select_related('branch'):
+        bday = upcoming[(user.date_of_birth.month, user.date_of_birth.day)]
+        birthdays.append({
+            'user': user,
+            'date': bday,
+            'days_until': (bday - today).days,
+            'age': today.year - user.date_of_birth.year
+        })
+    
+    return sorted(birthdays, key=lambda x: x['days_until'])
 
 
 def get_upcoming_anniversaries(branch=None, days=7):
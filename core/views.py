@@ -7,10 +7,9 @@ from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.db.models import Sum, Count, Q, Avg
+from django.db.models import Sum, Count, Q
 from django.utils import timezone
 from django.http import JsonResponse, HttpResponse
-from datetime import datetime, timedelta
 
 from .models import Area, District, Branch, SiteSettings, FiscalYear
 
@@ -50,61 +49,28 @@ def dashboard(request):
 @login_required
 def mission_dashboard(request):
     """Dashboard for Mission Admin."""
-    from contributions.models import Contribution, Remittance
-    from expenditure.models import Expenditure
-    from accounts.models import User
     from attendance.models import WeeklyAttendance
+    from core.dashboard_cache import MISSION_SCOPE
+    from core.dashboard_snapshots import get_snapshot
     
     # DEPRECATED: Year-as-state architecture - Use current year date range instead of fiscal year
     current_year = timezone.now().year
-    from_date = datetime(current_year, 1, 1).date()
-    to_date = datetime(current_year, 12, 31).date()
-    today = timezone.now().date()
-    month_start = today.replace(day=1)
     
     # Get current week's attendance
     weekly_attendance = WeeklyAttendance.get_current_week()
     
-    # Get pending remittances with branch info
-    pending_remittances_list = Remittance.objects.filter(
-        status__in=['pending', 'sent']
-    ).select_related('branch')[:5]
+    # Counts and totals come from the precomputed Mission snapshot
+    snapshot = get_snapshot(MISSION_SCOPE)
     
     # Statistics
     context = {
-        'total_branches': Branch.objects.filter(is_active=True).count(),
-        'total_districts': District.objects.filter(is_active=True).count(),
-        'total_areas': Area.objects.filter(is_active=True).count(),
-        'total_members': User.objects.filter(is_active=True).count(),
-        'total_pastors': User.objects.filter(role='pastor', is_active=True).count(),
-        
-        # Financial summaries - use date filtering instead of fiscal year
-        'monthly_contributions': Contribution.objects.filter(
-            date__gte=month_start
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        
-        'monthly_expenditure': Expenditure.objects.filter(
-            date__gte=month_start
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        
-        'pending_remittances': Remittance.objects.filter(
-            status__in=['pending', 'sent']
-        ).count(),
-        
-        'pending_remittances_list': pending_remittances_list,
-        
-        # Recent activities
-        'recent_contributions': Contribution.objects.select_related(
-            'branch', 'contribution_type', 'member'
-        ).order_by('-created_at')[:10],
-        
-        'recent_branches': Branch.objects.filter(is_active=True).select_related(
-            'district__area', 'pastor'
-        ).order_by('-created_at')[:5],
-        
         'current_year': current_year,  # Use current year instead of fiscal year object
         'weekly_attendance': weekly_attendance,
+        'snapshot': snapshot,
     }
+    context.update(snapshot.data)
+    # Pending remittances and recent contributions are loaded as dashboard
+    # widgets after the page paints (see core.dashboard_widget_views)
     
     # Add PIN change modal context
     context.update(get_pin_change_context(request))
@@ -115,10 +81,8 @@ def mission_dashboard(request):
 @login_required
 def area_dashboard(request):
     """Dashboard for Area Executive."""
-    from contributions.models import Contribution, Remittance
-    from expenditure.models import Expenditure
-    from accounts.models import User
     from attendance.models import WeeklyAttendance
+    from core.dashboard_snapshots import get_snapshot
     
     user = request.user
     area = user.managed_area
@@ -127,134 +91,36 @@ def area_dashboard(request):
         messages.warning(request, 'No area assigned to your account.')
         return redirect('core:dashboard')
     
-    # Get current date ranges
-    today = timezone.now().date()
-    month_start = today.replace(day=1)
-    year_start = today.replace(month=1, day=1)
-    
     # Get districts and branches in this area
-    districts = District.objects.filter(area=area, is_active=True)
+    districts = District.objects.filter(area=area, is_active=True).annotate(branch_total=Count('branches'))
     # Get branches in this area
     branches = Branch.objects.filter(district__area=area, is_active=True)
     
-    # Calculate total members in area
-    total_members = User.objects.filter(
-        branch__district__area=area,
-        is_active=True,
-        role='member'
-    ).count()
+    # Figures come from the precomputed area snapshot (see core.dashboard_snapshots)
+    snapshot = get_snapshot(f'area:{area.pk}')
+    figures = snapshot.data
+    for district in districts:
+        district.member_total = figures['district_members'].get(str(district.pk), 0)
     
-    # Get financial data for the area
-    monthly_contributions = Contribution.objects.filter(
-        branch__district__area=area,
-        date__gte=month_start
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    yearly_contributions = Contribution.objects.filter(
-        branch__district__area=area,
-        date__gte=year_start
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    monthly_expenditure = Expenditure.objects.filter(
-        branch__district__area=area,
-        date__gte=month_start,
-        status__in=['approved', 'paid']
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    # Get pending remittances from branches in this area
-    pending_remittances = Remittance.objects.filter(
-        branch__district__area=area,
-        status__in=['pending', 'sent']
-    ).count()
-    
-    # Get recent activities in the area
-    recent_contributions = Contribution.objects.filter(
-        branch__district__area=area
-    ).select_related(
-        'branch', 'contribution_type', 'member'
-    ).order_by('-created_at')[:10]
-    
-    # Get branch performance data
-    branch_performance = []
-    for branch in branches:
-        branch_contributions = Contribution.objects.filter(
-            branch=branch,
-            date__gte=month_start
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Get attendance data for this branch
-        from attendance.models import AttendanceSession
-        branch_attendance = AttendanceSession.objects.filter(
-            branch=branch,
-            date__gte=month_start
-        ).aggregate(
-            total=Sum('total_attendance'),
-            avg=Avg('total_attendance'),
-            count=Count('id')
-        )
-        
-        branch_performance.append({
-            'branch': branch,
-            'monthly_total': branch_contributions,
-            'member_count': User.objects.filter(
-                branch=branch,
-                is_active=True,
-                role='member'
-            ).count(),
-            'attendance_total': branch_attendance['total'] or 0,
-            'attendance_avg': round(branch_attendance['avg'] or 0, 1),
-            'attendance_count': branch_attendance['count'] or 0,
-        })
-    
-    # Sort by monthly contributions
-    branch_performance.sort(key=lambda x: x['monthly_total'], reverse=True)
-    
-    # Get weekly attendance by branch
-    from attendance.models import AttendanceSession
-    week_start = today - timedelta(days=today.weekday())
-    week_branch_attendance = []
-    
-    for branch in branches[:10]:  # Limit to top 10 branches
-        week_sessions = AttendanceSession.objects.filter(
-            branch=branch,
-            date__gte=week_start,
-            date__lte=today
-        ).order_by('-date')
-        
-        if week_sessions.exists():
-            total_week_attendance = week_sessions.aggregate(total=Sum('total_attendance'))['total'] or 0
-            week_branch_attendance.append({
-                'branch': branch,
-                'sessions': week_sessions,
-                'total_attendance': total_week_attendance,
-                'avg_attendance': round(total_week_attendance / week_sessions.count(), 1) if week_sessions.count() > 0 else 0
-            })
-    
-    week_branch_attendance.sort(key=lambda x: x['avg_attendance'], reverse=True)
+    # Branch performance, recent contributions and this week's attendance are
+    # loaded as dashboard widgets after the page paints (see core.dashboard_widget_views)
     
     context = {
         'area': area,
         'districts': districts,
         'branches': branches,
         'branch_count': branches.count(),
-        'total_members': total_members,
+        'total_members': figures['total_members'],
         
         # Financial data
-        'monthly_contributions': monthly_contributions,
-        'yearly_contributions': yearly_contributions,
-        'monthly_expenditure': monthly_expenditure,
-        'pending_remittances': pending_remittances,
-        
-        # Performance data
-        'branch_performance': branch_performance[:10],  # Top 10 branches
-        'recent_contributions': recent_contributions,
-        
-        # Attendance data
-        'week_branch_attendance': week_branch_attendance,
-        'current_week_start': week_start,
+        'monthly_contributions': figures['monthly_contributions'],
+        'yearly_contributions': figures['yearly_contributions'],
+        'monthly_expenditure': figures['monthly_expenditure'],
+        'pending_remittances': figures['pending_remittances'],
         
         # Current week attendance
         'weekly_attendance': WeeklyAttendance.get_current_week(),
+        'snapshot': snapshot,
     }
     
     # Add PIN change modal context
@@ -266,11 +132,7 @@ def area_dashboard(request):
 @login_required
 def district_dashboard(request):
     """Dashboard for District Executive."""
-    from contributions.models import Contribution, Remittance
-    from expenditure.models import Expenditure
-    from accounts.models import User
-    from attendance.models import AttendanceSession
-    from datetime import timedelta
+    from core.dashboard_snapshots import get_snapshot
     
     user = request.user
     district = user.managed_district
@@ -279,110 +141,29 @@ def district_dashboard(request):
         messages.warning(request, 'No district assigned to your account.')
         return redirect('core:dashboard')
     
-    # Get current date ranges
-    today = timezone.now().date()
-    month_start = today.replace(day=1)
-    week_start = today - timedelta(days=today.weekday())
-    
     # Get branches in this district
-    branches = Branch.objects.filter(district=district, is_active=True)
-    
-    # Calculate statistics
-    total_members = User.objects.filter(
-        branch__district=district,
-        is_active=True,
-        role='member'
-    ).count()
-    
-    # Financial data
-    monthly_contributions = Contribution.objects.filter(
-        branch__district=district,
-        date__gte=month_start
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    monthly_expenditure = Expenditure.objects.filter(
-        branch__district=district,
-        date__gte=month_start,
-        status__in=['approved', 'paid']
-    ).aggregate(total=Sum('amount'))['total'] or 0
-    
-    pending_remittances = Remittance.objects.filter(
-        branch__district=district,
-        status__in=['pending', 'sent']
-    ).count()
-    
-    # Get branch performance with attendance
-    branch_performance = []
-    for branch in branches:
-        branch_contributions = Contribution.objects.filter(
-            branch=branch,
-            date__gte=month_start
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Get attendance data for this branch
-        branch_attendance = AttendanceSession.objects.filter(
-            branch=branch,
-            date__gte=month_start
-        ).aggregate(
-            total=Sum('total_attendance'),
-            avg=Avg('total_attendance'),
-            count=Count('id')
-        )
-        
-        branch_performance.append({
-            'branch': branch,
-            'monthly_total': branch_contributions,
-            'member_count': User.objects.filter(
-                branch=branch,
-                is_active=True,
-                role='member'
-            ).count(),
-            'attendance_total': branch_attendance['total'] or 0,
-            'attendance_avg': round(branch_attendance['avg'] or 0, 1),
-            'attendance_count': branch_attendance['count'] or 0,
-        })
-    
-    # Sort by monthly contributions
-    branch_performance.sort(key=lambda x: x['monthly_total'], reverse=True)
-    
-    # Get weekly attendance by branch
-    week_branch_attendance = []
+    branches = list(Branch.objects.filter(district=district, is_active=True))
     
+    # Figures come from the precomputed district snapshot (see core.dashboard_snapshots)
+    snapshot = get_snapshot(f'district:{district.pk}')
+    figures = snapshot.data
     for branch in branches:
-        week_sessions = AttendanceSession.objects.filter(
-            branch=branch,
-            date__gte=week_start,
-            date__lte=today
-        ).order_by('-date')
-        
-        if week_sessions.exists():
-            total_week_attendance = week_sessions.aggregate(total=Sum('total_attendance'))['total'] or 0
-            week_branch_attendance.append({
-                'branch': branch,
-                'sessions': week_sessions,
-                'total_attendance': total_week_attendance,
-                'avg_attendance': round(total_week_attendance / week_sessions.count(), 1) if week_sessions.count() > 0 else 0
-            })
+        branch.active_members = figures['branch_members'].get(str(branch.pk), 0)
     
-    week_branch_attendance.sort(key=lambda x: x['avg_attendance'], reverse=True)
+    # Branch performance and this week's attendance are loaded as dashboard
+    # widgets after the page paints (see core.dashboard_widget_views)
     
     context = {
         'district': district,
         'branches': branches,
-        'branch_count': branches.count(),
-        'total_members': total_members,
+        'branch_count': len(branches),
+        'total_members': figures['total_members'],
         
         # Financial data
-        'monthly_contributions': monthly_contributions,
-        'monthly_expenditure': monthly_expenditure,
-        'pending_remittances': pending_remittances,
-        
-        # Performance data
-        'branch_performance': branch_performance,
-        
-        # Attendance data
-        'week_branch_attendance': week_branch_attendance,
-        'current_week_start': week_start,
+        'monthly_contributions': figures['monthly_contributions'],
+        'monthly_expenditure': figures['monthly_expenditure'],
+        'pending_remittances': figures['pending_remittances'],
+        'snapshot': snapshot,
     }
     
     # Add PIN change modal context
@@ -394,9 +175,7 @@ def district_dashboard(request):
 @login_required
 def branch_dashboard(request):
     """Dashboard for Branch Executive."""
-    from contributions.models import Contribution, Remittance
-    from expenditure.models import Expenditure
-    from attendance.models import AttendanceSession
+    from core.dashboard_snapshots import get_snapshot
     
     user = request.user
     branch = user.branch
@@ -405,57 +184,17 @@ def branch_dashboard(request):
         messages.warning(request, 'No branch assigned to your account.')
         return redirect('core:dashboard')
     
-    fiscal_year = FiscalYear.get_current()
-    today = timezone.now().date()
-    month_start = today.replace(day=1)
-    
-    # Last attendance - always show the most recent session
-    last_attendance_session = AttendanceSession.objects.filter(
-        branch=branch
-    ).order_by('-date').first()
-    
-    # Calculate absentees for last attendance
-    absentees_count = 0
-    if last_attendance_session:
-        absentees_count = max(0, branch.member_count - last_attendance_session.total_attendance)
+    # Attendance and monthly figures come from the precomputed branch snapshot
+    # (see core.dashboard_snapshots)
+    snapshot = get_snapshot(f'branch:{branch.pk}')
     
     context = {
         'branch': branch,
-        'total_members': branch.member_count,
-        
-        # Financial
-        'monthly_contributions': Contribution.objects.filter(
-            branch=branch,
-            date__gte=month_start,
-            fiscal_year=fiscal_year
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        
-        'monthly_expenditure': Expenditure.objects.filter(
-            branch=branch,
-            date__gte=month_start,
-            fiscal_year=fiscal_year
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        
         'local_balance': branch.local_balance,
         'tithe_target': branch.monthly_tithe_target,
-        
-        # Last attendance - always show the most recent session
-        'last_attendance': last_attendance_session,
-        
-        # Calculate absentees for last attendance
-        'absentees_count': absentees_count,
-        
-        # Recent attendance
-        'recent_attendance': AttendanceSession.objects.filter(
-            branch=branch
-        ).order_by('-date')[:5],
-        
-        # Pending remittance
-        'pending_remittance': Remittance.objects.filter(
-            branch=branch,
-            status='pending'
-        ).first(),
+        'snapshot': snapshot,
     }
+    context.update(snapshot.data)
     
     # Add PIN change modal context
     context.update(get_pin_change_context(request))
@@ -463,6 +202,22 @@ def branch_dashboard(request):
     return render(request, 'core/dashboards/branch_dashboard.html', context)
 
 
+@login_required
+def refresh_dashboard(request):
+    """Rebuild the dashboard snapshots now instead of waiting for the schedule."""
+    from core.dashboard_snapshots import refresh_dashboard_snapshots
+    
+    if not request.user.is_any_admin:
+        messages.error(request, 'Access denied.')
+        return redirect('core:dashboard')
+    
+    if request.method == 'POST':
+        refresh_dashboard_snapshots()
+        messages.success(request, 'Dashboard figures refreshed.')
+    
+    return redirect('core:dashboard')
+
+
 @login_required
 def auditor_dashboard(request):
     """Dashboard for Auditor / Board of Trustees."""
@@ -471,6 +226,9 @@ def auditor_dashboard(request):
     from auditing.models import AuditFlag, AuditLog
     from payroll.models import PayrollRun, PaySlip
     from reports.models import MonthlyReport
+    from core.cache import month_tag
+    from core.dashboard_cache import cached_fragment, MISSION_SCOPE
+    from core.financial_helpers import branch_subquery_sum
     
     fiscal_year = FiscalYear.get_current()
     today = timezone.now().date()
@@ -485,29 +243,38 @@ def auditor_dashboard(request):
     total_due = sum(r.mission_remittance_balance for r in monthly_reports if r.mission_remittance_balance > 0)
     overdue_reports = [r for r in monthly_reports if r.is_overdue]
     
-    context = {
-        # Financial Overview
-        'total_contributions': Contribution.objects.filter(
-            date__gte=month_start,
-            fiscal_year=fiscal_year
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        
-        'total_expenditure': Expenditure.objects.filter(
-            date__gte=month_start,
-            fiscal_year=fiscal_year
-        ).aggregate(total=Sum('amount'))['total'] or 0,
-        
-        'net_balance': ((Contribution.objects.filter(
+    # Mission-wide figures are cached per data version of the Mission scope and month
+    def auditor_finances():
+        total_contributions = Contribution.objects.filter(
             date__gte=month_start,
             fiscal_year=fiscal_year
-        ).aggregate(total=Sum('amount'))['total'] or 0) - 
-        (Expenditure.objects.filter(
+        ).aggregate(total=Sum('amount'))['total'] or 0
+        total_expenditure = Expenditure.objects.filter(
             date__gte=month_start,
             fiscal_year=fiscal_year
-        ).aggregate(total=Sum('amount'))['total'] or 0)),
+        ).aggregate(total=Sum('amount'))['total'] or 0
         
+        return {
+            # Financial Overview
+            'total_contributions': total_contributions,
+            'total_expenditure': total_expenditure,
+            'net_balance': total_contributions - total_expenditure,
+            
+            'pending_remittances': Remittance.objects.filter(
+                status__in=['pending', 'sent']
+            ).count(),
+            
+            # Branch Performance - one subquery per figure, so the two sums
+            # do not multiply each other through a double join
+            'branches': list(Branch.objects.filter(is_active=True).annotate(
+                contribution_total=branch_subquery_sum(Contribution.objects.all(), 'amount'),
+                expenditure_total=branch_subquery_sum(Expenditure.objects.all(), 'amount')
+            ).order_by('-contribution_total')[:10]),
+        }
+    
+    context = {
         # Monthly Reports
-        'monthly_reports_count': monthly_reports.count(),
+        'monthly_reports_count': len(monthly_reports),
         'total_due': total_due,
         'overdue_count': len(overdue_reports),
         'overdue_amount': sum(r.mission_remittance_balance for r in overdue_reports),
@@ -521,20 +288,14 @@ def auditor_dashboard(request):
         ).aggregate(total=Sum('net_pay'))['total'] or 0,
         
         # Audit
-        'pending_remittances': Remittance.objects.filter(
-            status__in=['pending', 'sent']
-        ).count(),
         'flags_count': AuditFlag.objects.filter(status='open').count(),
         'recent_logs': AuditLog.objects.select_related('user').order_by('-timestamp')[:10],
         
-        # Branch Performance
-        'branches': Branch.objects.filter(is_active=True).annotate(
-            contribution_total=Sum('contributions__amount'),
-            expenditure_total=Sum('expenditures__amount')
-        ).order_by('-contribution_total')[:10],
-        
         'fiscal_year': fiscal_year,
     }
+    context.update(cached_fragment(
+        MISSION_SCOPE, f'auditor_finances:{month_start}', auditor_finances, tags=[month_tag(month_start)]
+    ))
     
     # Add PIN change modal context
     context.update(get_pin_change_context(request))
@@ -1663,8 +1424,9 @@ def calendar_manage(request):
 def manifest_json(request):
     """Serve PWA manifest.json for iOS, Android, and Desktop."""
     from django.http import JsonResponse
+    from core.settings_cache import get_site_settings
 
-    settings_obj = SiteSettings.get_settings()
+    settings_obj = get_site_settings()
 
     # Build absolute URLs for icons
     scheme = 'https' if request.is_secure() else 'http'
@@ -1910,7 +1672,10 @@ def notifications_list(request):
     if request.method == 'POST':
         action = request.POST.get('action')
         if action == 'mark_all_read':
+            from .notification_context_processor import invalidate_notification_counts
             notifications.filter(is_read=False).update(is_read=True, read_at=timezone.now())
+            # update() sends no signals
+            invalidate_notification_counts(request.user.pk)
             messages.success(request, 'All notifications marked as read.')
             return redirect('core:notifications')
         elif action == 'mark_read':
@@ -2728,7 +2493,11 @@ def data_backup(request):
     from announcements.models import Announcement, Event
     from sermons.models import Sermon
     from members.models import DeceasedMember
-    from core.ledger_models import LedgerEntry
+    from core.ledger_models import (
+        LedgerEntry, LedgerBalance, LedgerCheckpoint, LedgerEntryArchive, LedgerArchivedYear
+    )
+    from core.ledger_service import LedgerService
+    from core.financial_summaries import rebuild_all_summaries
     
     if not request.user.is_mission_admin:
         messages.error(request, 'Access denied.')
@@ -2778,6 +2547,8 @@ def data_backup(request):
                 backup_data['prayer_requests'] = json.loads(serializers.serialize('json', PrayerRequest.objects.all()))
                 backup_data['visitors'] = json.loads(serializers.serialize('json', Visitor.objects.all()))
                 backup_data['ledger_entries'] = json.loads(serializers.serialize('json', LedgerEntry.objects.all()))
+                backup_data['ledger_archive_entries'] = json.loads(serializers.serialize('json', LedgerEntryArchive.objects.all()))
+                backup_data['ledger_archived_years'] = json.loads(serializers.serialize('json', LedgerArchivedYear.objects.all()))
                 backup_data['utility_bills'] = json.loads(serializers.serialize('json', UtilityBill.objects.all()))
                 backup_data['welfare_payments'] = json.loads(serializers.serialize('json', WelfarePayment.objects.all()))
                 backup_data['assets'] = json.loads(serializers.serialize('json', Asset.objects.all()))
@@ -2858,6 +2629,10 @@ def data_backup(request):
                             PrayerRequest.objects.all().delete()
                             Visitor.objects.all().delete()
                             LedgerEntry.objects.all().delete()
+                            LedgerEntryArchive.objects.all().delete()
+                            LedgerArchivedYear.objects.all().delete()
+                            LedgerBalance.objects.all().delete()
+                            LedgerCheckpoint.objects.all().delete()
                             UtilityBill.objects.all().delete()
                             WelfarePayment.objects.all().delete()
                             Asset.objects.all().delete()
@@ -3397,6 +3172,7 @@ def data_backup(request):
                             restored_items.append(f'{count} Visitors')
                     
                     # Restore LedgerEntry
+                    ledger_restored = False
                     if 'ledger_entries' in backup_data:
                         count = 0
                         for item in serializers.deserialize('json', json.dumps(backup_data['ledger_entries'])):
@@ -3409,6 +3185,35 @@ def data_backup(request):
                                     errors.append(f'LedgerEntry: {str(e)}')
                         if count > 0:
                             restored_items.append(f'{count} Ledger Entries')
+                            ledger_restored = True
+                    
+                    # Restore archived ledger years
+                    if 'ledger_archive_entries' in backup_data:
+                        count = 0
+                        for item in serializers.deserialize('json', json.dumps(backup_data['ledger_archive_entries'])):
+                            if not LedgerEntryArchive.objects.filter(pk=item.object.pk).exists():
+                                try:
+                                    with transaction.atomic():
+                                        item.save()
+                                        count += 1
+                                except Exception as e:
+                                    errors.append(f'LedgerEntryArchive: {str(e)}')
+                        if count > 0:
+                            restored_items.append(f'{count} Archived Ledger Entries')
+                            ledger_restored = True
+                    if 'ledger_archived_years' in backup_data:
+                        for item in serializers.deserialize('json', json.dumps(backup_data['ledger_archived_years'])):
+                            if not LedgerArchivedYear.objects.filter(year=item.object.year).exists():
+                                try:
+                                    with transaction.atomic():
+                                        item.save()
+                                except Exception as e:
+                                    errors.append(f'LedgerArchivedYear: {str(e)}')
+                    
+                    if ledger_restored:
+                        # Deserialized saves bypass LedgerEntry.save(), so rebuild balances
+                        LedgerService.rebuild_balances()
+                        LedgerService.rebuild_checkpoints()
                     
                     # Restore UtilityBill
                     if 'utility_bills' in backup_data:
@@ -3731,6 +3536,10 @@ def data_backup(request):
                                     errors.append(f'Sermon: {str(e)}')
                         if count > 0:
                             restored_items.append(f'{count} Sermons')
+                    
+                    if restored_items:
+                        # Deserialized saves bypass the summary signals, so rebuild the monthly summaries
+                        rebuild_all_summaries()
                 
                 # Report results to user
                 if restored_items:
@@ -2,6 +2,7 @@
 Expenditure Views
 """
 
+import logging
 from decimal import Decimal
 from datetime import datetime
 from django.shortcuts import render, redirect, get_object_or_404
@@ -11,8 +12,11 @@ from django.core.paginator import Paginator
 from django.utils import timezone
 from django.db.models import Q
 
+from core.ledger_service import LedgerService, InsufficientFundsError
 from .models import Expenditure, ExpenditureCategory, UtilityBill, WelfarePayment, Asset
 
+logger = logging.getLogger(__name__)
+
 
 def check_spending_allowed(level, branch=None, amount=None):
     """
@@ -21,32 +25,25 @@ def check_spending_allowed(level, branch=None, amount=None):
     CRITICAL: Mission can ONLY spend CASH, not RECEIVABLE.
     Branch can only spend their spendable amount (cash - payables).
     
+    Reads the materialized balance rows, so it is cheap enough for form
+    display. It is only advisory: the authoritative check happens under a
+    row lock in LedgerService.reserve_and_post_expenditure. Fails closed when
+    the ledger cannot be read.
+    
     Returns: (allowed: bool, message: str, available: Decimal)
     """
+    if level not in ('mission', 'branch') or (level == 'branch' and not branch):
+        return False, "No spending account selected", Decimal('0')
+    
     try:
-        from core.ledger_service import LedgerService
-        
-        if amount:
-            amount = Decimal(str(amount))
-        
-        if level == 'mission':
-            cash = LedgerService.get_mission_cash_balance()
-            if amount and amount > cash:
-                return False, f"Insufficient Mission cash. Available: GH₵{cash:.2f}", cash
-            return True, "OK", cash
-        elif level == 'branch' and branch:
-            spendable = LedgerService.get_branch_spendable_cash(branch)
-            if amount and amount > spendable:
-                return False, f"Insufficient branch funds. Spendable: GH₵{spendable:.2f}", spendable
-            return True, "OK", spendable
-        
-        return True, "OK", Decimal('0')
+        available = LedgerService.get_spendable(level, branch)
     except Exception as e:
-        # If ledger system fails, allow spending but log warning
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.warning(f"Ledger check failed: {e}")
-        return True, "OK (ledger check unavailable)", Decimal('0')
+        logger.exception(f"Ledger check failed: {e}")
+        return False, "Ledger balance unavailable, please try again later", Decimal('0')
+    
+    if amount and Decimal(str(amount)) > available:
+        return False, str(InsufficientFundsError(level, available)), available
+    return True, "OK", available
 
 
 @login_required
@@ -251,19 +248,28 @@ def expenditure_add(request):
                     )
                     return redirect('expenditure:add')
             
-            expenditure = Expenditure.objects.create(
+            if not branch:
+                messages.error(request, 'Select the branch the expenditure is paid from.')
+                return redirect('expenditure:add')
+            
+            # Branch spendable funds are checked and posted under a lock
+            LedgerService.reserve_and_post_expenditure(
+                'branch',
+                amount,
+                branch=branch,
                 category_id=category_id,
-                amount=amount,
                 date=exp_date,
                 title=description[:200] if description else 'Expenditure',
                 description=description,
                 reference_number=reference,
-                branch=branch,
                 contribution_type_id=contribution_type_id,
                 created_by=request.user
             )
             messages.success(request, f'Expenditure of GH₵{amount} recorded successfully.')
             return redirect('expenditure:list')
+        except InsufficientFundsError as e:
+            messages.error(request, f'Cannot record expenditure: {e}. Branch can only spend retained funds (cash minus payables to Mission).')
+            return redirect('expenditure:add')
         except Exception as e:
             messages.error(request, f'Error: {str(e)}')
     
@@ -760,29 +766,27 @@ def add_mission_expenditure(request):
         vendor = request.POST.get('vendor', '')
         payment_reference = request.POST.get('payment_reference', '')
         
-        # CRITICAL: Check if Mission has sufficient CASH (not receivables)
-        allowed, msg, _ = check_spending_allowed('mission', amount=amount)
-        if not allowed:
-            messages.error(request, f'Cannot record expenditure: {msg}. Mission can only spend physically received cash, not receivables.')
-            return redirect('expenditure:add_mission')
-        
         try:
-            expenditure = Expenditure.objects.create(
+            # CRITICAL: Mission can only spend CASH (not receivables); checked
+            # and posted under a lock on the Mission cash balance
+            LedgerService.reserve_and_post_expenditure(
+                'mission',
+                amount,
                 category_id=category_id,
-                amount=amount,
                 date=exp_date,
                 title=title or 'Mission Expenditure',
                 description=description,
                 reference_number=reference,
                 vendor=vendor,
                 payment_reference=payment_reference,
-                level='mission',
-                branch=None,
                 created_by=request.user,
                 status='approved'  # Auto-approve for mission admin
             )
             messages.success(request, f'Mission expenditure of GH₵{amount} recorded successfully.')
             return redirect('expenditure:mission_list')
+        except InsufficientFundsError as e:
+            messages.error(request, f'Cannot record expenditure: {e}. Mission can only spend physically received cash, not receivables.')
+            return redirect('expenditure:add_mission')
         except Exception as e:
             messages.error(request, f'Error: {str(e)}')
     
@@ -826,23 +830,18 @@ def add_branch_expenditure(request):
         try:
             branch = Branch.objects.get(pk=branch_id)
             
-            # Check if branch has sufficient spendable funds
-            allowed, msg, _ = check_spending_allowed('branch', branch=branch, amount=amount)
-            if not allowed:
-                messages.error(request, f'Cannot record expenditure: {msg}. Branch can only spend retained funds (cash minus payables to Mission).')
-                return redirect('expenditure:add_branch')
-            
-            expenditure = Expenditure.objects.create(
+            # Branch spendable funds are checked and posted under a lock
+            LedgerService.reserve_and_post_expenditure(
+                'branch',
+                amount,
+                branch=branch,
                 category_id=category_id,
-                amount=amount,
                 date=exp_date,
                 title=title or 'Branch Expenditure',
                 description=description,
                 reference_number=reference,
                 vendor=vendor,
                 payment_reference=payment_reference,
-                level='branch',
-                branch=branch,
                 created_by=request.user,
                 status='approved'  # Auto-approve for branch executive
             )
@@ -850,6 +849,9 @@ def add_branch_expenditure(request):
             return redirect('expenditure:branch_list')
         except Branch.DoesNotExist:
             messages.error(request, 'Branch not found.')
+        except InsufficientFundsError as e:
+            messages.error(request, f'Cannot record expenditure: {e}. Branch can only spend retained funds (cash minus payables to Mission).')
+            return redirect('expenditure:add_branch')
         except Exception as e:
             messages.error(request, f'Error: {str(e)}')
     
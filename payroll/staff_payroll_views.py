@@ -8,6 +8,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Sum, Q, Count
 from django.http import JsonResponse
+from django.db import transaction
 from django.utils import timezone
 from datetime import date
 from decimal import Decimal
@@ -16,7 +17,8 @@ import calendar
 from accounts.models import User
 from .models import StaffPayrollProfile, PayrollRun, PaySlip
 from core.models import FiscalYear
-from expenditure.models import Expenditure, ExpenditureCategory
+from core.ledger_service import LedgerService, InsufficientFundsError
+from expenditure.models import ExpenditureCategory
 
 
 @login_required
@@ -641,30 +643,33 @@ def payroll_processing(request):
                 # DEPRECATED: Year-as-state architecture - fiscal_year no longer assigned
                 # Payroll expenditures now use date-based filtering only
                 
-                for payslip in payslips:
-                    # Create expenditure record for audit trail
-                    Expenditure.objects.create(
-                        branch=payslip.staff.user.branch if payslip.staff.user.branch else None,
-                        # fiscal_year=fiscal_year,  # REMOVED: Use date filtering instead
-                        category=category,
-                        level='mission',
-                        amount=payslip.net_pay,
-                        date=payment_date,
-                        title=f'Salary - {payslip.staff.user.get_full_name()}',
-                        description=f'Salary payment for {calendar.month_name[payslip.payroll_run.month]} {payslip.payroll_run.year}',
-                        vendor=payslip.staff.user.get_full_name(),
-                        reference_number=payment_ref,
-                        status='approved',
-                        approved_by=request.user,
-                        approved_at=timezone.now(),
-                        notes=f'Payment method: Bank transfer. Payslip ID: {payslip.id}'
-                    )
-                    
-                    # Mark payslip as paid
-                    payslip.status = 'paid'
-                    payslip.payment_date = payment_date
-                    payslip.payment_reference = payment_ref
-                    payslip.save()
+                # All or nothing: Mission cash stays locked until the last salary is posted
+                with transaction.atomic():
+                    for payslip in payslips:
+                        # Create expenditure record for audit trail; Mission cash is
+                        # checked and posted under a lock
+                        LedgerService.reserve_and_post_expenditure(
+                            'mission',
+                            payslip.net_pay,
+                            branch=payslip.staff.user.branch if payslip.staff.user.branch else None,
+                            # fiscal_year=fiscal_year,  # REMOVED: Use date filtering instead
+                            category=category,
+                            date=payment_date,
+                            title=f'Salary - {payslip.staff.user.get_full_name()}',
+                            description=f'Salary payment for {calendar.month_name[payslip.payroll_run.month]} {payslip.payroll_run.year}',
+                            vendor=payslip.staff.user.get_full_name(),
+                            reference_number=payment_ref,
+                            status='approved',
+                            approved_by=request.user,
+                            approved_at=timezone.now(),
+                            notes=f'Payment method: Bank transfer. Payslip ID: {payslip.id}'
+                        )
+                        
+                        # Mark payslip as paid
+                        payslip.status = 'paid'
+                        payslip.payment_date = payment_date
+                        payslip.payment_reference = payment_ref
+                        payslip.save()
                 
                 success_msg = f'Marked {len(payslips)} payslips as paid.'
                 
@@ -691,6 +696,11 @@ def payroll_processing(request):
                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                     return JsonResponse({'success': False, 'message': error_msg})
                 messages.error(request, error_msg)
+            except InsufficientFundsError as e:
+                error_msg = f'Cannot pay salaries: {e}. No payslips were marked as paid.'
+                if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+                    return JsonResponse({'success': False, 'message': error_msg})
+                messages.error(request, error_msg)
             except Exception as e:
                 error_msg = f'Error marking payslips as paid: {str(e)}'
                 if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -725,12 +735,13 @@ def payroll_processing(request):
                     }
                 )
                 
-                # Create expenditure record for audit trail
-                Expenditure.objects.create(
+                # Create expenditure record for audit trail; Mission cash is
+                # checked and posted under a lock
+                LedgerService.reserve_and_post_expenditure(
+                    'mission',
+                    payslip.net_pay,
                     branch=payslip.staff.user.branch if payslip.staff.user.branch else None,
                     category=category,
-                    level='mission',
-                    amount=payslip.net_pay,
                     date=payment_date,
                     title=f'Salary - {payslip.staff.user.get_full_name()}',
                     description=f'Salary payment for {calendar.month_name[payslip.payroll_run.month]} {payslip.payroll_run.year}',
@@ -752,6 +763,8 @@ def payroll_processing(request):
                 messages.success(request, f'Payment processed for {payslip.staff.user.get_full_name()}')
             except PaySlip.DoesNotExist:
                 messages.error(request, 'Payslip not found or already paid.')
+            except InsufficientFundsError as e:
+                messages.error(request, f'Cannot pay salary: {e}')
             except Exception as e:
                 messages.error(request, f'Error processing payment: {str(e)}')
         
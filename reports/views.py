@@ -10,15 +10,19 @@ from django.db.models import Sum, Count, Q, Avg
 from django.utils import timezone
 from datetime import datetime, timedelta, date
 import calendar
+from collections import Counter
 from decimal import Decimal
 import json
 
 # Import correct financial calculation helpers
 from core.financial_helpers import (
-    get_branch_balance, get_expected_mission_due, get_mission_income,
+    get_mission_income,
     get_mission_obligations, get_local_only_contributions, get_mission_shared_contributions,
-    get_financial_summary
+    get_financial_summary, annotate_branch_financials, branch_subquery_count,
+    expected_mission_due_by_branch
 )
+from core.financial_summaries import branch_summary_totals, mission_summary_totals
+from core.rollups import rollup, merge_rows, group_by_branch
 
 
 @login_required
@@ -1043,27 +1047,26 @@ def comprehensive_statistics(request):
     total_kept_at_branches = total_contributions - actual_mission_income
     
     # Branch-level statistics using CORRECT financial logic
+    # All figures come from correlated subqueries, one query for every branch
+    branch_rows = annotate_branch_financials(branches.select_related('district'), from_date, to_date).annotate(
+        active_members=branch_subquery_count(
+            Member.objects.filter(user__is_active=True), branch_field='user__branch'
+        )
+    )
     branch_stats = []
-    for branch in branches:
-        # Use helper functions for correct calculations
-        branch_balance_data = get_branch_balance(branch, from_date, to_date)
-        expected_due = get_expected_mission_due(branch, from_date, to_date)
-        
-        # Get contribution breakdown
-        branch_contributions = contributions.filter(branch=branch)
-        branch_expenditures = expenditures.filter(branch=branch)
-        
-        branch_total_contrib = branch_contributions.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-        branch_total_exp = branch_expenditures.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+    for branch in branch_rows:
+        expected_due = branch.expected_mission_due
+        branch_total_contrib = branch.total_contributions
+        branch_total_exp = branch.total_expenditures
         
         # CORRECT: Branch balance excludes expected mission amounts, includes actual remittances only
-        branch_balance = branch_balance_data['branch_balance']
-        branch_actual_remitted = branch_balance_data['total_remitted']
+        branch_balance = branch.branch_balance
+        branch_actual_remitted = branch.total_remitted
         
         # Calculate amount kept at branch (actual cash position)
         branch_kept_at_branch = branch_balance  # This is the actual cash remaining
         
-        member_count = Member.objects.filter(user__branch=branch, user__is_active=True).count()
+        member_count = branch.active_members
         
         branch_stats.append({
             'branch': branch,
@@ -1082,50 +1085,53 @@ def comprehensive_statistics(request):
         })
     
     # District-level statistics (if not filtered to specific branch)
+    # Contribution totals come from the monthly summary rows; every district/area
+    # figure is grouped by branch and rolled up the hierarchy in memory
+    summary_months = [from_date.month] if month else None
+    
     district_stats = []
+    area_stats = []
     if not branch_id:
+        hierarchy_totals = rollup(merge_rows(
+            {
+                branch: {'total_contributions': row['total_contributions'], 'tithe_amount': row['total_tithe']}
+                for branch, row in branch_summary_totals(from_date.year, summary_months).items()
+            },
+            group_by_branch(expenditures, total_expenditures=Sum('amount')),
+            group_by_branch(
+                Member.objects.filter(user__is_active=True), branch_field='user__branch', total_members=Count('id')
+            ),
+            {branch.pk: {'branch_count': 1} for branch in branch_rows},
+        ), fields=['total_contributions', 'tithe_amount', 'total_expenditures', 'total_members', 'branch_count'])
+        
         for district in districts:
-            district_branches = branches.filter(district=district)
-            district_contributions = contributions.filter(branch__district=district)
-            district_expenditures = expenditures.filter(branch__district=district)
-            
-            district_total_contrib = district_contributions.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            district_total_exp = district_expenditures.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            district_tithe = district_contributions.filter(contribution_type__category='tithe').aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            district_remittance = district_tithe * Decimal('0.10')
+            district_totals = hierarchy_totals.get('district', district.pk)
             
             district_stats.append({
                 'district': district,
-                'total_contributions': district_total_contrib,
-                'total_expenditures': district_total_exp,
-                'tithe_amount': district_tithe,
-                'mission_remittance': district_remittance,
-                'branch_count': district_branches.count(),
-                'total_members': Member.objects.filter(user__branch__district=district, user__is_active=True).count()
+                'total_contributions': district_totals['total_contributions'],
+                'total_expenditures': district_totals['total_expenditures'],
+                'tithe_amount': district_totals['tithe_amount'],
+                'mission_remittance': district_totals['tithe_amount'] * Decimal('0.10'),
+                'branch_count': int(district_totals['branch_count']),
+                'total_members': int(district_totals['total_members'])
             })
     
     # Area-level statistics (if not filtered to specific district)
-    area_stats = []
     if not district_id and not branch_id:
         areas = Area.objects.filter(is_active=True)
+        district_counts = Counter(district.area_id for district in districts)
         for area in areas:
-            area_districts = districts.filter(area=area)
-            area_contributions = contributions.filter(branch__district__area=area)
-            area_expenditures = expenditures.filter(branch__district__area=area)
-            
-            area_total_contrib = area_contributions.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            area_total_exp = area_expenditures.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            area_tithe = area_contributions.filter(contribution_type__category='tithe').aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-            area_remittance = area_tithe * Decimal('0.10')
+            area_totals = hierarchy_totals.get('area', area.pk)
             
             area_stats.append({
                 'area': area,
-                'total_contributions': area_total_contrib,
-                'total_expenditures': area_total_exp,
-                'tithe_amount': area_tithe,
-                'mission_remittance': area_remittance,
-                'district_count': area_districts.count(),
-                'total_members': Member.objects.filter(user__branch__district__area=area, user__is_active=True).count()
+                'total_contributions': area_totals['total_contributions'],
+                'total_expenditures': area_totals['total_expenditures'],
+                'tithe_amount': area_totals['tithe_amount'],
+                'mission_remittance': area_totals['tithe_amount'] * Decimal('0.10'),
+                'district_count': district_counts[area.pk],
+                'total_members': int(area_totals['total_members'])
             })
     
     context = {
@@ -1441,9 +1447,9 @@ def export_statistics_excel(request):
 def final_financial_report(request):
     """Comprehensive Income vs Expenditure Final Financial Report."""
     from core.models import Area, District, Branch, FiscalYear, SiteSettings, MissionFinancialSummary, BranchFinancialSummary
-    from contributions.models import Contribution, ContributionType, Remittance
-    from expenditure.models import Expenditure, ExpenditureCategory
-    from payroll.models import PayrollRun, PaySlip
+    from contributions.models import ContributionType
+    from expenditure.models import ExpenditureCategory
+    from payroll.models import PaySlip
     from decimal import Decimal
     
     if not (request.user.is_mission_admin or request.user.is_auditor):
@@ -1471,35 +1477,21 @@ def final_financial_report(request):
     start_date = month_start.date()
     end_date = month_end.date()
     
-    mission_income_data = get_mission_income(start_date, end_date)
-    total_remittances = mission_income_data['total_income']
+    # Pre-aggregated monthly summary rows (maintained by core.summary_signals)
+    mission_summary = mission_summary_totals(year_int, [month_int])
+    total_remittances = mission_summary['total_remittances']
     
     # Other mission income (if any) - mission-level contributions only
-    mission_other_income = Contribution.objects.filter(
-        date__gte=start_date,
-        date__lte=end_date,
-        branch__isnull=True,  # Mission-level contributions only
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+    mission_other_income = mission_summary['total_other_income']
     
     total_mission_income = total_remittances + mission_other_income
     
     # ============ MISSION-LEVEL EXPENDITURE ============
     # Payroll
-    payroll_runs = PayrollRun.objects.filter(
-        month=month_int,
-        year=year_int
-    )
-    total_payroll = Decimal('0.00')
-    for run in payroll_runs:
-        total_payroll += run.total_net_pay or Decimal('0.00')
+    total_payroll = mission_summary['total_payroll']
     
     # Mission expenses
-    mission_expenses = Expenditure.objects.filter(
-        level='mission',
-        date__gte=month_start,
-        date__lte=month_end,
-        status__in=['approved', 'paid']
-    ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+    mission_expenses = mission_summary['total_mission_expenses']
     
     # Mission returns to branches (if any)
     mission_returns = Decimal('0.00')  # Track separately in future
@@ -1523,52 +1515,30 @@ def final_financial_report(request):
     total_branch_actual_remitted = Decimal('0.00')
     total_branch_expenditure = Decimal('0.00')
     
+    # Per-branch figures from the monthly summary rows, one query for every branch
+    summaries = branch_summary_totals(year_int, [month_int], branches=branches)
+    expected_by_branch = expected_mission_due_by_branch(start_date, end_date)
+    empty_summary = dict.fromkeys(
+        ['total_tithe', 'total_offerings', 'total_other_contributions', 'total_branch_expenses',
+         'remittance_to_mission'], Decimal('0.00')
+    )
+    
     for branch in branches:
-        # Income
-        # DEPRECATED: Year-as-state architecture - Use date filtering only
-        branch_contributions = Contribution.objects.filter(
-            branch=branch,
-            date__gte=month_start,
-            date__lte=month_end
-        )
-        
-        branch_tithe = branch_contributions.filter(
-            contribution_type__category='tithe'
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+        branch_summary = summaries.get(branch.pk, empty_summary)
         
-        branch_offerings = branch_contributions.filter(
-            contribution_type__category='offering'
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-        
-        branch_other_contrib = branch_contributions.exclude(
-            contribution_type__category__in=['tithe', 'offering']
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+        # Income
+        branch_tithe = branch_summary['total_tithe']
+        branch_offerings = branch_summary['total_offerings']
+        branch_other_contrib = branch_summary['total_other_contributions']
         
         branch_total_income = branch_tithe + branch_offerings + branch_other_contrib
         
         # Expenditure
-        branch_expenditures = Expenditure.objects.filter(
-            branch=branch,
-            level='branch',
-            date__gte=month_start,
-            date__lte=month_end,
-            status__in=['approved', 'paid']
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-        
-        # Remittance
-        # DEPRECATED: Year-as-state architecture - Use month/year filtering for remittances
-        branch_remittance = Remittance.objects.filter(
-            branch=branch,
-            month=month_int,
-            year=year_int,
-            status='approved'
-        ).aggregate(total=Sum('amount_sent'))['total'] or Decimal('0.00')
+        branch_expenditures = branch_summary['total_branch_expenses']
         
         # CORRECT: Use actual remittances, not expected amounts
-        branch_balance_data = get_branch_balance(branch, start_date, end_date)
-        branch_actual_remitted = branch_balance_data['total_remitted']
+        branch_actual_remitted = branch_summary['remittance_to_mission']
         
-        # Commission (if tracked)
         branch_commission = Decimal('0.00')  # Future: get from commission model
         
         branch_total_exp = branch_expenditures + branch_actual_remitted + branch_commission
@@ -1582,7 +1552,7 @@ def final_financial_report(request):
             'total_income': branch_total_income,
             'expenses': branch_expenditures,
             'remittance': branch_actual_remitted,  # For template compatibility
-            'expected_due': get_expected_mission_due(branch, start_date, end_date),  # Obligation
+            'expected_due': expected_by_branch.get(branch.pk, Decimal('0.00')),  # Obligation
             'commission': branch_commission,
             'total_expenditure': branch_total_exp,
             'balance': branch_balance
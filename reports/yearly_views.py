@@ -22,11 +22,12 @@ from decimal import Decimal
 import calendar
 import json
 
-from core.models import Branch, Area, District, MonthlyClose, SiteSettings
+from core.models import Branch, Area, District, MonthlyClose, SiteSettings, BranchFinancialSummary
 from core.financial_helpers import (
-    get_branch_balance, get_expected_mission_due, get_mission_income,
+    get_branch_balance, get_expected_mission_due, expected_mission_due_by_branch, get_mission_income,
     get_mission_obligations, get_local_only_contributions
 )
+from core.financial_summaries import mission_summary_totals
 from contributions.models import Contribution, ContributionType, Remittance
 from expenditure.models import Expenditure, ExpenditureCategory
 from accounts.models import User
@@ -81,14 +82,16 @@ def get_all_branches_unclosed_months(year):
     branches = Branch.objects.filter(is_active=True)
     unclosed_by_branch = {}
     
+    # Closed months for every branch in one query
+    closed_by_branch = {}
+    for branch_pk, month in MonthlyClose.objects.filter(
+        year=year,
+        is_closed=True
+    ).values_list('branch_id', 'month'):
+        closed_by_branch.setdefault(branch_pk, set()).add(month)
+    
     for branch in branches:
-        closed_months = MonthlyClose.objects.filter(
-            branch=branch,
-            year=year,
-            is_closed=True
-        ).values_list('month', flat=True)
-        
-        closed_list = list(closed_months)
+        closed_list = closed_by_branch.get(branch.pk, set())
         unclosed_list = [m for m in months_to_check if m not in closed_list]
         
         if unclosed_list:
@@ -157,9 +160,11 @@ def mission_yearly_report(request):
     
     # ============ MISSION INCOME ============
     # CORRECT: Mission income comes ONLY from verified remittances
-    mission_income_data = get_mission_income(start_date, end_date)
-    total_remittances_received = mission_income_data['total_income']
-    remittance_count = mission_income_data['remittance_count']
+    mission_summary = mission_summary_totals(year)
+    total_remittances_received = mission_summary['total_remittances']
+    remittance_count = Remittance.objects.filter(
+        status=Remittance.Status.VERIFIED, year=year
+    ).count()
     
     # Branch-wise remittance breakdown
     remittances = Remittance.objects.filter(
@@ -167,12 +172,18 @@ def mission_yearly_report(request):
         year=year
     ).select_related('branch')
     
-    branch_remittances = remittances.values(
+    branch_remittances = list(remittances.values(
         'branch__name', 'branch__id', 'branch__code'
     ).annotate(
         total=Sum('amount_sent'),
         count=Count('id')
-    ).order_by('-total')
+    ).order_by('-total'))
+    
+    # Expected mission share per branch, batched rather than per remitting branch
+    expected_by_branch = expected_mission_due_by_branch(start_date, end_date)
+    for item in branch_remittances:
+        item['expected'] = expected_by_branch.get(item['branch__id'], Decimal('0.00'))
+    total_expected_from_remitting = sum((item['expected'] for item in branch_remittances), Decimal('0.00'))
     
     # Mission-level contributions (donations directly to mission)
     mission_contributions = Contribution.objects.filter(
@@ -202,9 +213,7 @@ def mission_yearly_report(request):
         status__in=['approved', 'paid']
     )
     
-    total_mission_expenditures = mission_expenditures.aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0.00')
+    total_mission_expenditures = mission_summary['total_mission_expenses']
     
     expenditures_by_category = mission_expenditures.values(
         'category__name'
@@ -245,6 +254,7 @@ def mission_yearly_report(request):
         'total_remittances_received': total_remittances_received,
         'remittance_count': remittance_count,
         'branch_remittances': branch_remittances,
+        'total_expected_from_remitting': total_expected_from_remitting,
         'mission_contrib_by_type': mission_contrib_by_type,
         'total_mission_contributions': total_mission_contributions,
         'total_mission_income': total_mission_income,
@@ -339,10 +349,6 @@ def branch_yearly_report(request):
         date__lte=end_date
     )
     
-    total_contributions = contributions.aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0.00')
-    
     contributions_by_type = contributions.values(
         'contribution_type__name', 'contribution_type__mission_percentage'
     ).annotate(
@@ -350,12 +356,17 @@ def branch_yearly_report(request):
         count=Count('id')
     ).order_by('-total')
     
-    # Monthly breakdown
+    # Monthly breakdown from the pre-aggregated monthly summary rows
+    month_summaries = {
+        row.month: row
+        for row in BranchFinancialSummary.objects.filter(branch=branch, year=year)
+    }
     monthly_contributions = []
     for month in range(1, 13):
-        month_total = contributions.filter(date__month=month).aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0.00')
+        row = month_summaries.get(month)
+        month_total = (
+            row.total_tithe + row.total_offerings + row.total_other_contributions
+        ) if row else Decimal('0.00')
         monthly_contributions.append({
             'month': month,
             'month_name': calendar.month_name[month],
@@ -363,6 +374,8 @@ def branch_yearly_report(request):
             'is_closed': month in closed_months
         })
     
+    total_contributions = sum((m['total'] for m in monthly_contributions), Decimal('0.00'))
+    
     # ============ EXPENDITURES ============
     expenditures = Expenditure.objects.filter(
         branch=branch,
@@ -402,13 +415,12 @@ def branch_yearly_report(request):
         outstanding_to_mission = Decimal('0.00')
     
     # ============ FINANCIAL POSITION ============
-    branch_balance_data = get_branch_balance(branch, start_date, end_date)
-    branch_balance = branch_balance_data['branch_balance']
-    
-    # Opening balance (would need previous year's closing balance)
-    # For now, we calculate based on current year data
-    opening_balance = Decimal('0.00')  # TODO: Get from previous year's closing
-    closing_balance = branch_balance
+    # Running balances carried by the monthly summary rows
+    previous = BranchFinancialSummary.objects.filter(
+        branch=branch, year__lt=year
+    ).order_by('-year', '-month').values_list('closing_balance', flat=True).first()
+    opening_balance = previous or Decimal('0.00')
+    closing_balance = month_summaries[max(month_summaries)].closing_balance if month_summaries else opening_balance
     
     # Available years and branches for filter
     today = date.today()
@@ -721,9 +733,8 @@ def export_mission_yearly_pdf(request):
         date__lte=end_date,
         status__in=['approved', 'paid']
     )
-    total_mission_expenditures = mission_expenditures.aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0.00')
+    mission_summary = mission_summary_totals(year)
+    total_mission_expenditures = mission_summary['total_mission_expenses']
     
     expenditures_by_category = mission_expenditures.values(
         'category__name'
@@ -821,9 +832,8 @@ def export_mission_yearly_excel(request):
         date__lte=end_date,
         status__in=['approved', 'paid']
     )
-    total_mission_expenditures = mission_expenditures.aggregate(
-        total=Sum('amount')
-    )['total'] or Decimal('0.00')
+    mission_summary = mission_summary_totals(year)
+    total_mission_expenditures = mission_summary['total_mission_expenses']
     
     expenditures_by_category = mission_expenditures.values(
         'category__name'
@@ -1399,8 +1409,10 @@ def export_branch_yearly_excel(request):
     
     # Calculate financial position
     opening_balance = get_branch_balance(branch, start_date - timezone.timedelta(days=1))
-    expected_mission_due = get_expected_mission_due(branch, start_date, end_date, 
-                                                   include_unclosed=not (has_unclosed_months and proceed_partial))
+    expected_mission_due = get_expected_mission_due(
+        branch, start_date, end_date,
+        months=closed_months if has_unclosed_months and proceed_partial else None
+    )
     outstanding_to_mission = expected_mission_due - total_remitted
     closing_balance = opening_balance + total_contributions - total_expenditures - total_remitted
     
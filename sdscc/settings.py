@@ -79,6 +79,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     
     # SDSCC Custom Middleware
+    'core.middleware.SessionRefreshMiddleware',
     'core.middleware.MaintenanceMiddleware',
     'core.middleware.ActiveUserMiddleware',
     'core.middleware.AuditLogMiddleware',
@@ -226,9 +227,53 @@ LOGIN_REDIRECT_URL = 'core:dashboard'
 LOGOUT_REDIRECT_URL = 'accounts:login'
 
 
+# Cache settings
+# Shared by every gunicorn worker and machine in production; see core.cache.
+# Redis is used when REDIS_URL is set, so cache hits cost no database query;
+# without it the database cache is the fallback (its table is created by the
+# core migrations).
+CACHE_BACKEND = os.environ.get(
+    'DJANGO_CACHE_BACKEND',
+    'locmem' if DEBUG else ('redis' if os.environ.get('REDIS_URL') else 'db'),
+)
+CACHE_BACKENDS = {
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),
+    },
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sdscc',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/tmp/sdscc_cache'),
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'sdscc_cache',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': 300,
+    },
+}
+
+
 # Session settings
+# Sessions are read from the cache and written through to the database.
+# Instead of saving on every request, core.middleware.SessionRefreshMiddleware
+# re-saves a session (sliding its expiry) once less than SESSION_REFRESH_WINDOW
+# seconds of it are left.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 SESSION_COOKIE_AGE = 86400  # 24 hours
-SESSION_SAVE_EVERY_REQUEST = True
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_WINDOW = 60 * 60  # 1 hour
 
 # Security settings for production
 if not DEBUG:
@@ -281,6 +326,18 @@ Q_CLUSTER = {
     'ack_failures': True,
 }
 
+# Minutes between scheduled rebuilds of the dashboard snapshots (core.dashboard_snapshots)
+DASHBOARD_SNAPSHOT_MINUTES = 10
+
+# Seconds per bucket of buffered User.last_login times (core.last_seen); the
+# schedule that writes them runs in whole minutes
+LAST_SEEN_FLUSH_SECONDS = 60
+
+# Batched audit log writes (auditing.pipeline)
+AUDIT_QUEUE_SIZE = 10000  # Entries held per process before new ones are dropped
+AUDIT_BATCH_SIZE = 200  # Entries per bulk_create; a full batch wakes the writer
+AUDIT_FLUSH_SECONDS = 5  # Longest wait before a partial batch is written
+
 
 # ============ PRODUCTION SECURITY SETTINGS ============
 if not DEBUG: